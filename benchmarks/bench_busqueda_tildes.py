@@ -0,0 +1,100 @@
+"""
+Benchmark de búsqueda de políticos insensible a tildes: ruta "ilike" actual frente a las
+rutas "translate" (expresión UPPER(TRANSLATE(...)) con índice basado en función) y
+"sombra" (columnas *_NORM con el valor ya normalizado).
+
+Se ejecuta sobre una copia sintética local (SQLite) de CBOX_TBL_IGOB_POLITICOS, así que
+los tiempos son relativos: en SQLite TRANSLATE es una función Python evaluada por fila,
+mientras que en Oracle el índice guarda el valor precalculado (lo que emula "sombra").
+El plan definitivo se valida en Oracle con EXPLAIN PLAN.
+
+Uso:
+    python benchmarks/bench_busqueda_tildes.py --filas 50000 --repeticiones 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from oracle_local import crear_motor_local, cargar_politicos_sinteticos
+from sqlalchemy import select, text
+from chatbot.database.oracle_models import Politico
+from chatbot.database.oracle_repository import (
+    COLUMNAS_BUSQUEDA_POLITICO, ORACLE_CON_TILDES, ORACLE_SIN_TILDES, predicado_contiene
+)
+
+CONSULTAS = [
+    ("maría", "quispe"),
+    ("jose", "núñez"),
+    ("angel", "pena"),
+    ("cesar", "chavez"),
+    ("sofia", "huaman"),
+]
+
+def construir_consulta(nombres: str, apellidos: str, modo: str):
+    return select(
+        Politico.TXNOMBRE, Politico.TXAPEPAT, Politico.TXAPEMAT
+    ).where(
+        predicado_contiene(Politico.TXNOMBRE, nombres, modo),
+        predicado_contiene(Politico.TXAPEPAT, apellidos, modo) |
+        predicado_contiene(Politico.TXAPEMAT, apellidos, modo)
+    ).distinct()
+
+def crear_indices_busqueda(motor):
+    """
+    Equivalentes en SQLite de generar_ddl_indices_busqueda("translate") y ("sombra").
+    Las columnas sombra se materializan con UPDATE porque SQLite no permite añadir
+    columnas generadas STORED con ALTER TABLE.
+    """
+    tabla = Politico.__tablename__
+    with motor.begin() as conexion:
+        for columna in COLUMNAS_BUSQUEDA_POLITICO:
+            normalizada = f"upper(translate({columna}, '{ORACLE_CON_TILDES}', '{ORACLE_SIN_TILDES}'))"
+            conexion.execute(text(f"CREATE INDEX ELECCIA.IX_POL_{columna}_TR ON {tabla} ({normalizada})"))
+            conexion.execute(text(f"ALTER TABLE ELECCIA.{tabla} ADD COLUMN {columna}_NORM VARCHAR"))
+            conexion.execute(text(f"UPDATE ELECCIA.{tabla} SET {columna}_NORM = {normalizada}"))
+            conexion.execute(text(f"CREATE INDEX ELECCIA.IX_POL_{columna}_NORM ON {tabla} ({columna}_NORM)"))
+
+def medir(motor, modo: str, repeticiones: int) -> tuple:
+    """Devuelve (ms promedio por consulta, filas totales encontradas)"""
+    filas_totales = 0
+    inicio = time.perf_counter()
+    with motor.connect() as conexion:
+        for _ in range(repeticiones):
+            filas_totales = 0
+            for nombres, apellidos in CONSULTAS:
+                filas_totales += len(conexion.execute(construir_consulta(nombres, apellidos, modo)).all())
+    transcurrido = time.perf_counter() - inicio
+    return (transcurrido * 1000) / (repeticiones * len(CONSULTAS)), filas_totales
+
+def mostrar_plan(motor, modo: str):
+    nombres, apellidos = CONSULTAS[0]
+    consulta = construir_consulta(nombres, apellidos, modo).compile(motor, compile_kwargs={"literal_binds": True})
+    with motor.connect() as conexion:
+        for fila in conexion.execute(text(f"EXPLAIN QUERY PLAN {consulta}")):
+            print(f"      {fila[-1]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ilike vs translate/sombra en búsqueda de políticos")
+    parser.add_argument("--filas", type=int, default=50000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        print(f"🚀 Cargando {args.filas} políticos sintéticos en la base local...")
+        motor = crear_motor_local(directorio)
+        cargar_politicos_sinteticos(motor, args.filas)
+        crear_indices_busqueda(motor)
+
+        for modo in ("ilike", "translate", "sombra"):
+            ms, filas = medir(motor, modo, args.repeticiones)
+            print(f"\n📊 Modo {modo}: {ms:.2f} ms/consulta, {filas} coincidencias en {len(CONSULTAS)} consultas")
+            print("   Plan:")
+            mostrar_plan(motor, modo)
+
+        motor.dispose()
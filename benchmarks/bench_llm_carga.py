@@ -0,0 +1,139 @@
+"""
+Prueba de carga del camino al LLM con el backend falso (LLM_BACKEND=fake): usuarios
+simulados concurrentes que buscan servicios digitales (ranking con el LLM), rankean y
+formatean hitos electorales y hacen consultas libres, pasando por el gateway completo
+(semáforo, agrupación, rutas con respaldo, hedging, salida JSON y métricas).
+
+No consume cuota ni necesita red, Redis ni Oracle: las caches y los límites compartidos
+se desactivan y los hitos son sintéticos. Con los umbrales por defecto casi todas las
+búsquedas de servicios se resuelven con BM25 sin llamar al LLM; aquí todo resultado léxico
+se trata como ambiguo para que cada búsqueda pase por el ranking con el LLM. La latencia y
+los errores del LLM falso se configuran por línea de comandos.
+
+Uso:
+    python benchmarks/bench_llm_carga.py --usuarios 50 --mensajes 10 --latencia lognormal:800:0.5
+    python benchmarks/bench_llm_carga.py --latencia-modelo gemma-3-4b-it=lognormal:300:0.8 --hedging
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+from chatbot.config import settings
+from chatbot.services import llm_gateway
+from chatbot.services.llm_gateway import generar_indices, generar_texto
+from chatbot.services.metricas_llm import obtener_metricas_llamadas
+from chatbot.services.servicios_digitales_manager import ServiciosDigitalesManager
+from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager
+from chatbot.utils.metricas import Histograma
+
+CONSULTAS_SERVICIOS = [
+    "quiero pagar una multa electoral", "consultar mi local de votación", "ser miembro de mesa",
+    "trámite de inscripción de partido", "ver resultados electorales", "declaración jurada de candidatos",
+]
+CONSULTAS_HITOS = ["cierre de inscripción", "elección", "publicación de candidatos", "padrón electoral"]
+PREGUNTAS_LIBRES = ["¿qué funciones tiene el JNE?", "¿dónde queda la sede central?", "¿cuántos miembros tiene el pleno?"]
+
+def hitos_sinteticos(cantidad: int) -> list:
+    descripciones = [
+        "Cierre de inscripción de candidatos", "Publicación de la lista de candidatos admitidos",
+        "Cierre del padrón electoral", "Elección general", "Sorteo de miembros de mesa",
+        "Proclamación de resultados", "Convocatoria a elecciones", "Fecha límite de renuncia a partidos",
+    ]
+    return [{
+        "id": indice,
+        "hito_electoral": f"{descripciones[indice % len(descripciones)]} ({indice})",
+        "proceso_electoral": "EG.2026",
+        "dia": 1 + indice % 28, "mes": 1 + indice % 12, "anio": 2026,
+    } for indice in range(cantidad)]
+
+async def usuario_simulado(numero: int, mensajes: int, servicios, procesos, hitos, latencias: dict):
+    rng = random.Random(numero)
+    for _ in range(mensajes):
+        escenario = rng.choice(["servicios", "hitos", "formato_hito", "consulta_libre"])
+        inicio = time.perf_counter()
+        if escenario == "servicios":
+            await servicios.buscar_servicios_semanticamente(rng.choice(CONSULTAS_SERVICIOS))
+        elif escenario == "hitos":
+            prompt = procesos._prompt_ranking_hitos(hitos, rng.choice(CONSULTAS_HITOS), 3)
+            try:
+                await generar_indices(prompt, len(hitos), tarea="ranking_hitos")
+            except Exception:
+                pass
+        elif escenario == "formato_hito":
+            await procesos.formatear_hito_electoral(rng.choice(hitos))
+        else:
+            try:
+                await generar_texto(f"Eres ELECCIA.\n\nPregunta del usuario: {rng.choice(PREGUNTAS_LIBRES)}", tarea="consulta_libre")
+            except Exception:
+                pass
+        latencias[escenario].observar((time.perf_counter() - inicio) * 1000)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga del gateway LLM con el backend falso")
+    parser.add_argument("--usuarios", type=int, default=50)
+    parser.add_argument("--mensajes", type=int, default=10)
+    parser.add_argument("--hitos", type=int, default=20)
+    parser.add_argument("--latencia", default="lognormal:800:0.5", help="fija:MS | uniforme:MIN:MAX | lognormal:MEDIANA_MS:SIGMA")
+    parser.add_argument("--latencia-modelo", action="append", default=[], help="MODELO=ESPECIFICACION (repetible)")
+    parser.add_argument("--tasa-error", type=float, default=0.0)
+    parser.add_argument("--concurrencia", type=int, default=settings.LLM_MAX_CONCURRENCIA)
+    parser.add_argument("--hedging", action="store_true")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    settings.LLM_BACKEND = "fake"
+    settings.LLM_FAKE_LATENCIA = args.latencia
+    settings.LLM_FAKE_LATENCIA_MODELOS = dict(valor.split("=", 1) for valor in args.latencia_modelo)
+    settings.LLM_FAKE_TASA_ERROR = args.tasa_error
+    settings.LLM_FAKE_SEMILLA = args.semilla
+    settings.LLM_MAX_CONCURRENCIA = args.concurrencia
+    settings.LLM_HEDGING = args.hedging
+    # Sin Redis: caches, límites compartidos y agrupación entre workers desactivados
+    settings.CACHE_CONSULTAS_HABILITADO = False
+    settings.HITOS_CACHE_HABILITADO = False
+    settings.LLM_LIMITES_HABILITADO = False
+    settings.LLM_AGRUPAR_REDIS = False
+    # Toda búsqueda de servicios se rankea con el LLM (ningún puntaje BM25 alcanza el mínimo)
+    settings.SERVICIOS_RERANK_LLM = True
+    settings.SERVICIOS_BM25_MINIMO = float("inf")
+
+    servicios = ServiciosDigitalesManager()
+    procesos = ProcesosElectoralesManager()
+    hitos = hitos_sinteticos(args.hitos)
+    latencias = {escenario: Histograma() for escenario in ["servicios", "hitos", "formato_hito", "consulta_libre"]}
+
+    async def ejecutar():
+        await asyncio.gather(*(
+            usuario_simulado(numero, args.mensajes, servicios, procesos, hitos, latencias)
+            for numero in range(args.usuarios)
+        ))
+
+    print(f"🚀 {args.usuarios} usuarios x {args.mensajes} mensajes, latencia {args.latencia}, errores {args.tasa_error:.0%}...")
+    inicio = time.perf_counter()
+    asyncio.run(ejecutar())
+    transcurrido = time.perf_counter() - inicio
+
+    total = args.usuarios * args.mensajes
+    print(f"\n📊 {total} mensajes en {transcurrido:.1f}s ({total / transcurrido:.1f} mensajes/s)")
+    for escenario, histograma in latencias.items():
+        resumen = histograma.resumen()
+        print(f"   {escenario:<15} n={resumen['conteo']:<5} p50 {resumen['p50']:>7.0f} ms   p90 {resumen['p90']:>7.0f} ms   p99 {resumen['p99']:>7.0f} ms")
+
+    metricas = obtener_metricas_llamadas()
+    print("\n📞 Llamadas al LLM por tarea y modelo:")
+    for tarea, modelos in metricas["llamadas"].items():
+        for modelo, datos in modelos.items():
+            latencia = datos["latencia_ms"]
+            print(f"   {tarea:<18} {modelo:<16} n={latencia['conteo']:<5} p50 {latencia['p50']:>7.0f} ms   p90 {latencia['p90']:>7.0f} ms   {datos['resultados']}")
+    print(f"\n🔔 Eventos: {metricas['eventos']}")
+    print(f"🔗 Agrupación: {llm_gateway.estadisticas_agrupacion}")
+    print(f"🧾 JSON: {llm_gateway.estadisticas_json}")
+    print(f"🛡️ Hedging: {llm_gateway.estadisticas_hedging}")
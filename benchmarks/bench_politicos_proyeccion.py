@@ -0,0 +1,101 @@
+"""
+Benchmark de las consultas de políticos: ruta ORM anterior (session.query(Politico) +
+un dict por fila) frente a la ruta actual del repositorio (SELECT Core de solo las
+columnas usadas + RegistroPolitico con __slots__).
+
+Mide filas/segundo y el pico de memoria (tracemalloc) al materializar los resultados.
+Se ejecuta sobre la copia sintética local (SQLite), por lo que arraysize/prefetchrows
+no aplican aquí: en Oracle reducen además los round trips de red.
+
+Uso:
+    python benchmarks/bench_politicos_proyeccion.py --filas 50000 --repeticiones 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from oracle_local import crear_motor_local, cargar_politicos_sinteticos, ELECCIONES
+from sqlalchemy.orm import sessionmaker
+from chatbot.database import oracle_repository
+from chatbot.database.oracle_models import Politico
+from chatbot.database.oracle_repository import OracleRepository
+
+def buscar_politicos_orm(session, eleccion: str) -> list:
+    """Ruta anterior: objetos ORM completos convertidos a dict"""
+    result = session.query(Politico).filter(Politico.TXELECCION == eleccion).all()
+    return [{
+        "nombres": row.TXNOMBRE,
+        "apellido_paterno": row.TXAPEPAT,
+        "apellido_materno": row.TXAPEMAT,
+        "region": row.TXREGION,
+        "provincia": row.TXPROVINCIA,
+        "distrito": row.TXDISTRITO,
+        "organizacion_politica": row.TXORGPOL,
+        "eleccion": row.TXELECCION,
+        "siglas": row.TXSIGLAS,
+        "tipo_eleccion": row.TXTIPOELECCION,
+        "cargo_postulado": row.TXCARGO,
+        "cargo_electo": row.TXCARGOELECTO
+    } for row in result]
+
+def medir(funcion, repeticiones: int) -> tuple:
+    """Devuelve (filas/segundo, pico de memoria en MB)"""
+    filas = 0
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for eleccion in ELECCIONES:
+            filas += len(funcion(eleccion))
+    transcurrido = time.perf_counter() - inicio
+
+    # El pico se mide aparte para no penalizar el tiempo con el rastreo de tracemalloc
+    tracemalloc.start()
+    resultados = [funcion(eleccion) for eleccion in ELECCIONES]
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultados
+
+    return filas / transcurrido, pico / (1024 * 1024)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs proyección Core en consultas de políticos")
+    parser.add_argument("--filas", type=int, default=50000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        print(f"🚀 Cargando {args.filas} políticos sintéticos en la base local...")
+        motor = crear_motor_local(directorio)
+        cargar_politicos_sinteticos(motor, args.filas)
+        SesionLocal = sessionmaker(bind=motor)
+
+        def get_db_local():
+            db = SesionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        # El repositorio usa la base local en lugar de Oracle
+        oracle_repository.get_db = get_db_local
+        repositorio = OracleRepository()
+
+        def ruta_orm(eleccion):
+            with SesionLocal() as session:
+                return buscar_politicos_orm(session, eleccion)
+
+        resultados = {
+            "orm + dict": medir(ruta_orm, args.repeticiones),
+            "core + registro": medir(repositorio.buscar_politicos_por_eleccion, args.repeticiones),
+        }
+
+        for ruta, (filas_por_segundo, pico_mb) in resultados.items():
+            print(f"📊 {ruta:<16} {filas_por_segundo:>12,.0f} filas/s   pico {pico_mb:6.1f} MB")
+
+        motor.dispose()
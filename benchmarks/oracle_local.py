@@ -0,0 +1,66 @@
+"""
+Base de datos local (SQLite) que replica las tablas del esquema ELECCIA de Oracle.
+Se usa como sustituto en los benchmarks para no depender de la red ni de datos reales.
+"""
+
+import os
+import sys
+import random
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, project_root)
+
+from sqlalchemy import insert
+from chatbot.config import settings
+from chatbot.database.oracle_connection import OracleBase
+from chatbot.database.oracle_models import Politico
+from chatbot.database.oracle_snapshot import crear_motor_sqlite_eleccia
+
+NOMBRES = ["JUAN", "MARÍA", "MARIA", "JOSÉ", "JOSE", "LUIS", "ROSA", "CARLOS", "ANA", "JESÚS", "ÁNGEL", "CÉSAR", "RAÚL", "SOFÍA", "PEDRO"]
+APELLIDOS = ["QUISPE", "NÚÑEZ", "NUNEZ", "PEÑA", "GARCÍA", "GARCIA", "RAMÍREZ", "TORRES", "FLORES", "CHÁVEZ", "MAMANI", "LÓPEZ", "DÍAZ", "ROJAS", "HUAMÁN"]
+ELECCIONES = ["ELECCIONES GENERALES 2021", "ELECCIONES REGIONALES Y MUNICIPALES 2022", "ELECCIONES GENERALES 2016", "ELECCIONES MUNICIPALES COMPLEMENTARIAS 2025"]
+REGIONES = ["LIMA", "CUSCO", "AREQUIPA", "PUNO", "JUNÍN", "PIURA", "LA LIBERTAD"]
+
+def crear_motor_local(directorio: str):
+    """
+    Crea un motor SQLite con el esquema ELECCIA adjunto (ATTACH) y la función TRANSLATE,
+    de modo que las consultas del repositorio se ejecutan sin cambios.
+    """
+    ruta_main = os.path.join(directorio, "main.db")
+    ruta_esquema = os.path.join(directorio, f"{settings.ORACLE_SCHEMA.lower()}.db")
+    motor = crear_motor_sqlite_eleccia(ruta_esquema, ruta_main)
+    OracleBase.metadata.create_all(motor)
+    return motor
+
+def cargar_politicos_sinteticos(motor, filas: int, semilla: int = 42, lote: int = 5000) -> int:
+    """Carga políticos sintéticos (con y sin tildes) en la tabla local"""
+    aleatorio = random.Random(semilla)
+    tabla = Politico.__table__
+    registros = []
+
+    with motor.begin() as conexion:
+        for i in range(filas):
+            region = aleatorio.choice(REGIONES)
+            registros.append({
+                "IDPERSONA": i + 1,
+                "TXNOMBRE": f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(NOMBRES)}",
+                "TXAPEPAT": aleatorio.choice(APELLIDOS),
+                "TXAPEMAT": aleatorio.choice(APELLIDOS),
+                "TXREGION": region,
+                "TXPROVINCIA": region,
+                "TXDISTRITO": region,
+                "TXORGPOL": f"PARTIDO {aleatorio.randint(1, 40)}",
+                "TXELECCION": aleatorio.choice(ELECCIONES),
+                "TXSIGLAS": f"P{aleatorio.randint(1, 40)}",
+                "TXTIPOELECCION": "GENERAL",
+                "TXCARGO": aleatorio.choice(["ALCALDE", "REGIDOR", "CONGRESISTA"]),
+                "TXCARGOELECTO": aleatorio.choice(["", "ALCALDE", "REGIDOR"])
+            })
+            if len(registros) >= lote:
+                conexion.execute(insert(tabla), registros)
+                registros = []
+        if registros:
+            conexion.execute(insert(tabla), registros)
+
+    return filas
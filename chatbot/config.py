@@ -1,4 +1,5 @@
 import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,6 +27,127 @@ class Settings:
     ORACLE_PASS: str = os.getenv("ORACLE_PASS", "desarrollo")
     ORACLE_DSN: str = os.getenv("ORACLE_DSN", "oda-x8-2ha-vm1:1521/OPEXTDESA")
     ORACLE_SCHEMA: str = "ELECCIA"
+    # Búsqueda insensible a tildes: "ilike" (por defecto), "translate" (índice UPPER(TRANSLATE(...))),
+    # "sombra" (columnas virtuales *_NORM indexadas) o "nlssort" (índice NLSSORT BINARY_AI)
+    ORACLE_MODO_BUSQUEDA: str = os.getenv("ORACLE_MODO_BUSQUEDA", "ilike").lower()
+
+    # python-oracledb en modo thin: no necesita Instant Client (por defecto se mantiene thick)
+    ORACLE_THIN_MODE: bool = os.getenv("ORACLE_THIN_MODE", "false").lower() == "true"
+    # Crear el engine y abrir la primera conexión en segundo plano al arrancar la app
+    ORACLE_PRECALENTAR: bool = os.getenv("ORACLE_PRECALENTAR", "true").lower() == "true"
+    
+    # Pool de conexiones de Oracle (el executor de consultas asíncronas usa el mismo tamaño)
+    ORACLE_POOL_SIZE: int = int(os.getenv("ORACLE_POOL_SIZE", "5"))
+    ORACLE_MAX_OVERFLOW: int = int(os.getenv("ORACLE_MAX_OVERFLOW", "10"))
+    ORACLE_POOL_TIMEOUT: int = int(os.getenv("ORACLE_POOL_TIMEOUT", "30"))
+    # Pool nativo de python-oracledb en lugar del QueuePool de SQLAlchemy (ping por intervalo, DRCP opcional)
+    ORACLE_POOL_NATIVO: bool = os.getenv("ORACLE_POOL_NATIVO", "false").lower() == "true"
+    ORACLE_POOL_MIN: int = int(os.getenv("ORACLE_POOL_MIN", "2"))
+    ORACLE_POOL_MAX: int = int(os.getenv("ORACLE_POOL_MAX", "15"))
+    ORACLE_POOL_INCREMENT: int = int(os.getenv("ORACLE_POOL_INCREMENT", "1"))
+    ORACLE_POOL_PING_INTERVAL: int = int(os.getenv("ORACLE_POOL_PING_INTERVAL", "60"))
+    ORACLE_DRCP: bool = os.getenv("ORACLE_DRCP", "false").lower() == "true"
+    ORACLE_CCLASS: str = os.getenv("ORACLE_CCLASS", "CHATBOT_JNE")
+    # Timeout por consulta (segundos) y excepciones por nombre de consulta en JSON, ej. {"buscar_candidatos_inteligente": 15}
+    ORACLE_TIMEOUT_CONSULTA: float = float(os.getenv("ORACLE_TIMEOUT_CONSULTA", "10"))
+    ORACLE_TIMEOUTS_CONSULTA: dict = json.loads(os.getenv("ORACLE_TIMEOUTS_CONSULTA", "{}"))
+    # Filas por round trip del cursor oracledb en las consultas de políticos
+    ORACLE_ARRAYSIZE: int = int(os.getenv("ORACLE_ARRAYSIZE", "500"))
+    ORACLE_PREFETCHROWS: int = int(os.getenv("ORACLE_PREFETCHROWS", "500"))
+    # Al elegir un candidato, traer todas sus filas en una consulta y servir el menú de elecciones y el detalle desde el estado
+    ORACLE_PREFETCH_CANDIDATO: bool = os.getenv("ORACLE_PREFETCH_CANDIDATO", "true").lower() == "true"
+    # Origen de las lecturas: "oracle" (consulta directa) o "snapshot" (réplica SQLite generada por sincronizar_snapshot.py)
+    ORACLE_BACKEND = os.getenv("ORACLE_BACKEND", "oracle").lower()
+    ORACLE_SNAPSHOT_PATH = os.getenv("ORACLE_SNAPSHOT_PATH", "data/eleccia_snapshot.db")
+    # Cada cuántos segundos se revisa si el archivo de la réplica cambió o desapareció
+    ORACLE_SNAPSHOT_REVISION: float = float(os.getenv("ORACLE_SNAPSHOT_REVISION", "30"))
+    # Circuit breaker: se abre tras N fallos o N consultas lentas seguidas y sondea Oracle cada ORACLE_CB_ESPERA segundos
+    ORACLE_CB_HABILITADO: bool = os.getenv("ORACLE_CB_HABILITADO", "true").lower() == "true"
+    ORACLE_CB_FALLOS: int = int(os.getenv("ORACLE_CB_FALLOS", "3"))
+    ORACLE_CB_LENTAS: int = int(os.getenv("ORACLE_CB_LENTAS", "3"))
+    ORACLE_CB_LATENCIA_MS: float = float(os.getenv("ORACLE_CB_LATENCIA_MS", "5000"))
+    ORACLE_CB_ESPERA: float = float(os.getenv("ORACLE_CB_ESPERA", "15"))
+    ORACLE_CB_MAX_RESPALDOS: int = int(os.getenv("ORACLE_CB_MAX_RESPALDOS", "2000"))
+    # Log de consultas lentas: latencia por plantilla, aviso sobre el umbral y captura opcional del plan
+    ORACLE_SLOW_QUERY_HABILITADO: bool = os.getenv("ORACLE_SLOW_QUERY_HABILITADO", "true").lower() == "true"
+    ORACLE_SLOW_QUERY_MS: float = float(os.getenv("ORACLE_SLOW_QUERY_MS", "1000"))
+    ORACLE_SLOW_QUERY_PLAN: bool = os.getenv("ORACLE_SLOW_QUERY_PLAN", "false").lower() == "true"
+    ORACLE_SLOW_QUERY_MAX_PLANTILLAS: int = int(os.getenv("ORACLE_SLOW_QUERY_MAX_PLANTILLAS", "500"))
+    # Segundos que se reutiliza la línea de tiempo de hitos de cada proceso electoral antes de recargarla
+    CRONOGRAMA_TTL_SEGUNDOS: int = int(os.getenv("CRONOGRAMA_TTL_SEGUNDOS", "3600"))
+    # Búsqueda de servicios digitales: BM25 local y reranking opcional con el LLM solo si hay ambigüedad
+    SERVICIOS_CANDIDATOS_RERANK: int = int(os.getenv("SERVICIOS_CANDIDATOS_RERANK", "10"))
+    SERVICIOS_BM25_MINIMO: float = float(os.getenv("SERVICIOS_BM25_MINIMO", "1.5"))
+    SERVICIOS_UMBRAL_AMBIGUEDAD: float = float(os.getenv("SERVICIOS_UMBRAL_AMBIGUEDAD", "0.9"))
+    SERVICIOS_RERANK_LLM: bool = os.getenv("SERVICIOS_RERANK_LLM", "true").lower() == "true"
+    # Índice de embeddings precalculados (servicios e hitos): backend hashing (sin modelo) o sentence_transformers
+    EMBEDDINGS_HABILITADO: bool = os.getenv("EMBEDDINGS_HABILITADO", "true").lower() == "true"
+    EMBEDDINGS_BACKEND: str = os.getenv("EMBEDDINGS_BACKEND", "hashing").lower()
+    EMBEDDINGS_MODELO: str = os.getenv("EMBEDDINGS_MODELO", "paraphrase-multilingual-MiniLM-L12-v2")
+    EMBEDDINGS_DIMENSION: int = int(os.getenv("EMBEDDINGS_DIMENSION", "512"))
+    EMBEDDINGS_DIR: str = os.getenv("EMBEDDINGS_DIR", "./data/embeddings")
+    EMBEDDINGS_SIMILITUD_MINIMA: float = float(os.getenv("EMBEDDINGS_SIMILITUD_MINIMA", "0.2"))
+    # Similitud a partir de la cual los hitos se devuelven directamente, sin pasar por el LLM
+    EMBEDDINGS_SIMILITUD_DIRECTA: float = float(os.getenv("EMBEDDINGS_SIMILITUD_DIRECTA", "0.6"))
+    # Hitos candidatos (prefiltro léxico y temporal) que se envían al LLM para la selección final
+    HITOS_CANDIDATOS_LLM: int = int(os.getenv("HITOS_CANDIDATOS_LLM", "20"))
+    # Cache en Redis de los textos de hitos generados por el LLM (expira a la medianoche)
+    HITOS_CACHE_HABILITADO: bool = os.getenv("HITOS_CACHE_HABILITADO", "true").lower() == "true"
+    # Cache en Redis de resultados de búsqueda por consulta normalizada (servicios e hitos)
+    CACHE_CONSULTAS_HABILITADO: bool = os.getenv("CACHE_CONSULTAS_HABILITADO", "true").lower() == "true"
+    CACHE_CONSULTAS_TTL: int = int(os.getenv("CACHE_CONSULTAS_TTL", "21600"))
+    # Similitud de Jaccard mínima para reutilizar una consulta casi igual (1 = solo coincidencia exacta)
+    CACHE_CONSULTAS_SIMILITUD: float = float(os.getenv("CACHE_CONSULTAS_SIMILITUD", "0.8"))
+    CACHE_CONSULTAS_MAX_CLAVES: int = int(os.getenv("CACHE_CONSULTAS_MAX_CLAVES", "1000"))
+    # Claves casi iguales que se comparan como máximo por grupo (palabra) en cada búsqueda
+    CACHE_CONSULTAS_MAX_CANDIDATOS: int = int(os.getenv("CACHE_CONSULTAS_MAX_CANDIDATOS", "50"))
+    # "gemini" (API real) o "fake" (respuestas locales determinísticas para pruebas de carga)
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "gemini")
+    # Gateway del LLM: modelo por defecto, llamadas simultáneas y plazo por llamada (segundos)
+    LLM_MODELO: str = os.getenv("LLM_MODELO", "gemma-3-27b-it")
+    LLM_MAX_CONCURRENCIA: int = int(os.getenv("LLM_MAX_CONCURRENCIA", "8"))
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "20"))
+    # Ruteo por tarea: {"tarea": {"modelo": ..., "respaldo": ..., "timeout": segundos, "esquema_json": bool}}; reemplaza las rutas por defecto
+    # (esquema_json pide salida JSON estructurada al proveedor: solo para modelos Gemini, Gemma no la admite)
+    LLM_RUTAS: dict = json.loads(os.getenv("LLM_RUTAS", "{}"))
+    # Agrupación de llamadas idénticas simultáneas (en el proceso y opcionalmente entre workers vía Redis)
+    LLM_AGRUPAR: bool = os.getenv("LLM_AGRUPAR", "true").lower() == "true"
+    LLM_AGRUPAR_REDIS: bool = os.getenv("LLM_AGRUPAR_REDIS", "false").lower() == "true"
+    LLM_AGRUPAR_TTL_RESULTADO: int = int(os.getenv("LLM_AGRUPAR_TTL_RESULTADO", "30"))
+    LLM_AGRUPAR_INTERVALO: float = float(os.getenv("LLM_AGRUPAR_INTERVALO", "0.1"))
+    # Hedging: segunda solicitud si la principal supera el percentil de latencia de su tarea
+    LLM_HEDGING: bool = os.getenv("LLM_HEDGING", "false").lower() == "true"
+    LLM_HEDGE_PERCENTIL: float = float(os.getenv("LLM_HEDGE_PERCENTIL", "0.9"))
+    # "respaldo" (modelo de respaldo de la ruta) o "principal" (mismo modelo)
+    LLM_HEDGE_MODELO: str = os.getenv("LLM_HEDGE_MODELO", "respaldo")
+    # Máximo de coberturas como fracción de las llamadas (0.1 = hasta 10% de carga extra)
+    LLM_HEDGE_PRESUPUESTO: float = float(os.getenv("LLM_HEDGE_PRESUPUESTO", "0.1"))
+    # Segundos de la ventana deslizante sobre la que se mide ese presupuesto
+    LLM_HEDGE_VENTANA_PRESUPUESTO: float = float(os.getenv("LLM_HEDGE_VENTANA_PRESUPUESTO", "60"))
+    LLM_HEDGE_MIN_MUESTRAS: int = int(os.getenv("LLM_HEDGE_MIN_MUESTRAS", "20"))
+    LLM_HEDGE_VENTANA: int = int(os.getenv("LLM_HEDGE_VENTANA", "200"))
+    # Límites compartidos en Redis: llamadas por segundo (y ráfaga) global y por usuario, tokens por día
+    LLM_LIMITES_HABILITADO: bool = os.getenv("LLM_LIMITES_HABILITADO", "true").lower() == "true"
+    LLM_LIMITE_QPS_GLOBAL: float = float(os.getenv("LLM_LIMITE_QPS_GLOBAL", "10"))
+    LLM_LIMITE_RAFAGA_GLOBAL: int = int(os.getenv("LLM_LIMITE_RAFAGA_GLOBAL", "20"))
+    LLM_LIMITE_QPS_USUARIO: float = float(os.getenv("LLM_LIMITE_QPS_USUARIO", "0.5"))
+    LLM_LIMITE_RAFAGA_USUARIO: int = int(os.getenv("LLM_LIMITE_RAFAGA_USUARIO", "5"))
+    LLM_LIMITE_TOKENS_DIARIOS: int = int(os.getenv("LLM_LIMITE_TOKENS_DIARIOS", "2000000"))
+    # Cola de espera por worker para llamadas sin cupo: tamaño máximo y segundos de espera
+    LLM_LIMITE_COLA: int = int(os.getenv("LLM_LIMITE_COLA", "100"))
+    LLM_LIMITE_ESPERA: float = float(os.getenv("LLM_LIMITE_ESPERA", "5"))
+    # Precios por modelo en USD por millón de tokens: {"modelo": [entrada, salida]} (sin precio = costo 0)
+    LLM_PRECIOS: dict = json.loads(os.getenv("LLM_PRECIOS", "{}"))
+    # Vigencia en Redis de las métricas del LLM acumuladas por conversación
+    LLM_METRICAS_TTL_CONVERSACION: int = int(os.getenv("LLM_METRICAS_TTL_CONVERSACION", "7200"))
+    # LLM falso: latencia (fija:MS | uniforme:MIN:MAX | lognormal:MEDIANA_MS:SIGMA), por modelo, errores y semilla
+    LLM_FAKE_LATENCIA: str = os.getenv("LLM_FAKE_LATENCIA", "lognormal:800:0.5")
+    LLM_FAKE_LATENCIA_MODELOS: dict = json.loads(os.getenv("LLM_FAKE_LATENCIA_MODELOS", "{}"))
+    LLM_FAKE_TASA_ERROR: float = float(os.getenv("LLM_FAKE_TASA_ERROR", "0"))
+    LLM_FAKE_SEMILLA: int = int(os.getenv("LLM_FAKE_SEMILLA", "0"))
+    # Respuestas del LLM en Telegram por partes (editMessageText), con un mínimo de segundos entre ediciones
+    TELEGRAM_STREAMING: bool = os.getenv("TELEGRAM_STREAMING", "true").lower() == "true"
+    TELEGRAM_STREAM_INTERVALO: float = float(os.getenv("TELEGRAM_STREAM_INTERVALO", "1.0"))
 
     TNS_ADMIN = os.getenv("TNS_ADMIN", "/home/deglanrivas/Escritorio/crypto_erick_2")
     ORACLEDB_CLIENT_PATH = os.getenv("ORACLEDB_CLIENT_PATH", "/opt/oracle/instantclient_19_27")
@@ -0,0 +1,204 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional
+from sqlalchemy import event, text
+from chatbot.config import settings
+
+logger = logging.getLogger(__name__)
+
+class CircuitoAbiertoError(Exception):
+    """Oracle está marcado como no disponible: la consulta se rechaza sin esperar al pool"""
+
+class ListaObsoleta(list):
+    """Último resultado bueno conocido (lista) servido mientras Oracle no responde"""
+    obsoleto = True
+
+class DictObsoleto(dict):
+    """Último resultado bueno conocido (dict) servido mientras Oracle no responde"""
+    obsoleto = True
+
+def es_obsoleto(resultado) -> bool:
+    """Indica si un resultado del repositorio proviene del respaldo (posiblemente desactualizado)"""
+    return getattr(resultado, "obsoleto", False)
+
+def _marcar_obsoleto(resultado):
+    if isinstance(resultado, list):
+        return ListaObsoleta(resultado)
+    if isinstance(resultado, dict):
+        return DictObsoleto(resultado)
+    if hasattr(resultado, "a_dict"):
+        # RegistroPolitico usa __slots__; se entrega como dict con el mismo acceso por clave
+        return DictObsoleto(resultado.a_dict())
+    return resultado
+
+# Marca por hilo: la consulta en curso en este hilo falló (la activan get_db y los eventos del engine)
+_consulta_actual = threading.local()
+
+class CircuitBreaker:
+    """
+    Circuit breaker para Oracle.
+
+    - cerrado: las consultas pasan; se cuentan fallos y consultas lentas consecutivos.
+    - abierto: tras ORACLE_CB_FALLOS fallos o ORACLE_CB_LENTAS consultas lentas seguidas,
+      las consultas se rechazan de inmediato y un hilo en segundo plano sondea Oracle
+      cada ORACLE_CB_ESPERA segundos hasta que responde, momento en que se cierra.
+    """
+
+    def __init__(self):
+        self.estado = "cerrado"
+        self.fallos_consecutivos = 0
+        self.lentas_consecutivas = 0
+        self.abierto_desde: Optional[float] = None
+        self._lock = threading.Lock()
+        self._sonda: Optional[threading.Thread] = None
+
+    def verificar(self):
+        """Lanza CircuitoAbiertoError si el circuito está abierto"""
+        _consulta_actual.fallo = False
+        if self.estado == "abierto":
+            _consulta_actual.fallo = True
+            raise CircuitoAbiertoError("Oracle no disponible (circuito abierto)")
+
+    def registrar_exito(self):
+        if self.fallos_consecutivos or self.lentas_consecutivas:
+            with self._lock:
+                self.fallos_consecutivos = 0
+                self.lentas_consecutivas = 0
+
+    def registrar_fallo(self, error: Exception = None):
+        _consulta_actual.fallo = True
+        with self._lock:
+            self.fallos_consecutivos += 1
+            if self.fallos_consecutivos >= settings.ORACLE_CB_FALLOS:
+                self._abrir(f"{self.fallos_consecutivos} fallos consecutivos ({error})")
+
+    def registrar_latencia(self, milisegundos: float):
+        if milisegundos < settings.ORACLE_CB_LATENCIA_MS:
+            self.registrar_exito()
+            return
+        with self._lock:
+            self.lentas_consecutivas += 1
+            if self.lentas_consecutivas >= settings.ORACLE_CB_LENTAS:
+                self._abrir(f"{self.lentas_consecutivas} consultas de más de {settings.ORACLE_CB_LATENCIA_MS} ms")
+
+    def _abrir(self, motivo: str):
+        """Abre el circuito (se llama con el lock tomado)"""
+        if self.estado == "abierto":
+            return
+        self.estado = "abierto"
+        self.abierto_desde = time.monotonic()
+        logger.error(f"🔌 Circuito de Oracle abierto: {motivo}. Se sirven resultados en caché")
+
+        if self._sonda is None or not self._sonda.is_alive():
+            self._sonda = threading.Thread(target=self._sondear, name="oracle-sonda", daemon=True)
+            self._sonda.start()
+
+    def _cerrar(self):
+        with self._lock:
+            self.estado = "cerrado"
+            self.fallos_consecutivos = 0
+            self.lentas_consecutivas = 0
+            duracion = time.monotonic() - (self.abierto_desde or time.monotonic())
+            self.abierto_desde = None
+        logger.info(f"✅ Circuito de Oracle cerrado: Oracle respondió tras {duracion:.0f}s")
+
+    def _sondear(self):
+        """Sondea Oracle en segundo plano mientras el circuito esté abierto"""
+        # Import diferido: oracle_connection importa este módulo
+        from chatbot.database.oracle_connection import obtener_motor
+
+        while self.estado == "abierto":
+            time.sleep(settings.ORACLE_CB_ESPERA)
+            try:
+                inicio = time.perf_counter()
+                with obtener_motor().connect() as conexion:
+                    conexion.execute(text("SELECT 1 FROM DUAL"))
+                milisegundos = (time.perf_counter() - inicio) * 1000
+                if milisegundos < settings.ORACLE_CB_LATENCIA_MS:
+                    self._cerrar()
+                else:
+                    logger.warning(f"⚠️ Sonda a Oracle respondió en {milisegundos:.0f} ms, el circuito sigue abierto")
+            except Exception as e:
+                logger.warning(f"⚠️ Sonda a Oracle falló, el circuito sigue abierto: {e}")
+
+def marcar_fallo():
+    """
+    Marca como fallida la consulta en curso en este hilo sin contarla en el circuit breaker.
+    La usan los métodos del repositorio que capturan la excepción y devuelven []/{}, para que
+    con_respaldo no guarde ese resultado vacío como el último bueno.
+    """
+    _consulta_actual.fallo = True
+
+def fallo_registrado() -> bool:
+    """Indica si la consulta en curso en este hilo ya registró un fallo"""
+    return getattr(_consulta_actual, "fallo", False)
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+def obtener_circuit_breaker() -> CircuitBreaker:
+    """Obtiene el circuit breaker de Oracle del proceso"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker()
+    return _circuit_breaker
+
+def instrumentar_motor(motor):
+    """Registra en el circuit breaker los errores y la latencia de cada consulta del engine"""
+    breaker = obtener_circuit_breaker()
+
+    @event.listens_for(motor, "before_cursor_execute")
+    def marcar_inicio(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+    @event.listens_for(motor, "after_cursor_execute")
+    def medir_latencia(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["inicio_consulta"].pop()
+        breaker.registrar_latencia((time.perf_counter() - inicio) * 1000)
+
+    @event.listens_for(motor, "handle_error")
+    def registrar_error(contexto):
+        if contexto.connection is not None and contexto.connection.info.get("inicio_consulta"):
+            contexto.connection.info["inicio_consulta"].pop()
+        breaker.registrar_fallo(contexto.original_exception)
+
+# Último resultado bueno por (método, argumentos)
+_respaldos: "OrderedDict[tuple, object]" = OrderedDict()
+_respaldos_lock = threading.Lock()
+
+def con_respaldo(metodo):
+    """
+    Decorador para métodos de OracleRepository: guarda el último resultado bueno de cada
+    consulta y, si Oracle falla o el circuito está abierto, devuelve ese resultado marcado
+    como obsoleto (ListaObsoleta/DictObsoleto, atributo obsoleto=True) en lugar de []/{}.
+    Un resultado solo se guarda si la llamada no registró un fallo (eventos del engine,
+    get_db o marcar_fallo en el except del método).
+    """
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if not settings.ORACLE_CB_HABILITADO:
+            return metodo(self, *args, **kwargs)
+
+        clave = (metodo.__name__, args, tuple(sorted(kwargs.items())))
+        _consulta_actual.fallo = False
+        resultado = metodo(self, *args, **kwargs)
+
+        if not fallo_registrado():
+            with _respaldos_lock:
+                _respaldos[clave] = resultado
+                _respaldos.move_to_end(clave)
+                while len(_respaldos) > settings.ORACLE_CB_MAX_RESPALDOS:
+                    _respaldos.popitem(last=False)
+            return resultado
+
+        with _respaldos_lock:
+            respaldo = _respaldos.get(clave)
+        if respaldo is None:
+            return resultado
+
+        logger.warning(f"♻️ Oracle no disponible, se sirve el último resultado conocido de {metodo.__name__}")
+        return _marcar_obsoleto(respaldo)
+
+    return envoltura
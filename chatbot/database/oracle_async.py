@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+from chatbot.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Executor dedicado a Oracle: tantos hilos como conexiones puede entregar el pool,
+# así una consulta lenta no bloquea el event loop ni compite con otros trabajos
+_executor: Optional[ThreadPoolExecutor] = None
+
+def obtener_executor_oracle() -> ThreadPoolExecutor:
+    """Obtiene el executor de consultas a Oracle, creándolo en el primer uso"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ORACLE_POOL_MAX if settings.ORACLE_POOL_NATIVO else settings.ORACLE_POOL_SIZE + settings.ORACLE_MAX_OVERFLOW,
+            thread_name_prefix="oracle"
+        )
+    return _executor
+
+def obtener_timeout_consulta(consulta: str) -> float:
+    """Timeout configurado para una consulta (o el timeout general)"""
+    return float(settings.ORACLE_TIMEOUTS_CONSULTA.get(consulta, settings.ORACLE_TIMEOUT_CONSULTA))
+
+async def ejecutar_en_oracle(
+    funcion: Callable,
+    *args,
+    consulta: Optional[str] = None,
+    timeout: Optional[float] = None,
+    por_defecto: Any = None,
+    **kwargs
+) -> Any:
+    """
+    Ejecuta una función bloqueante que consulta Oracle en el executor dedicado.
+
+    Args:
+        funcion: Método del repositorio o del manager que consulta Oracle
+        consulta: Nombre para timeouts y logs (por defecto el nombre de la función)
+        timeout: Segundos máximos de espera (por defecto el configurado para la consulta)
+        por_defecto: Valor devuelto si la consulta excede el timeout
+
+    Returns:
+        Resultado de la función, o por_defecto si excedió el timeout
+    """
+    nombre = consulta or getattr(funcion, "__name__", "consulta_oracle")
+    limite = timeout or obtener_timeout_consulta(nombre)
+
+    loop = asyncio.get_running_loop()
+    futuro = loop.run_in_executor(obtener_executor_oracle(), partial(funcion, *args, **kwargs))
+
+    try:
+        return await asyncio.wait_for(futuro, timeout=limite)
+    except asyncio.TimeoutError:
+        # El hilo termina por su cuenta; el usuario no espera más que el límite
+        logger.warning(f"⏱️ Consulta Oracle '{nombre}' excedió {limite:.1f}s, se responde sin su resultado")
+        return por_defecto
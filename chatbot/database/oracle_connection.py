@@ -1,7 +1,12 @@
-import oracledb
-from sqlalchemy import create_engine, text
+import time
+import threading
+from sqlalchemy import create_engine, text, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from chatbot.config import settings
+from chatbot.database.circuit_breaker import obtener_circuit_breaker, instrumentar_motor, fallo_registrado
+from chatbot.database.slow_query_log import instrumentar_consultas_lentas
+from chatbot.utils.metricas import Histograma
 import logging
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -9,30 +14,209 @@ from sqlalchemy.ext.declarative import declarative_base
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# windows
-oracledb.init_oracle_client()
+# El engine se crea de forma diferida (primer uso o precalentamiento al arrancar la app),
+# así importar los modelos o los managers no carga el Instant Client ni abre conexiones
+motor = None
+_motor_lock = threading.Lock()
 
-# linux
-# oracledb.init_oracle_client(lib_dir=settings.ORACLEDB_CLIENT_PATH)
+# Pool nativo de python-oracledb (solo con ORACLE_POOL_NATIVO=true)
+pool_oracle = None
 
-motor = create_engine(
-    f"oracle+oracledb://{settings.ORACLE_USER}:{settings.ORACLE_PASS}@{settings.ORACLE_DSN}",
-    thick_mode=True,  # Forzar modo thick
-    pool_pre_ping=True,
-    pool_recycle=1800,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30
-)
+# Tiempo de espera (ms) para obtener una conexión del pool en get_db
+espera_checkout = Histograma()
 
-# Configurar la sesión de la base de datos
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=motor)
+# Configurar la sesión de la base de datos (se enlaza al engine en get_db)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 OracleBase = declarative_base()
 
+def _inicializar_cliente_oracle():
+    """
+    Importa python-oracledb y, en modo thick, carga el Instant Client.
+    En modo thin no se necesita ninguna librería de Oracle instalada.
+    """
+    inicio = time.perf_counter()
+    import oracledb
+
+    if not settings.ORACLE_THIN_MODE:
+        # windows
+        oracledb.init_oracle_client()
+
+        # linux
+        # oracledb.init_oracle_client(lib_dir=settings.ORACLEDB_CLIENT_PATH)
+
+    modo = "thin" if settings.ORACLE_THIN_MODE else "thick"
+    logger.info(f"⏱️ python-oracledb ({modo}) importado e inicializado en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+def _crear_pool_oracle():
+    """
+    Crea el pool nativo de python-oracledb. Las conexiones inactivas se verifican cada
+    ORACLE_POOL_PING_INTERVAL segundos (no en cada checkout como pool_pre_ping) y, con
+    ORACLE_DRCP=true, las sesiones se toman del pool residente en el servidor (DRCP).
+    """
+    import oracledb
+
+    parametros = {
+        "user": settings.ORACLE_USER,
+        "password": settings.ORACLE_PASS,
+        "dsn": settings.ORACLE_DSN,
+        "min": settings.ORACLE_POOL_MIN,
+        "max": settings.ORACLE_POOL_MAX,
+        "increment": settings.ORACLE_POOL_INCREMENT,
+        "ping_interval": settings.ORACLE_POOL_PING_INTERVAL,
+        "getmode": oracledb.POOL_GETMODE_TIMEDWAIT,
+        "wait_timeout": settings.ORACLE_POOL_TIMEOUT * 1000
+    }
+    if settings.ORACLE_DRCP:
+        parametros.update({
+            "server_type": "pooled",
+            "cclass": settings.ORACLE_CCLASS,
+            "purity": oracledb.PURITY_SELF
+        })
+
+    pool = oracledb.create_pool(**parametros)
+    logger.info(
+        f"✅ Pool nativo de Oracle creado (min={settings.ORACLE_POOL_MIN}, max={settings.ORACLE_POOL_MAX}, "
+        f"DRCP={'sí, cclass=' + settings.ORACLE_CCLASS if settings.ORACLE_DRCP else 'no'})"
+    )
+    return pool
+
+def _crear_motor():
+    """Crea el engine de SQLAlchemy para Oracle"""
+    global pool_oracle
+    _inicializar_cliente_oracle()
+
+    if settings.ORACLE_POOL_NATIVO:
+        # SQLAlchemy no mantiene su propio pool: cada checkout toma una conexión del pool de oracledb
+        pool_oracle = _crear_pool_oracle()
+        nuevo_motor = create_engine(
+            "oracle+oracledb://",
+            creator=pool_oracle.acquire,
+            poolclass=NullPool
+        )
+    else:
+        nuevo_motor = create_engine(
+            f"oracle+oracledb://{settings.ORACLE_USER}:{settings.ORACLE_PASS}@{settings.ORACLE_DSN}",
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_size=settings.ORACLE_POOL_SIZE,
+            max_overflow=settings.ORACLE_MAX_OVERFLOW,
+            pool_timeout=settings.ORACLE_POOL_TIMEOUT
+        )
+
+    @event.listens_for(nuevo_motor, "before_cursor_execute")
+    def ajustar_fetch_cursor(conn, cursor, statement, parameters, context, executemany):
+        """Aplica arraysize/prefetchrows pedidos con execution_options(oracle_arraysize=..., oracle_prefetchrows=...)"""
+        opciones = context.execution_options if context is not None else {}
+        if "oracle_arraysize" in opciones:
+            cursor.arraysize = opciones["oracle_arraysize"]
+        if "oracle_prefetchrows" in opciones:
+            cursor.prefetchrows = opciones["oracle_prefetchrows"]
+
+    if settings.ORACLE_CB_HABILITADO:
+        instrumentar_motor(nuevo_motor)
+    if settings.ORACLE_SLOW_QUERY_HABILITADO:
+        instrumentar_consultas_lentas(nuevo_motor)
+
+    if settings.ORACLE_MODO_BUSQUEDA == "nlssort":
+        @event.listens_for(nuevo_motor, "connect")
+        def configurar_sesion_linguistica(dbapi_connection, connection_record):
+            """LIKE e igualdades insensibles a tildes y mayúsculas (usa los índices NLSSORT BINARY_AI)"""
+            cursor = dbapi_connection.cursor()
+            cursor.execute("ALTER SESSION SET NLS_COMP = LINGUISTIC NLS_SORT = BINARY_AI")
+            cursor.close()
+
+    return nuevo_motor
+
+def obtener_motor():
+    """Obtiene el engine de Oracle, creándolo en el primer uso"""
+    global motor
+    if motor is None:
+        with _motor_lock:
+            if motor is None:
+                motor = _crear_motor()
+    return motor
+
+def precalentar_oracle() -> bool:
+    """
+    Crea el engine y abre la primera conexión del pool midiendo el tiempo.
+    Pensado para ejecutarse en segundo plano durante el arranque de la app.
+    """
+    try:
+        inicio = time.perf_counter()
+        with obtener_motor().connect() as conexion:
+            conexion.execute(text("SELECT 1 FROM DUAL"))
+        logger.info(f"⏱️ Primera conexión a Oracle establecida en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error al precalentar la conexión a Oracle: {e}")
+        return False
+
+def obtener_motor_lectura():
+    """
+    Motor para las consultas de lectura: Oracle o la réplica local según ORACLE_BACKEND
+    (Oracle también si la réplica configurada todavía no existe)
+    """
+    if settings.ORACLE_BACKEND == "snapshot":
+        # Import diferido: oracle_snapshot importa este módulo
+        from chatbot.database.oracle_snapshot import obtener_motor_snapshot
+        motor_snapshot = obtener_motor_snapshot()
+        if motor_snapshot is not None:
+            return motor_snapshot
+    return obtener_motor()
+
 # Dependencia para obtener la sesión de DB
 def get_db():
-    db = SessionLocal()
+    motor_lectura = obtener_motor_lectura()
+    directo = motor_lectura is motor
+
+    # El circuit breaker solo protege las consultas directas a Oracle (no la réplica local)
+    breaker = None
+    if settings.ORACLE_CB_HABILITADO and directo:
+        breaker = obtener_circuit_breaker()
+        breaker.verificar()
+
+    db = SessionLocal(bind=motor_lectura)
     try:
+        if directo:
+            # Tomar la conexión aquí para medir la espera del pool y para que un timeout
+            # del pool también cuente como fallo en el circuit breaker
+            inicio = time.perf_counter()
+            try:
+                db.connection()
+            except Exception as e:
+                if breaker is not None and not fallo_registrado():
+                    breaker.registrar_fallo(e)
+                raise
+            finally:
+                espera_checkout.observar((time.perf_counter() - inicio) * 1000)
         yield db
     finally:
         db.close()
+
+def obtener_metricas_pool() -> dict:
+    """Estado del pool de conexiones de Oracle y tiempos de espera del checkout"""
+    metricas = {
+        "backend": settings.ORACLE_BACKEND,
+        "espera_checkout_ms": espera_checkout.resumen(),
+        "circuito": obtener_circuit_breaker().estado
+    }
+    if motor is None:
+        metricas["pool"] = {"tipo": "sin_inicializar"}
+    elif pool_oracle is not None:
+        metricas["pool"] = {
+            "tipo": "oracledb" + (" (DRCP)" if settings.ORACLE_DRCP else ""),
+            "abiertas": pool_oracle.opened,
+            "en_uso": pool_oracle.busy,
+            "min": pool_oracle.min,
+            "max": pool_oracle.max
+        }
+    else:
+        pool = motor.pool
+        metricas["pool"] = {
+            "tipo": "sqlalchemy",
+            "abiertas": pool.checkedin() + pool.checkedout(),
+            "en_uso": pool.checkedout(),
+            "tamano": pool.size(),
+            "overflow": pool.overflow()
+        }
+    return metricas
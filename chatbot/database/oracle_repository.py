@@ -1,5 +1,7 @@
-from sqlalchemy import func
+from sqlalchemy import case, func, literal_column, select
+from chatbot.config import settings
 from chatbot.database.oracle_connection import get_db
+from chatbot.database.circuit_breaker import con_respaldo, es_obsoleto, marcar_fallo
 from chatbot.database.oracle_models import OrganizacionPolitica, CronogramaElectoral, Politico
 from datetime import datetime
 import logging
@@ -7,6 +9,13 @@ import unicodedata
 
 logger = logging.getLogger(__name__)
 
+# Pares de caracteres para TRANSLATE (misma longitud y orden en ambas cadenas)
+ORACLE_CON_TILDES = "ÁÉÍÓÚÀÈÌÒÙÄËÏÖÜÂÊÎÔÛÑáéíóúàèìòùäëïöüâêîôûñ"
+ORACLE_SIN_TILDES = "AEIOUAEIOUAEIOUAEIOUNaeiouaeiouaeiouaeioun"
+
+# Columnas de Politico sobre las que se hacen búsquedas por texto
+COLUMNAS_BUSQUEDA_POLITICO = ("TXNOMBRE", "TXAPEPAT", "TXAPEMAT")
+
 def eliminar_tildes(texto: str) -> str:
     """
     Elimina tildes y caracteres especiales de un texto
@@ -20,9 +29,164 @@ def eliminar_tildes(texto: str) -> str:
     texto_sin_tildes = ''.join(c for c in texto_normalizado if not unicodedata.combining(c))
     return texto_sin_tildes
 
+def modo_busqueda(modo: str = None) -> str:
+    """Modo de búsqueda efectivo; la réplica local (SQLite) no tiene NLSSORT y usa translate"""
+    modo = modo or settings.ORACLE_MODO_BUSQUEDA
+    if modo == "nlssort" and settings.ORACLE_BACKEND == "snapshot":
+        return "translate"
+    return modo
+
+def expresion_sin_tildes(columna, modo: str = None):
+    """
+    Expresión SQL normalizada de una columna, idéntica a la del índice basado en función.
+    Los literales se incrustan en el SQL (no como bind) para que Oracle pueda emparejar
+    la expresión con el índice.
+    """
+    modo = modo_busqueda(modo)
+    if modo == "nlssort":
+        return func.nlssort(columna, literal_column("'NLS_SORT=BINARY_AI'"))
+    return func.upper(
+        func.translate(
+            columna,
+            literal_column(f"'{ORACLE_CON_TILDES}'"),
+            literal_column(f"'{ORACLE_SIN_TILDES}'")
+        )
+    )
+
+def columna_sombra(columna):
+    """Columna sombra <COLUMNA>_NORM (virtual en Oracle) con el valor ya normalizado"""
+    return literal_column(f"{columna.table.fullname}.{columna.name}_NORM")
+
+def predicado_contiene(columna, valor: str, modo: str = None):
+    """
+    Genera el predicado "columna contiene valor" insensible a tildes y mayúsculas.
+    
+    - ilike: lower(columna) LIKE lower(:valor), sin índice (comportamiento original)
+    - translate: UPPER(TRANSLATE(columna, ...)) LIKE :VALOR, usa el índice basado en función
+    - sombra: COLUMNA_NORM LIKE :VALOR sobre la columna virtual indexada
+    - nlssort: columna LIKE :valor con NLS_COMP=LINGUISTIC y NLS_SORT=BINARY_AI en la sesión,
+      usa el índice NLSSORT(columna, 'NLS_SORT=BINARY_AI')
+    """
+    modo = modo_busqueda(modo)
+    valor_sin_tildes = eliminar_tildes(valor)
+    
+    if modo == "translate":
+        return expresion_sin_tildes(columna, modo).like(f"%{valor_sin_tildes.upper()}%")
+    if modo == "sombra":
+        return columna_sombra(columna).like(f"%{valor_sin_tildes.upper()}%")
+    if modo == "nlssort":
+        return columna.like(f"%{valor_sin_tildes}%")
+    return columna.ilike(f"%{valor_sin_tildes}%")
+
+def generar_ddl_indices_busqueda(modo: str = None) -> list:
+    """
+    Genera las sentencias CREATE INDEX que necesita el modo de búsqueda configurado.
+    Deben ejecutarse una vez en Oracle (por un usuario con permisos sobre el esquema).
+    """
+    modo = modo or settings.ORACLE_MODO_BUSQUEDA
+    if modo not in ("translate", "sombra", "nlssort"):
+        return []
+    
+    esquema = settings.ORACLE_SCHEMA
+    tabla = Politico.__tablename__
+    sentencias = []
+    for columna in COLUMNAS_BUSQUEDA_POLITICO:
+        normalizada = f"UPPER(TRANSLATE({columna}, '{ORACLE_CON_TILDES}', '{ORACLE_SIN_TILDES}'))"
+        if modo == "translate":
+            sentencias.append(f"CREATE INDEX {esquema}.IX_POL_{columna}_TR ON {esquema}.{tabla} ({normalizada})")
+        elif modo == "sombra":
+            longitud = Politico.__table__.c[columna].type.length
+            sentencias.append(
+                f"ALTER TABLE {esquema}.{tabla} ADD ({columna}_NORM VARCHAR2({longitud}) "
+                f"GENERATED ALWAYS AS ({normalizada}) VIRTUAL)"
+            )
+            sentencias.append(f"CREATE INDEX {esquema}.IX_POL_{columna}_NORM ON {esquema}.{tabla} ({columna}_NORM)")
+        else:
+            sentencias.append(f"CREATE INDEX {esquema}.IX_POL_{columna}_AI ON {esquema}.{tabla} (NLSSORT({columna}, 'NLS_SORT=BINARY_AI'))")
+    return sentencias
+
+# Meses del cronograma electoral (la columna MES guarda el nombre del mes)
+MESES = {
+    "ENERO": 1, "FEBRERO": 2, "MARZO": 3, "ABRIL": 4,
+    "MAYO": 5, "JUNIO": 6, "JULIO": 7, "AGOSTO": 8,
+    "SEPTIEMBRE": 9, "SETIEMBRE": 9, "OCTUBRE": 10, "NOVIEMBRE": 11, "DICIEMBRE": 12
+}
+
+def orden_cronologico_hitos() -> tuple:
+    """
+    Criterio ORDER BY cronológico del cronograma: MES se convierte a número con CASE
+    (ordenar por el texto del mes daría orden alfabético). Acepta también meses numéricos.
+    """
+    numeros = {str(numero): numero for numero in range(1, 13)}
+    numeros.update({f"{numero:02d}": numero for numero in range(1, 10)})
+    numero_mes = case(
+        {**MESES, **numeros},
+        value=func.upper(func.trim(CronogramaElectoral.MES)),
+        else_=13
+    )
+    return (CronogramaElectoral.ANIO, numero_mes, CronogramaElectoral.DIA)
+
+# Columnas proyectadas de Politico y la clave con la que se exponen en los resultados
+CAMPOS_POLITICO = (
+    ("nombres", Politico.TXNOMBRE),
+    ("apellido_paterno", Politico.TXAPEPAT),
+    ("apellido_materno", Politico.TXAPEMAT),
+    ("region", Politico.TXREGION),
+    ("provincia", Politico.TXPROVINCIA),
+    ("distrito", Politico.TXDISTRITO),
+    ("organizacion_politica", Politico.TXORGPOL),
+    ("eleccion", Politico.TXELECCION),
+    ("siglas", Politico.TXSIGLAS),
+    ("tipo_eleccion", Politico.TXTIPOELECCION),
+    ("cargo_postulado", Politico.TXCARGO),
+    ("cargo_electo", Politico.TXCARGOELECTO),
+)
+
+class RegistroPolitico:
+    """
+    Registro liviano de un político (con __slots__, sin identity map del ORM).
+    Admite acceso por clave como los dicts que se devolvían antes: registro["nombres"].
+    """
+    __slots__ = tuple(clave for clave, _ in CAMPOS_POLITICO)
+    
+    def __init__(self, *valores):
+        for clave, valor in zip(self.__slots__, valores):
+            setattr(self, clave, valor)
+    
+    def __getitem__(self, clave: str):
+        try:
+            return getattr(self, clave)
+        except AttributeError:
+            raise KeyError(clave)
+    
+    def get(self, clave: str, defecto=None):
+        return getattr(self, clave, defecto)
+    
+    def a_dict(self) -> dict:
+        return {clave: getattr(self, clave) for clave in self.__slots__}
+    
+    def a_tupla(self) -> tuple:
+        """Valores en el orden de CAMPOS_POLITICO (RegistroPolitico(*tupla) lo reconstruye)"""
+        return tuple(getattr(self, clave) for clave in self.__slots__)
+    
+    def __repr__(self):
+        return f"<RegistroPolitico(nombres={self.nombres}, apellido_paterno={self.apellido_paterno}, eleccion={self.eleccion})>"
+
+def select_politicos(*condiciones):
+    """SELECT Core de solo las columnas de CAMPOS_POLITICO"""
+    return select(*(columna for _, columna in CAMPOS_POLITICO)).where(*condiciones)
+
+def opciones_fetch() -> dict:
+    """Opciones de ejecución con el tamaño de fetch del cursor oracledb (ver oracle_connection)"""
+    return {
+        "oracle_arraysize": settings.ORACLE_ARRAYSIZE,
+        "oracle_prefetchrows": settings.ORACLE_PREFETCHROWS
+    }
+
 class OracleRepository:
     """Repositorio para consultas a Oracle Database usando modelos SQLAlchemy"""
     
+    @con_respaldo
     def obtener_estadisticas_organizaciones_politicas(self) -> dict:
         """
         Obtiene estadísticas de organizaciones políticas usando el modelo SQLAlchemy
@@ -74,6 +238,7 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al obtener estadísticas de organizaciones políticas: {e}")
+            marcar_fallo()
             return {}
                 
     def generar_reporte_organizaciones_politicas(self) -> str:
@@ -103,6 +268,9 @@ class OracleRepository:
             
             reporte += "\n\n🔗 **Más Información**: https://sroppublico.jne.gob.pe/Consulta/OrganizacionPolitica"
             
+            if es_obsoleto(estadisticas):
+                reporte += "\n\n⚠️ Información de la última consulta exitosa; puede no estar actualizada."
+            
             return reporte
             
         except Exception as e:
@@ -126,6 +294,7 @@ class OracleRepository:
         • Ver estado de tu membresía
         • Acceder a certificados de afiliación"""
     
+    @con_respaldo
     def obtener_procesos_electorales(self) -> list:
         """
         Obtiene la lista de procesos electorales disponibles
@@ -142,8 +311,10 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al obtener procesos electorales: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def obtener_hitos_electorales_por_proceso(self, proceso_electoral: str) -> list:
         """
         Obtiene todos los hitos electorales de un proceso específico
@@ -153,9 +324,7 @@ class OracleRepository:
                 result = session.query(CronogramaElectoral).filter(
                     CronogramaElectoral.PROCESO_ELECTORAL == proceso_electoral
                 ).order_by(
-                    CronogramaElectoral.ANIO,
-                    CronogramaElectoral.MES,
-                    CronogramaElectoral.DIA
+                    *orden_cronologico_hitos()
                 ).all()
                 
                 hitos = []
@@ -173,8 +342,10 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al obtener hitos electorales: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def buscar_hitos_electorales(self, proceso_electoral: str, consulta: str) -> list:
         """
         Busca hitos electorales por proceso electoral y consulta del usuario
@@ -186,9 +357,7 @@ class OracleRepository:
                 result = session.query(CronogramaElectoral).filter(
                     CronogramaElectoral.PROCESO_ELECTORAL == proceso_electoral
                 ).order_by(
-                    CronogramaElectoral.ANIO,
-                    CronogramaElectoral.MES,
-                    CronogramaElectoral.DIA
+                    *orden_cronologico_hitos()
                 ).all()
                 
                 hitos = []
@@ -206,8 +375,10 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al buscar hitos electorales: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def obtener_todos_hitos_por_proceso(self, proceso_electoral: str) -> list:
         """
         Obtiene TODOS los hitos electorales de un proceso específico (sin filtro de texto)
@@ -219,9 +390,7 @@ class OracleRepository:
                 result = session.query(CronogramaElectoral).filter(
                     CronogramaElectoral.PROCESO_ELECTORAL == proceso_electoral
                 ).order_by(
-                    CronogramaElectoral.ANIO,
-                    CronogramaElectoral.MES,
-                    CronogramaElectoral.DIA
+                    *orden_cronologico_hitos()
                 ).all()
                 
                 hitos = []
@@ -245,56 +414,45 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al obtener todos los hitos por proceso: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def buscar_politicos(self, nombres: str, apellidos: str = "") -> list:
         """
         Busca políticos por nombres y apellidos
         """
         try:
             for session in get_db():
-                query = session.query(Politico)
+                condiciones = []
                 
-                # Filtrar por nombres (eliminando tildes)
+                # Filtrar por nombres (insensible a tildes)
                 if nombres:
-                    nombres_sin_tildes = eliminar_tildes(nombres)
-                    query = query.filter(Politico.TXNOMBRE.ilike(f"%{nombres_sin_tildes}%"))
+                    condiciones.append(predicado_contiene(Politico.TXNOMBRE, nombres))
                 
-                # Filtrar por apellidos si se proporcionan (eliminando tildes)
+                # Filtrar por apellidos si se proporcionan (insensible a tildes)
                 if apellidos:
-                    apellidos_sin_tildes = eliminar_tildes(apellidos)
                     # Buscar en apellido paterno o materno
-                    query = query.filter(
-                        (Politico.TXAPEPAT.ilike(f"%{apellidos}%")) |
-                        (Politico.TXAPEMAT.ilike(f"%{apellidos}%"))
+                    condiciones.append(
+                        predicado_contiene(Politico.TXAPEPAT, apellidos) |
+                        predicado_contiene(Politico.TXAPEMAT, apellidos)
                     )
                 
-                result = query.all()
-                
-                politicos = []
-                for row in result:
-                    politicos.append({
-                        "nombres": row.TXNOMBRE,
-                        "apellido_paterno": row.TXAPEPAT,
-                        "apellido_materno": row.TXAPEMAT,
-                        "region": row.TXREGION,
-                        "provincia": row.TXPROVINCIA,
-                        "distrito": row.TXDISTRITO,
-                        "organizacion_politica": row.TXORGPOL,
-                        "eleccion": row.TXELECCION,
-                        "siglas": row.TXSIGLAS,
-                        "tipo_eleccion": row.TXTIPOELECCION,
-                        "cargo_postulado": row.TXCARGO,
-                        "cargo_electo": row.TXCARGOELECTO
-                    })
+                # Proyección Core de solo las columnas necesarias (sin hidratar objetos ORM)
+                result = session.execute(
+                    select_politicos(*condiciones).execution_options(**opciones_fetch())
+                )
+                politicos = [RegistroPolitico(*row) for row in result]
                 
                 logger.info(f"✅ Políticos encontrados: {len(politicos)} políticos")
                 return politicos
                 
         except Exception as e:
             logger.error(f"❌ Error al buscar políticos: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def obtener_elecciones_disponibles(self) -> list:
         """
         Obtiene la lista de elecciones disponibles para consulta de políticos
@@ -311,59 +469,46 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al obtener elecciones disponibles: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def buscar_politicos_por_eleccion(self, eleccion: str, nombres: str = "", apellidos: str = "") -> list:
         """
         Busca políticos por elección específica y opcionalmente por nombres/apellidos
         """
         try:
             for session in get_db():
-                query = session.query(Politico).filter(
-                    Politico.TXELECCION == eleccion
-                )
+                condiciones = [Politico.TXELECCION == eleccion]
                 
                 # Filtrar por nombres si se proporcionan
                 if nombres:
-                    query = query.filter(Politico.TXNOMBRE.ilike(f"%{nombres}%"))
+                    condiciones.append(predicado_contiene(Politico.TXNOMBRE, nombres))
                 
                 # Filtrar por apellidos si se proporcionan
                 if apellidos:
-                    query = query.filter(
-                        (Politico.TXAPEPAT.ilike(f"%{apellidos}%")) |
-                        (Politico.TXAPEMAT.ilike(f"%{apellidos}%"))
+                    condiciones.append(
+                        predicado_contiene(Politico.TXAPEPAT, apellidos) |
+                        predicado_contiene(Politico.TXAPEMAT, apellidos)
                     )
                 
-                result = query.order_by(
+                consulta = select_politicos(*condiciones).order_by(
                     Politico.TXNOMBRE,
                     Politico.TXAPEPAT,
                     Politico.TXAPEMAT
-                ).all()
-                
-                politicos = []
-                for row in result:
-                    politicos.append({
-                        "nombres": row.TXNOMBRE,
-                        "apellido_paterno": row.TXAPEPAT,
-                        "apellido_materno": row.TXAPEMAT,
-                        "region": row.TXREGION,
-                        "provincia": row.TXPROVINCIA,
-                        "distrito": row.TXDISTRITO,
-                        "organizacion_politica": row.TXORGPOL,
-                        "eleccion": row.TXELECCION,
-                        "siglas": row.TXSIGLAS,
-                        "tipo_eleccion": row.TXTIPOELECCION,
-                        "cargo_postulado": row.TXCARGO,
-                        "cargo_electo": row.TXCARGOELECTO
-                    })
+                )
+                result = session.execute(consulta.execution_options(**opciones_fetch()))
+                politicos = [RegistroPolitico(*row) for row in result]
                 
                 logger.info(f"✅ Políticos encontrados por elección: {len(politicos)} políticos")
                 return politicos
                 
         except Exception as e:
             logger.error(f"❌ Error al buscar políticos por elección: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def buscar_candidatos_unicos(self, nombres: str, apellidos: str = "") -> list:
         """
         Busca candidatos únicos por nombres y apellidos (sin repetir nombres)
@@ -372,17 +517,15 @@ class OracleRepository:
             for session in get_db():
                 query = session.query(Politico)
                 
-                # Filtrar por nombres (eliminando tildes)
+                # Filtrar por nombres (insensible a tildes)
                 if nombres:
-                    nombres_sin_tildes = eliminar_tildes(nombres)
-                    query = query.filter(Politico.TXNOMBRE.ilike(f"%{nombres_sin_tildes}%"))
+                    query = query.filter(predicado_contiene(Politico.TXNOMBRE, nombres))
                 
-                # Filtrar por apellidos si se proporcionan (eliminando tildes)
+                # Filtrar por apellidos si se proporcionan (insensible a tildes)
                 if apellidos:
-                    apellidos_sin_tildes = eliminar_tildes(apellidos)
                     query = query.filter(
-                        (Politico.TXAPEPAT.ilike(f"%{apellidos_sin_tildes}%")) |
-                        (Politico.TXAPEMAT.ilike(f"%{apellidos_sin_tildes}%"))
+                        predicado_contiene(Politico.TXAPEPAT, apellidos) |
+                        predicado_contiene(Politico.TXAPEMAT, apellidos)
                     )
                 
                 # Obtener candidatos únicos (sin repetir nombres completos)
@@ -412,8 +555,10 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al buscar candidatos únicos: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def buscar_candidatos_por_apellidos_separados(self, nombres: str, apellido_paterno: str, apellido_materno: str) -> list:
         """
         Busca candidatos por nombres, apellido paterno y materno por separado
@@ -422,20 +567,17 @@ class OracleRepository:
             for session in get_db():
                 query = session.query(Politico)
                 
-                # Filtrar por nombres (eliminando tildes)
+                # Filtrar por nombres (insensible a tildes)
                 if nombres:
-                    nombres_sin_tildes = eliminar_tildes(nombres)
-                    query = query.filter(Politico.TXNOMBRE.ilike(f"%{nombres_sin_tildes}%"))
+                    query = query.filter(predicado_contiene(Politico.TXNOMBRE, nombres))
                 
-                # Filtrar por apellido paterno (eliminando tildes)
+                # Filtrar por apellido paterno (insensible a tildes)
                 if apellido_paterno:
-                    apellido_paterno_sin_tildes = eliminar_tildes(apellido_paterno)
-                    query = query.filter(Politico.TXAPEPAT.ilike(f"%{apellido_paterno_sin_tildes}%"))
+                    query = query.filter(predicado_contiene(Politico.TXAPEPAT, apellido_paterno))
                 
-                # Filtrar por apellido materno (eliminando tildes)
+                # Filtrar por apellido materno (insensible a tildes)
                 if apellido_materno:
-                    apellido_materno_sin_tildes = eliminar_tildes(apellido_materno)
-                    query = query.filter(Politico.TXAPEMAT.ilike(f"%{apellido_materno_sin_tildes}%"))
+                    query = query.filter(predicado_contiene(Politico.TXAPEMAT, apellido_materno))
                 
                 # Obtener candidatos únicos (sin repetir nombres completos)
                 result = session.query(
@@ -464,8 +606,10 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al buscar candidatos por apellidos separados: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def obtener_elecciones_por_candidato(self, nombres: str, apellido_paterno: str, apellido_materno: str) -> list:
         """
         Obtiene todas las elecciones donde aparece un candidato específico
@@ -486,36 +630,51 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al obtener elecciones por candidato: {e}")
+            marcar_fallo()
+            return []
+    
+    @con_respaldo
+    def obtener_registros_candidato(self, nombres: str, apellido_paterno: str, apellido_materno: str) -> list:
+        """
+        Obtiene en una sola consulta todas las filas de un candidato (una por elección),
+        para servir el menú de elecciones y el detalle sin volver a Oracle
+        """
+        try:
+            for session in get_db():
+                consulta = select_politicos(
+                    Politico.TXNOMBRE == nombres,
+                    Politico.TXAPEPAT == apellido_paterno,
+                    Politico.TXAPEMAT == apellido_materno
+                ).order_by(Politico.TXELECCION)
+                result = session.execute(consulta.execution_options(**opciones_fetch()))
+                registros = [RegistroPolitico(*row) for row in result]
+                
+                logger.info(f"✅ Registros encontrados para candidato: {len(registros)} registros")
+                return registros
+                
+        except Exception as e:
+            logger.error(f"❌ Error al obtener registros del candidato: {e}")
+            marcar_fallo()
             return []
     
+    @con_respaldo
     def obtener_detalle_candidato_eleccion(self, nombres: str, apellido_paterno: str, apellido_materno: str, eleccion: str) -> dict:
         """
         Obtiene el detalle completo de un candidato en una elección específica
         """
         try:
             for session in get_db():
-                result = session.query(Politico).filter(
+                consulta = select_politicos(
                     Politico.TXNOMBRE == nombres,
                     Politico.TXAPEPAT == apellido_paterno,
                     Politico.TXAPEMAT == apellido_materno,
                     Politico.TXELECCION == eleccion
-                ).first()
+                ).limit(1)
+                result = session.execute(consulta).first()
                 
                 if result:
-                    detalle = {
-                        "nombres": result.TXNOMBRE,
-                        "apellido_paterno": result.TXAPEPAT,
-                        "apellido_materno": result.TXAPEMAT,
-                        "region": result.TXREGION,
-                        "provincia": result.TXPROVINCIA,
-                        "distrito": result.TXDISTRITO,
-                        "organizacion_politica": result.TXORGPOL,
-                        "eleccion": result.TXELECCION,
-                        "siglas": result.TXSIGLAS,
-                        "tipo_eleccion": result.TXTIPOELECCION,
-                        "cargo_postulado": result.TXCARGO,
-                        "cargo_electo": result.TXCARGOELECTO
-                    }
+                    # Dict como antes: los llamadores lo serializan o iteran con .items()
+                    detalle = RegistroPolitico(*result).a_dict()
                     
                     logger.info(f"✅ Detalle de candidato obtenido para {eleccion}")
                     return detalle
@@ -525,6 +684,7 @@ class OracleRepository:
                 
         except Exception as e:
             logger.error(f"❌ Error al obtener detalle de candidato: {e}")
+            marcar_fallo()
             return {}
     
     def probar_conexion(self) -> bool:
@@ -0,0 +1,188 @@
+import os
+import time
+import logging
+import threading
+from functools import lru_cache
+from sqlalchemy import Column, MetaData, Table, create_engine, event, insert, select, text
+from chatbot.config import settings
+from chatbot.database.oracle_connection import OracleBase, obtener_motor
+from chatbot.database.oracle_models import OrganizacionPolitica, CronogramaElectoral, Politico
+from chatbot.database.slow_query_log import instrumentar_consultas_lentas
+
+logger = logging.getLogger(__name__)
+
+# Réplica local de solo lectura de las tablas de referencia del esquema ELECCIA.
+# El archivo SQLite contiene las tablas con los mismos nombres; en cada conexión se adjunta
+# (ATTACH) con el nombre del esquema, así las consultas del repositorio se ejecutan sin cambios.
+
+# Índices de la réplica: (nombre, tabla, columnas)
+INDICES_SNAPSHOT = (
+    ("IX_POL_NOMBRE_COMPLETO", Politico.__tablename__, "TXNOMBRE, TXAPEPAT, TXAPEMAT"),
+    ("IX_POL_ELECCION", Politico.__tablename__, "TXELECCION"),
+    ("IX_POL_TXNOMBRE_NORM", Politico.__tablename__, "TXNOMBRE_NORM"),
+    ("IX_POL_TXAPEPAT_NORM", Politico.__tablename__, "TXAPEPAT_NORM"),
+    ("IX_POL_TXAPEMAT_NORM", Politico.__tablename__, "TXAPEMAT_NORM"),
+    ("IX_CRONO_PROCESO", CronogramaElectoral.__tablename__, "PROCESO_ELECTORAL, ANIO, DIA"),
+    ("IX_ORG_TIPO", OrganizacionPolitica.__tablename__, "DES_TIPO"),
+)
+
+_motor_snapshot = None
+_mtime_snapshot = None
+# Momento (monotónico) de la última revisión del archivo; None fuerza la próxima revisión
+_revisado_en = None
+_snapshot_lock = threading.Lock()
+
+@lru_cache(maxsize=8)
+def _tabla_traduccion(desde: str, hacia: str) -> dict:
+    return str.maketrans(desde, hacia)
+
+def _translate(texto, desde, hacia):
+    """Equivalente de TRANSLATE de Oracle para SQLite"""
+    if texto is None:
+        return None
+    return texto.translate(_tabla_traduccion(desde, hacia))
+
+def crear_motor_sqlite_eleccia(ruta_esquema: str, ruta_main: str = None):
+    """
+    Crea un motor SQLite con el archivo del esquema adjunto como ELECCIA y la función TRANSLATE,
+    de modo que los modelos y consultas de Oracle se ejecutan sin cambios.
+    """
+    url = f"sqlite:///{ruta_main}" if ruta_main else "sqlite://"
+    nuevo_motor = create_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(nuevo_motor, "connect")
+    def preparar_conexion(dbapi_connection, connection_record):
+        dbapi_connection.create_function("translate", 3, _translate, deterministic=True)
+        dbapi_connection.execute(f"ATTACH DATABASE '{ruta_esquema}' AS {settings.ORACLE_SCHEMA}")
+
+    return nuevo_motor
+
+def obtener_motor_snapshot():
+    """
+    Obtiene el motor de la réplica local, o None si el archivo no existe (se consulta Oracle).
+    El archivo se revisa cada ORACLE_SNAPSHOT_REVISION segundos, no en cada consulta: si cambió
+    (nuevo snapshot reemplazado con os.replace), se crea un motor nuevo y se libera el anterior;
+    las conexiones en uso siguen leyendo el archivo anterior hasta cerrarse.
+    """
+    global _revisado_en
+    if _revisado_en is not None and time.monotonic() - _revisado_en < settings.ORACLE_SNAPSHOT_REVISION:
+        return _motor_snapshot
+
+    with _snapshot_lock:
+        if _revisado_en is None or time.monotonic() - _revisado_en >= settings.ORACLE_SNAPSHOT_REVISION:
+            _revisar_snapshot(settings.ORACLE_SNAPSHOT_PATH)
+            _revisado_en = time.monotonic()
+    return _motor_snapshot
+
+def _revisar_snapshot(ruta: str):
+    """Carga, recarga o descarta el motor de la réplica según el archivo (se llama con el lock tomado)"""
+    global _motor_snapshot, _mtime_snapshot
+    motor_anterior = _motor_snapshot
+    try:
+        mtime = os.stat(ruta).st_mtime_ns
+    except FileNotFoundError:
+        # ATTACH de un archivo inexistente crearía una base vacía: mejor consultar Oracle
+        if motor_anterior is not None or _mtime_snapshot is None:
+            logger.warning(f"⚠️ No existe la réplica local {ruta}, las lecturas van a Oracle")
+        _motor_snapshot, _mtime_snapshot = None, 0
+        if motor_anterior is not None:
+            motor_anterior.dispose()
+        return
+
+    if motor_anterior is not None and mtime == _mtime_snapshot:
+        return
+    _motor_snapshot = crear_motor_sqlite_eleccia(ruta)
+    if settings.ORACLE_SLOW_QUERY_HABILITADO:
+        instrumentar_consultas_lentas(_motor_snapshot)
+    _mtime_snapshot = mtime
+    if motor_anterior is not None:
+        motor_anterior.dispose()
+    logger.info(f"✅ Réplica local de Oracle cargada: {ruta}")
+
+def crear_tablas_snapshot(destino) -> MetaData:
+    """
+    Crea en la réplica las tablas de los modelos sin llaves primarias ni restricciones: las
+    llaves de los modelos ORM no son únicas en los datos reales (COD_TIPO_OP se repite por
+    organización, IDPERSONA por elección) y en Oracle no existen como restricción.
+    """
+    metadata = MetaData()
+    for tabla in OracleBase.metadata.sorted_tables:
+        Table(
+            tabla.name, metadata,
+            *(Column(columna.name, columna.type, nullable=True) for columna in tabla.columns),
+            schema=tabla.schema
+        )
+    metadata.create_all(destino)
+    return metadata
+
+def _copiar_tabla(origen, destino, tabla, tabla_destino, lote: int) -> int:
+    """Copia una tabla de Oracle a la réplica por lotes, sin cargarla entera en memoria"""
+    filas = 0
+    with origen.connect() as conexion_origen, destino.begin() as conexion_destino:
+        resultado = conexion_origen.execution_options(
+            stream_results=True, yield_per=lote
+        ).execute(select(tabla))
+        for particion in resultado.mappings().partitions():
+            conexion_destino.execute(insert(tabla_destino), [dict(fila) for fila in particion])
+            filas += len(particion)
+    return filas
+
+def _preparar_busqueda(destino):
+    """Columnas *_NORM (modo sombra) e índices de la réplica"""
+    # Import diferido: oracle_repository importa oracle_connection, que no depende de este módulo
+    from chatbot.database.oracle_repository import (
+        COLUMNAS_BUSQUEDA_POLITICO, ORACLE_CON_TILDES, ORACLE_SIN_TILDES
+    )
+    esquema = settings.ORACLE_SCHEMA
+    tabla_politicos = Politico.__tablename__
+
+    with destino.begin() as conexion:
+        for columna in COLUMNAS_BUSQUEDA_POLITICO:
+            normalizada = f"upper(translate({columna}, '{ORACLE_CON_TILDES}', '{ORACLE_SIN_TILDES}'))"
+            conexion.execute(text(f"ALTER TABLE {esquema}.{tabla_politicos} ADD COLUMN {columna}_NORM VARCHAR"))
+            conexion.execute(text(f"UPDATE {esquema}.{tabla_politicos} SET {columna}_NORM = {normalizada}"))
+        for nombre, tabla, columnas in INDICES_SNAPSHOT:
+            conexion.execute(text(f"CREATE INDEX {esquema}.{nombre} ON {tabla} ({columnas})"))
+        conexion.execute(text(f"ANALYZE {esquema}"))
+
+def sincronizar_snapshot(ruta: str = None, motor_origen=None, lote: int = 5000) -> dict:
+    """
+    Exporta las tablas de referencia de Oracle a un archivo SQLite nuevo y lo publica de forma
+    atómica (os.replace) en la ruta del snapshot. Es el único punto que consulta Oracle
+    cuando ORACLE_BACKEND=snapshot.
+
+    Returns:
+        Filas copiadas por tabla
+    """
+    ruta = ruta or settings.ORACLE_SNAPSHOT_PATH
+    origen = motor_origen or obtener_motor()
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+
+    # El archivo temporal se crea en el mismo directorio para que os.replace sea atómico
+    ruta_temporal = f"{ruta}.{os.getpid()}.tmp"
+    if os.path.exists(ruta_temporal):
+        os.remove(ruta_temporal)
+
+    inicio = time.perf_counter()
+    destino = crear_motor_sqlite_eleccia(ruta_temporal)
+    try:
+        tablas_destino = crear_tablas_snapshot(destino).tables
+        filas = {}
+        for tabla in OracleBase.metadata.sorted_tables:
+            filas[tabla.name] = _copiar_tabla(origen, destino, tabla, tablas_destino[tabla.key], lote)
+            logger.info(f"📦 {tabla.name}: {filas[tabla.name]} filas copiadas")
+        _preparar_busqueda(destino)
+    except Exception:
+        destino.dispose()
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+
+    destino.dispose()
+    os.replace(ruta_temporal, ruta)
+    # Si la réplica se sincroniza en este proceso, la próxima consulta ya lee el archivo nuevo
+    global _revisado_en
+    _revisado_en = None
+    logger.info(f"✅ Snapshot de Oracle publicado en {ruta} en {time.perf_counter() - inicio:.1f}s")
+    return filas
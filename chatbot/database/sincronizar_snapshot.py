@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+import argparse
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from chatbot.config import settings
+from chatbot.database.oracle_snapshot import sincronizar_snapshot
+
+def ejecutar_sincronizacion(ruta: str) -> bool:
+    """Genera y publica un snapshot nuevo; si falla se conserva el snapshot anterior"""
+    try:
+        filas = sincronizar_snapshot(ruta)
+        print(f"✅ Snapshot actualizado: {filas}")
+        return True
+    except Exception as e:
+        print(f"❌ Error al sincronizar el snapshot de Oracle: {e}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sincroniza las tablas de referencia de Oracle en la réplica local")
+    parser.add_argument("--ruta", default=settings.ORACLE_SNAPSHOT_PATH)
+    parser.add_argument("--cada", type=float, default=0, help="Minutos entre sincronizaciones (0 = una sola vez)")
+    args = parser.parse_args()
+
+    print(f"🚀 Sincronizando snapshot de Oracle en {args.ruta}...")
+    exito = ejecutar_sincronizacion(args.ruta)
+
+    while args.cada > 0:
+        time.sleep(args.cada * 60)
+        ejecutar_sincronizacion(args.ruta)
+
+    sys.exit(0 if exito else 1)
@@ -0,0 +1,143 @@
+import re
+import time
+import logging
+import threading
+from sqlalchemy import event
+from chatbot.config import settings
+from chatbot.utils.metricas import Histograma
+
+logger = logging.getLogger(__name__)
+
+# Estadísticas por plantilla de consulta (el SQL con binds, sin valores)
+_plantillas: dict = {}
+_plantillas_lock = threading.Lock()
+
+class EstadisticaPlantilla:
+    """Latencias acumuladas de una plantilla de consulta"""
+
+    def __init__(self, plantilla: str):
+        self.plantilla = plantilla
+        self.histograma = Histograma()
+        self.lentas = 0
+        self.errores = 0
+        self.plan = None
+
+    def reporte(self) -> dict:
+        resumen = self.histograma.resumen()
+        return {
+            "plantilla": self.plantilla,
+            "conteo": resumen["conteo"],
+            "promedio_ms": resumen["promedio"],
+            "p50_ms": resumen["p50"],
+            "p90_ms": resumen["p90"],
+            "p99_ms": resumen["p99"],
+            "max_ms": resumen["max"],
+            "total_ms": round(self.histograma.suma, 2),
+            "lentas": self.lentas,
+            "errores": self.errores,
+            "plan": self.plan
+        }
+
+def normalizar_plantilla(sentencia: str) -> str:
+    """Colapsa espacios y saltos de línea para agrupar la misma consulta"""
+    return re.sub(r"\s+", " ", sentencia).strip()
+
+def forma_parametros(parametros) -> str:
+    """Tipos y longitudes de los binds, sin exponer sus valores (pueden ser nombres de personas)"""
+    if isinstance(parametros, (list, tuple)) and parametros and isinstance(parametros[0], (dict, list, tuple)):
+        return f"{len(parametros)} filas x {forma_parametros(parametros[0])}"
+
+    def forma(valor):
+        if isinstance(valor, str):
+            return f"str({len(valor)})"
+        return type(valor).__name__
+
+    if isinstance(parametros, dict):
+        return "{" + ", ".join(f"{clave}: {forma(valor)}" for clave, valor in parametros.items()) + "}"
+    if isinstance(parametros, (list, tuple)):
+        return "(" + ", ".join(forma(valor) for valor in parametros) + ")"
+    return "()"
+
+def _obtener_estadistica(plantilla: str):
+    estadistica = _plantillas.get(plantilla)
+    if estadistica is None:
+        with _plantillas_lock:
+            estadistica = _plantillas.get(plantilla)
+            if estadistica is None:
+                if len(_plantillas) >= settings.ORACLE_SLOW_QUERY_MAX_PLANTILLAS:
+                    return None
+                estadistica = _plantillas[plantilla] = EstadisticaPlantilla(plantilla)
+    return estadistica
+
+def _capturar_plan(conn, sentencia: str, parametros) -> str:
+    """Plan de ejecución de la sentencia (EXPLAIN PLAN en Oracle, EXPLAIN QUERY PLAN en SQLite)"""
+    cursor = conn.connection.cursor()
+    try:
+        if conn.dialect.name == "oracle":
+            # El driver exige un valor por cada bind (en modo thin falla sin ellos); Oracle
+            # igual analiza los binds como placeholders sin mirar los valores
+            cursor.execute(f"EXPLAIN PLAN FOR {sentencia}", parametros or {})
+            cursor.execute("SELECT PLAN_TABLE_OUTPUT FROM TABLE(DBMS_XPLAN.DISPLAY())")
+            return "\n".join(fila[0] for fila in cursor.fetchall())
+        if conn.dialect.name == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sentencia}", parametros)
+            return "\n".join(str(fila[-1]) for fila in cursor.fetchall())
+        return None
+    finally:
+        cursor.close()
+
+def instrumentar_consultas_lentas(motor):
+    """Mide cada sentencia del engine y registra la latencia por plantilla de consulta"""
+
+    @event.listens_for(motor, "before_cursor_execute")
+    def marcar_inicio(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inicio_slow_query", []).append(time.perf_counter())
+
+    @event.listens_for(motor, "after_cursor_execute")
+    def registrar_latencia(conn, cursor, statement, parameters, context, executemany):
+        milisegundos = (time.perf_counter() - conn.info["inicio_slow_query"].pop()) * 1000
+        estadistica = _obtener_estadistica(normalizar_plantilla(statement))
+        if estadistica is None:
+            return
+        estadistica.histograma.observar(milisegundos)
+
+        if milisegundos < settings.ORACLE_SLOW_QUERY_MS:
+            return
+        estadistica.lentas += 1
+        logger.warning(
+            f"🐢 Consulta lenta ({milisegundos:.0f} ms): {estadistica.plantilla[:300]} "
+            f"| binds: {forma_parametros(parameters)}"
+        )
+
+        # El plan se captura una sola vez por plantilla
+        if settings.ORACLE_SLOW_QUERY_PLAN and estadistica.plan is None and not executemany:
+            try:
+                estadistica.plan = _capturar_plan(conn, statement, parameters)
+                logger.warning(f"🐢 Plan de la consulta lenta:\n{estadistica.plan}")
+            except Exception as e:
+                estadistica.plan = f"No se pudo capturar el plan: {e}"
+                logger.warning(f"⚠️ No se pudo capturar el plan de la consulta lenta: {e}")
+
+    @event.listens_for(motor, "handle_error")
+    def registrar_error(contexto):
+        conexion = contexto.connection
+        if conexion is not None and conexion.info.get("inicio_slow_query"):
+            conexion.info["inicio_slow_query"].pop()
+        if contexto.statement:
+            estadistica = _obtener_estadistica(normalizar_plantilla(contexto.statement))
+            if estadistica is not None:
+                estadistica.errores += 1
+
+def top_consultas_lentas(n: int = 10, orden: str = "p90_ms") -> list:
+    """
+    Plantillas de consulta más lentas.
+
+    Args:
+        n: Cantidad de plantillas a devolver
+        orden: Campo del reporte por el que se ordena (p90_ms, p99_ms, max_ms, promedio_ms, total_ms, lentas)
+    """
+    with _plantillas_lock:
+        estadisticas = list(_plantillas.values())
+    reportes = [estadistica.reporte() for estadistica in estadisticas]
+    reportes.sort(key=lambda reporte: reporte.get(orden, 0) or 0, reverse=True)
+    return reportes[:n]
@@ -1,6 +1,9 @@
+import asyncio
 from fastapi import FastAPI, Request
-from chatbot.routes import telegram, api_gateway, whatsapp
+from chatbot.config import settings
+from chatbot.routes import telegram, api_gateway, whatsapp, metrics
 from chatbot.database.connection import inicializar_conexiones
+from chatbot.database.oracle_connection import precalentar_oracle
 
 app = FastAPI(title="Chatbot JNE Simplificado")
 
@@ -22,11 +25,18 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ Advertencia: Redis no está disponible: {e}")
         print("   El sistema funcionará pero sin memoria de chat")
+    
+    # Oracle se inicializa de forma diferida; se precalienta en segundo plano sin bloquear el arranque.
+    # Con la réplica local (ORACLE_BACKEND=snapshot) solo el job de sincronización contacta a Oracle
+    if settings.ORACLE_PRECALENTAR and settings.ORACLE_BACKEND == "oracle":
+        asyncio.get_running_loop().run_in_executor(None, precalentar_oracle)
+        print("⏳ Conexión a Oracle inicializándose en segundo plano")
 
 # Routers
 app.include_router(telegram.router, prefix="/webhook/telegram", tags=["Telegram"])
 app.include_router(whatsapp.router, prefix="/webhook/whatsapp", tags=["WhatsApp"])
 app.include_router(api_gateway.router, prefix="/api", tags=["API Gateway"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Métricas"])
 
 @app.get("/health")
 async def health_check():
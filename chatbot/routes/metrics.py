@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from chatbot.database.oracle_connection import obtener_metricas_pool
+from chatbot.database.slow_query_log import top_consultas_lentas
+from chatbot.services.cache_consultas import obtener_estadisticas_cache
+from chatbot.services.metricas_llm import obtener_metricas_llamadas
+from chatbot.services.llm_gateway import estadisticas_agrupacion, estadisticas_json, estadisticas_hedging
+from chatbot.services.limites_llm import estadisticas_limites, tokens_consumidos_hoy
+
+router = APIRouter()
+
+@router.get("/oracle")
+async def metricas_oracle():
+    """Conexiones abiertas y en uso del pool de Oracle y tiempo de espera del checkout"""
+    return obtener_metricas_pool()
+
+@router.get("/oracle/consultas-lentas")
+async def consultas_lentas_oracle(n: int = 10, orden: str = "p90_ms"):
+    """Top-N de plantillas de consulta más lentas (orden: p90_ms, p99_ms, max_ms, promedio_ms, total_ms, lentas)"""
+    return {"consultas": top_consultas_lentas(n, orden)}
+
+@router.get("/cache-consultas")
+async def metricas_cache_consultas():
+    """Aciertos, casi duplicados y fallos de la cache de búsquedas (por worker y acumulados en Redis)"""
+    return obtener_estadisticas_cache()
+
+@router.get("/llm")
+async def metricas_llm():
+    """Latencia, tokens, costo y resultados por tarea y modelo; agrupación, JSON, hedging y límites (por worker)"""
+    metricas = obtener_metricas_llamadas()
+    metricas["agrupacion"] = dict(estadisticas_agrupacion)
+    metricas["json"] = dict(estadisticas_json)
+    metricas["hedging"] = dict(estadisticas_hedging)
+    metricas["limites"] = {**estadisticas_limites, "tokens_hoy": tokens_consumidos_hoy()}
+    return metricas
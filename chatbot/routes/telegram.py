@@ -6,12 +6,18 @@ from chatbot.services.db_logger import log_message
 from chatbot.services.chat_memory_manager import ChatMemoryManager
 from chatbot.services.servicios_digitales_manager import ServiciosDigitalesManager
 from chatbot.services.informacion_institucional_manager import InformacionInstitucionalManager
-from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager
+from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager, PROCESOS_CON_CRONOGRAMA
+from chatbot.services.llm_gateway import generar_texto, generar_texto_stream
+from chatbot.services.limites_llm import LimiteLLMExcedido, respuesta_sin_llm, usuario_llm
+from chatbot.utils.message_utils import transmitir_mensaje_telegram
+from chatbot.database.oracle_async import ejecutar_en_oracle
+from chatbot.database.circuit_breaker import es_obsoleto
+from chatbot.config import settings
 import os
+import asyncio
 import httpx
 from dotenv import load_dotenv
 from typing import Dict, Optional
-from google import genai
 
 load_dotenv()
 
@@ -20,7 +26,6 @@ router = APIRouter()
 # Configuración
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_API_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
-client = genai.Client()
 
 # Estado de usuarios en memoria
 user_states: Dict[int, dict] = {}
@@ -114,10 +119,11 @@ class ResponseManager:
     """Maneja las respuestas del bot y el logging"""
     
     @staticmethod
-    async def send_response(chat_id: int, text: str, state: dict, menu_actual: str = "main"):
-        """Envía respuesta y la registra en la conversación"""
+    async def send_response(chat_id: int, text: str, state: dict, menu_actual: str = "main", enviar: bool = True):
+        """Envía respuesta y la registra en la conversación (enviar=False si ya se transmitió por partes)"""
         # Enviar a Telegram
-        await enviar_mensaje_telegram({"chat_id": chat_id, "text": text})
+        if enviar:
+            await enviar_mensaje_telegram({"chat_id": chat_id, "text": text})
         
         # Registrar en conversación
         chat_memory = get_chat_memory()
@@ -331,8 +337,14 @@ class StateHandler:
         """Maneja preguntas del usuario"""
         try:
             context = context_map.get(state["final_choice"], "")
-            llm_reply = send_to_llm(text, context)
-            respuesta_completa = llm_reply + "\n\n¿Tienes otra consulta? (responde 'si' o 'no'):"
+            sufijo = "\n\n¿Tienes otra consulta? (responde 'si' o 'no'):"
+            if settings.TELEGRAM_STREAMING:
+                # La respuesta se muestra a medida que el LLM la genera
+                respuesta_completa = await transmitir_mensaje_telegram(chat_id, send_to_llm_stream(text, context), sufijo)
+                state["respuesta_transmitida"] = True
+            else:
+                llm_reply = await send_to_llm(text, context)
+                respuesta_completa = llm_reply + sufijo
             state["stage"] = "awaiting_another_question"
             return respuesta_completa
         except Exception as e:
@@ -344,7 +356,7 @@ class StateHandler:
         """Maneja consultas de trámites"""
         try:
             servicios_manager = get_servicios_manager()
-            servicios_encontrados = servicios_manager.buscar_servicios_semanticamente(text, top_k=5)
+            servicios_encontrados = await servicios_manager.buscar_servicios_semanticamente(text, top_k=5)
             
             if servicios_encontrados:
                 state["servicios_encontrados"] = servicios_encontrados
@@ -421,7 +433,7 @@ class StateHandler:
         """Maneja la selección de procesos electorales"""
         if text.isdigit():
             opcion = int(text)
-            procesos_especificos = ["EG.2026", "EMC.2025", "ERM.2022", "EG.2021"]
+            procesos_especificos = PROCESOS_CON_CRONOGRAMA
             
             if opcion == len(procesos_especificos) + 1:
                 procesos_manager = get_procesos_electorales_manager()
@@ -455,7 +467,7 @@ class StateHandler:
                 state["stage"] = "main"
                 return "Error: No se encontró el proceso electoral seleccionado. Por favor, vuelve al menú principal."
             
-            hitos = procesos_manager.buscar_hitos_electorales_semanticamente(proceso_electoral, text)
+            hitos = await procesos_manager.buscar_hitos_electorales_semanticamente(proceso_electoral, text)
             
             if hitos:
                 state["hitos_encontrados"] = hitos
@@ -484,7 +496,13 @@ class StateHandler:
             if 1 <= opcion <= len(hitos):
                 hito_seleccionado = hitos[opcion - 1]
                 procesos_manager = get_procesos_electorales_manager()
-                respuesta = procesos_manager.formatear_hito_electoral(hito_seleccionado)
+                if settings.TELEGRAM_STREAMING:
+                    respuesta = await transmitir_mensaje_telegram(
+                        chat_id, procesos_manager.formatear_hito_electoral_stream(hito_seleccionado)
+                    )
+                    state["respuesta_transmitida"] = True
+                else:
+                    respuesta = await procesos_manager.formatear_hito_electoral(hito_seleccionado)
                 state["stage"] = "awaiting_another_question"
                 state["final_choice"] = "hito_electoral"
                 return respuesta
@@ -508,8 +526,8 @@ class StateHandler:
         
         procesos_manager = get_procesos_electorales_manager()
         
-        # Usar búsqueda inteligente que maneja múltiples formatos
-        candidatos = procesos_manager.buscar_candidatos_inteligente(texto_entrada)
+        # Usar búsqueda inteligente que maneja múltiples formatos (en el executor de Oracle)
+        candidatos = await ejecutar_en_oracle(procesos_manager.buscar_candidatos_inteligente, texto_entrada)
         
         if not candidatos:
             # No se encontraron candidatos, volver al menú principal
@@ -550,7 +568,10 @@ class StateHandler:
         segundo_apellido = texto_entrada
         
         # Buscar candidatos con ambos apellidos
-        candidatos = procesos_manager.buscar_candidatos_por_apellidos_separados(nombres, primer_apellido, segundo_apellido)
+        candidatos = await ejecutar_en_oracle(
+            procesos_manager.buscar_candidatos_por_apellidos_separados,
+            nombres, primer_apellido, segundo_apellido
+        )
         
         if not candidatos:
             # No se encontraron candidatos, volver al menú principal
@@ -577,15 +598,31 @@ class StateHandler:
             if 1 <= opcion <= len(candidatos):
                 candidato_seleccionado = candidatos[opcion - 1]
                 procesos_manager = get_procesos_electorales_manager()
-                elecciones = procesos_manager.obtener_elecciones_por_candidato(
-                    candidato_seleccionado["nombres"],
-                    candidato_seleccionado["apellido_paterno"],
-                    candidato_seleccionado["apellido_materno"]
-                )
+                registros = None
+                if settings.ORACLE_PREFETCH_CANDIDATO:
+                    # Una sola consulta trae todas las filas del candidato; el menú y el detalle se sirven del estado
+                    registros = await ejecutar_en_oracle(
+                        procesos_manager.obtener_registros_candidato,
+                        candidato_seleccionado["nombres"],
+                        candidato_seleccionado["apellido_paterno"],
+                        candidato_seleccionado["apellido_materno"],
+                        por_defecto=[]
+                    )
+                    elecciones = procesos_manager.elecciones_desde_registros(registros)
+                else:
+                    elecciones = await ejecutar_en_oracle(
+                        procesos_manager.obtener_elecciones_por_candidato,
+                        candidato_seleccionado["nombres"],
+                        candidato_seleccionado["apellido_paterno"],
+                        candidato_seleccionado["apellido_materno"]
+                    )
                 
                 if elecciones:
                     state["candidato_seleccionado"] = candidato_seleccionado
                     state["elecciones_candidato"] = elecciones
+                    state["registros_candidato"] = registros
+                    # El estado se serializa: la marca de respaldo se guarda aparte
+                    state["registros_obsoletos"] = es_obsoleto(registros)
                     state["stage"] = "awaiting_eleccion_candidato_selection"
                     return procesos_manager.generar_menu_elecciones_candidato(elecciones, candidato_seleccionado["nombre_completo"])
                 else:
@@ -618,12 +655,19 @@ class StateHandler:
             if 1 <= opcion <= len(elecciones):
                 eleccion_seleccionada = elecciones[opcion - 1]
                 procesos_manager = get_procesos_electorales_manager()
-                detalle = procesos_manager.obtener_detalle_candidato_eleccion(
-                    candidato["nombres"],
-                    candidato["apellido_paterno"],
-                    candidato["apellido_materno"],
-                    eleccion_seleccionada
-                )
+                registros = state.get("registros_candidato")
+                if registros is not None:
+                    detalle = procesos_manager.detalle_desde_registros(
+                        registros, eleccion_seleccionada, obsoleto=state.get("registros_obsoletos", False)
+                    )
+                else:
+                    detalle = await ejecutar_en_oracle(
+                        procesos_manager.obtener_detalle_candidato_eleccion,
+                        candidato["nombres"],
+                        candidato["apellido_paterno"],
+                        candidato["apellido_materno"],
+                        eleccion_seleccionada
+                    )
                 
                 if detalle:
                     respuesta = procesos_manager.formatear_politico(detalle)
@@ -750,19 +794,30 @@ context_map = {
     "sedes": "El JNE tiene presencia en Lima (sede central), Cusco, Nazca y cuenta con un Museo Electoral, además de oficinas desconcentradas en todo el país."
 }
 
-def send_to_llm(user_input: str, extra_context: str) -> str:
+async def send_to_llm(user_input: str, extra_context: str) -> str:
     """Envía la pregunta al LLM con contexto adicional"""
     prompt = f"{extra_context}\n\nPregunta del usuario: {user_input}"
     
     try:
-        response = client.models.generate_content(
-            model="gemma-3-27b-it",
-            contents=prompt
-        )
-        return response.text
+        return await generar_texto(prompt, tarea="consulta_libre")
+    except (LimiteLLMExcedido, asyncio.TimeoutError):
+        # Sin cupo o sin respuesta a tiempo: la información fija del tema, sin LLM
+        return respuesta_sin_llm(extra_context)
     except Exception as e:
         return f"Error al procesar la consulta: {str(e)}"
 
+async def send_to_llm_stream(user_input: str, extra_context: str):
+    """Versión en streaming de send_to_llm: entrega la respuesta por fragmentos"""
+    prompt = f"{extra_context}\n\nPregunta del usuario: {user_input}"
+    
+    try:
+        async for fragmento in generar_texto_stream(prompt, tarea="consulta_libre"):
+            yield fragmento
+    except LimiteLLMExcedido:
+        yield respuesta_sin_llm(extra_context)
+    except Exception as e:
+        yield f"Error al procesar la consulta: {str(e)}"
+
 @router.post("")
 async def tilin_chatbot(req: Request):
     """Endpoint principal del chatbot"""
@@ -771,6 +826,8 @@ async def tilin_chatbot(req: Request):
     
     chat_id = datos["chat_id"]
     text = datos["text"]
+    # Las llamadas al LLM de esta solicitud cuentan para el límite de este usuario
+    usuario_llm.set(str(chat_id))
     
     # Obtener instancia de ChatMemoryManager
     chat_memory = get_chat_memory()
@@ -859,7 +916,10 @@ async def tilin_chatbot(req: Request):
     
     # Si el usuario está en un estado específico (incluyendo servicios_ciudadano)
     respuesta = await StateHandler.handle_state(chat_id, text, state)
-    await ResponseManager.send_response(chat_id, respuesta, state, state.get("final_choice", "consulta_general"))
+    transmitida = state.pop("respuesta_transmitida", False)
+    await ResponseManager.send_response(
+        chat_id, respuesta, state, state.get("final_choice", "consulta_general"), enviar=not transmitida
+    )
     
     return {"reply": respuesta}
 
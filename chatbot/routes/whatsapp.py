@@ -5,6 +5,7 @@ from datetime import datetime
 from chatbot.utils.message_utils import normalizar_input_whatsapp
 from chatbot.utils.chatbot_core import ChatbotStateManager, get_chat_memory, menus, user_states
 from chatbot.utils.chatbot_handlers import ResponseManager, MenuHandler, StateHandler
+from chatbot.services.limites_llm import usuario_llm
 
 router = APIRouter()
 
@@ -47,6 +48,9 @@ async def receive_webhook(request: Request):
         if not chat_id or not text:
             return {"reply": "Mensaje no válido o vacío"}
         
+        # Las llamadas al LLM de esta solicitud cuentan para el límite de este usuario
+        usuario_llm.set(str(chat_id))
+        
         # Obtener instancia de ChatMemoryManager
         chat_memory = get_chat_memory()
         
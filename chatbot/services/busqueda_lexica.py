@@ -0,0 +1,124 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Palabras vacías del español (ya sin tildes)
+STOPWORDS_ES = {
+    "a", "al", "algo", "como", "con", "cual", "cuales", "cuando", "de", "del", "donde", "el", "ella",
+    "en", "entre", "es", "esta", "este", "esto", "estos", "hay", "la", "las", "le", "les", "lo", "los",
+    "me", "mi", "mis", "muy", "necesito", "no", "o", "para", "pero", "por", "puedo", "que", "quiero",
+    "se", "si", "sin", "sobre", "su", "sus", "te", "tengo", "tu", "un", "una", "uno", "unos", "y", "ya",
+    "hacer", "saber", "ver", "como", "consultar"
+}
+
+# Sinónimos del dominio electoral: cada término de la consulta se expande con sus equivalentes
+SINONIMOS = {
+    "multa": ["sancion", "omision", "deuda"],
+    "sancion": ["multa"],
+    "deuda": ["multa"],
+    "pagar": ["pago", "multa"],
+    "renuncia": ["desafiliacion"],
+    "desafiliacion": ["renuncia"],
+    "afiliacion": ["afiliado", "militante", "partido"],
+    "militante": ["afiliacion", "afiliado"],
+    "partido": ["organizacion", "politica"],
+    "organizacion": ["partido"],
+    "candidato": ["postulante", "hoja", "vida"],
+    "postulante": ["candidato"],
+    "dni": ["documento", "identidad"],
+    "excusa": ["justificacion", "dispensa"],
+    "justificacion": ["dispensa"],
+    "dispensa": ["justificacion"],
+    "expediente": ["tramite", "casilla"],
+    "tramite": ["expediente", "solicitud"],
+    "denuncia": ["queja", "reclamo"],
+    "queja": ["denuncia", "reclamo"],
+    "reclamo": ["queja", "denuncia"],
+    "votar": ["voto", "elector", "sufragio"],
+    "voto": ["votacion", "elector"],
+    "miembro": ["mesa"],
+    "transparencia": ["informacion", "publica"],
+}
+
+# Sufijos del español de más largo a más corto (estemizador liviano, no Snowball completo)
+SUFIJOS_ES = (
+    "amientos", "imientos", "aciones", "uciones", "amiento", "imiento", "adoras", "adores", "ancias",
+    "encias", "idades", "mente", "acion", "ucion", "adora", "ador", "ancia", "encia", "idad", "ibles",
+    "ables", "ible", "able", "istas", "ista", "ivas", "ivos", "iva", "ivo", "osas", "osos", "osa", "oso",
+    "ando", "iendo", "ados", "idos", "adas", "idas", "ado", "ido", "ada", "ida", "ar", "er", "ir",
+    "es", "as", "os", "a", "o", "e", "s"
+)
+LONGITUD_MINIMA_RAIZ = 4
+
+def normalizar_texto(texto: str) -> str:
+    """Minúsculas, sin tildes y sin signos de puntuación"""
+    texto = unicodedata.normalize("NFD", (texto or "").lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9ñ]+", " ", texto)
+
+def raiz(palabra: str) -> str:
+    """Quita el sufijo más largo posible dejando al menos LONGITUD_MINIMA_RAIZ caracteres"""
+    for sufijo in SUFIJOS_ES:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= LONGITUD_MINIMA_RAIZ:
+            return palabra[:-len(sufijo)]
+    return palabra
+
+def tokenizar(texto: str) -> List[str]:
+    """Raíces de las palabras significativas del texto"""
+    return [raiz(palabra) for palabra in normalizar_texto(texto).split() if palabra not in STOPWORDS_ES and len(palabra) > 1]
+
+# Sinónimos indexados por raíz (la consulta se compara ya estemizada)
+_SINONIMOS_POR_RAIZ: Dict[str, List[str]] = {}
+for _palabra, _equivalentes in SINONIMOS.items():
+    _SINONIMOS_POR_RAIZ.setdefault(raiz(_palabra), []).extend(_equivalentes)
+
+def expandir_sinonimos(tokens: List[str]) -> List[Tuple[str, float]]:
+    """Tokens de la consulta con sus sinónimos; los sinónimos pesan la mitad"""
+    expandidos = {token: 1.0 for token in tokens}
+    for token in tokens:
+        for sinonimo in _SINONIMOS_POR_RAIZ.get(token, []):
+            for raiz_sinonimo in tokenizar(sinonimo):
+                expandidos.setdefault(raiz_sinonimo, 0.5)
+    return list(expandidos.items())
+
+class IndiceBM25:
+    """
+    Índice léxico BM25 en memoria sobre textos cortos (nombre + descripción de un catálogo).
+    Se construye una vez; cada búsqueda recorre solo las listas de los términos de la consulta.
+    """
+
+    def __init__(self, documentos: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.frecuencias: List[Counter] = [Counter(tokenizar(documento)) for documento in documentos]
+        self.longitudes = [sum(frecuencia.values()) for frecuencia in self.frecuencias]
+        self.longitud_promedio = (sum(self.longitudes) / len(self.longitudes)) if self.longitudes else 0.0
+
+        # Lista invertida: término -> índices de los documentos que lo contienen
+        self.invertido: Dict[str, List[int]] = {}
+        for indice, frecuencia in enumerate(self.frecuencias):
+            for termino in frecuencia:
+                self.invertido.setdefault(termino, []).append(indice)
+
+        total = len(self.frecuencias)
+        self.idf = {
+            termino: math.log(1 + (total - len(documentos_termino) + 0.5) / (len(documentos_termino) + 0.5))
+            for termino, documentos_termino in self.invertido.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.frecuencias)
+
+    def buscar(self, consulta: str, top_k: int = 10) -> List[Tuple[int, float]]:
+        """(índice del documento, puntaje) de los mejores documentos, de mayor a menor puntaje"""
+        puntajes: Dict[int, float] = {}
+        for termino, peso in expandir_sinonimos(tokenizar(consulta)):
+            for indice in self.invertido.get(termino, []):
+                frecuencia = self.frecuencias[indice][termino]
+                normalizacion = 1 - self.b + self.b * self.longitudes[indice] / self.longitud_promedio
+                puntaje = self.idf[termino] * frecuencia * (self.k1 + 1) / (frecuencia + self.k1 * normalizacion)
+                puntajes[indice] = puntajes.get(indice, 0.0) + peso * puntaje
+
+        return sorted(puntajes.items(), key=lambda item: item[1], reverse=True)[:top_k]
@@ -0,0 +1,157 @@
+import json
+import math
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import List, Optional
+from chatbot.config import settings
+from chatbot.services.busqueda_lexica import tokenizar
+
+logger = logging.getLogger(__name__)
+
+# Resultados de búsquedas rankeadas por el LLM, compartidos entre workers a través de Redis.
+# La clave es la consulta normalizada (sin tildes ni palabras vacías, raíces ordenadas), de modo
+# que "Multa electoral" y "electoral multas" comparten resultado. La versión de los datos
+# (huella del CSV o del cronograma) forma parte de la clave: al cambiar los datos las entradas
+# anteriores dejan de leerse y expiran por TTL.
+# Los casi duplicados se buscan solo entre las claves que comparten una palabra del prefijo
+# (filtro por prefijo de Jaccard), agrupadas en Redis por esa palabra. El cliente de Redis es
+# síncrono: obtener y guardar se ejecutan en un hilo para no bloquear el event loop.
+
+_contadores = {}
+_contadores_lock = threading.Lock()
+
+def _cliente_redis():
+    # Import diferido: la conexión a Redis se inicializa en el arranque de la aplicación
+    from chatbot.database.connection import obtener_cliente_redis
+    return obtener_cliente_redis()
+
+def normalizar_consulta(consulta: str) -> str:
+    """Raíces únicas y ordenadas de la consulta"""
+    return " ".join(sorted(set(tokenizar(consulta))))
+
+def huella_datos(*partes) -> str:
+    """Versión corta de un conjunto de datos (cambia si cambia cualquier texto)"""
+    contenido = "\x1f".join(str(parte) for parte in partes)
+    return hashlib.sha1(contenido.encode("utf-8")).hexdigest()[:12]
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def palabras_prefijo(palabras: List[str], similitud: float) -> List[str]:
+    """
+    Primeras palabras (en orden alfabético) de una clave: dos claves con similitud de Jaccard
+    mayor o igual a la pedida comparten al menos una palabra de sus prefijos
+    """
+    largo = len(palabras) - math.ceil(round(similitud * len(palabras), 9)) + 1
+    return palabras[:max(1, largo)]
+
+def _contar(espacio: str, evento: str):
+    with _contadores_lock:
+        estadisticas = _contadores.setdefault(espacio, {"aciertos": 0, "aproximados": 0, "fallos": 0})
+        estadisticas[evento] += 1
+    try:
+        _cliente_redis().hincrby("chatbot:consulta:estadisticas", f"{espacio}:{evento}", 1)
+    except Exception:
+        pass
+
+def obtener_estadisticas_cache() -> dict:
+    """Aciertos, aproximados y fallos por espacio: locales del worker y acumulados en Redis"""
+    with _contadores_lock:
+        locales = {espacio: dict(valores) for espacio, valores in _contadores.items()}
+    try:
+        compartidas = _cliente_redis().hgetall("chatbot:consulta:estadisticas")
+    except Exception:
+        compartidas = {}
+    return {"worker": locales, "redis": compartidas}
+
+class CacheConsultas:
+    """
+    Cache de resultados (índices de la colección) por consulta normalizada.
+
+    Args:
+        espacio: Nombre de la colección ("servicios", "hitos:EG.2026")
+    """
+
+    def __init__(self, espacio: str):
+        self.espacio = espacio
+
+    def _prefijo(self, version: str) -> str:
+        return f"chatbot:consulta:{self.espacio}:{version}"
+
+    async def obtener(self, consulta: str, version: str) -> Optional[List[int]]:
+        """Índices cacheados para la consulta, o None si no hay entrada (exacta o casi duplicada)"""
+        if not settings.CACHE_CONSULTAS_HABILITADO:
+            return None
+        return await asyncio.to_thread(self._obtener, consulta, version)
+
+    async def guardar(self, consulta: str, version: str, indices: List[int]) -> bool:
+        if not settings.CACHE_CONSULTAS_HABILITADO or not indices:
+            return False
+        return await asyncio.to_thread(self._guardar, consulta, version, indices)
+
+    def _obtener(self, consulta: str, version: str) -> Optional[List[int]]:
+        clave = normalizar_consulta(consulta)
+        if not clave:
+            return None
+
+        try:
+            redis = _cliente_redis()
+            prefijo = self._prefijo(version)
+            valor = redis.get(f"{prefijo}:{clave}")
+            if valor is not None:
+                _contar(self.espacio, "aciertos")
+                return json.loads(valor)
+
+            # Casi duplicados: misma consulta con una palabra de más o de menos, buscados solo
+            # en los grupos de las palabras del prefijo (una ida a Redis, tamaño acotado)
+            if settings.CACHE_CONSULTAS_SIMILITUD < 1:
+                palabras = clave.split()
+                pipeline = redis.pipeline()
+                for palabra in palabras_prefijo(palabras, settings.CACHE_CONSULTAS_SIMILITUD):
+                    pipeline.srandmember(f"{prefijo}:grupo:{palabra}", settings.CACHE_CONSULTAS_MAX_CANDIDATOS)
+                candidatas = set().union(*pipeline.execute())
+                tokens = set(palabras)
+                mejor, similitud_mejor = None, 0.0
+                for candidata in candidatas:
+                    similitud = jaccard(tokens, set(candidata.split()))
+                    if similitud > similitud_mejor:
+                        mejor, similitud_mejor = candidata, similitud
+                if mejor is not None and similitud_mejor >= settings.CACHE_CONSULTAS_SIMILITUD:
+                    valor = redis.get(f"{prefijo}:{mejor}")
+                    if valor is not None:
+                        _contar(self.espacio, "aproximados")
+                        return json.loads(valor)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo leer la cache de consultas: {e}")
+            return None
+
+        _contar(self.espacio, "fallos")
+        return None
+
+    def _guardar(self, consulta: str, version: str, indices: List[int]) -> bool:
+        clave = normalizar_consulta(consulta)
+        if not clave:
+            return False
+
+        try:
+            redis = _cliente_redis()
+            prefijo = self._prefijo(version)
+            pipeline = redis.pipeline()
+            pipeline.setex(f"{prefijo}:{clave}", settings.CACHE_CONSULTAS_TTL, json.dumps(indices))
+            # Registro de claves para la búsqueda de casi duplicados (acotado), agrupadas por
+            # las palabras de su prefijo
+            if redis.scard(f"{prefijo}:claves") < settings.CACHE_CONSULTAS_MAX_CLAVES:
+                pipeline.sadd(f"{prefijo}:claves", clave)
+                pipeline.expire(f"{prefijo}:claves", settings.CACHE_CONSULTAS_TTL)
+                for palabra in palabras_prefijo(clave.split(), settings.CACHE_CONSULTAS_SIMILITUD):
+                    pipeline.sadd(f"{prefijo}:grupo:{palabra}", clave)
+                    pipeline.expire(f"{prefijo}:grupo:{palabra}", settings.CACHE_CONSULTAS_TTL)
+            pipeline.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar en la cache de consultas: {e}")
+            return False
@@ -0,0 +1,49 @@
+import hashlib
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional
+from chatbot.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Textos de hitos generados por el LLM, compartidos entre workers a través de Redis.
+# El texto depende del hito, de la fecha de hoy (ya ocurrió / está por ocurrir) y del prompt,
+# por eso la clave lleva la fecha y la versión del prompt y expira a la medianoche.
+
+def _cliente_redis():
+    # Import diferido: la conexión a Redis se inicializa en el arranque de la aplicación
+    from chatbot.database.connection import obtener_cliente_redis
+    return obtener_cliente_redis()
+
+def clave_texto_hito(hito: dict, version_prompt: str, dia: Optional[date] = None) -> str:
+    """Clave (id del hito, fecha, versión del prompt); la huella del contenido invalida hitos editados"""
+    contenido = f"{hito.get('hito_electoral', '')}|{hito.get('dia')}/{hito.get('mes')}/{hito.get('anio')}"
+    huella = hashlib.sha1(contenido.encode("utf-8")).hexdigest()[:10]
+    dia = dia or date.today()
+    return f"chatbot:hito:{version_prompt}:{dia.isoformat()}:{hito.get('proceso_electoral')}:{hito.get('id')}:{huella}"
+
+def segundos_hasta_medianoche(ahora: Optional[datetime] = None) -> int:
+    ahora = ahora or datetime.now()
+    medianoche = datetime.combine(ahora.date() + timedelta(days=1), datetime.min.time())
+    return max(1, int((medianoche - ahora).total_seconds()))
+
+def obtener_texto_hito(clave: str) -> Optional[str]:
+    """Texto cacheado del hito, o None si no existe o Redis no está disponible"""
+    if not settings.HITOS_CACHE_HABILITADO:
+        return None
+    try:
+        return _cliente_redis().get(clave)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo leer el texto del hito desde Redis: {e}")
+        return None
+
+def guardar_texto_hito(clave: str, texto: str) -> bool:
+    """Guarda el texto del hito hasta la medianoche"""
+    if not settings.HITOS_CACHE_HABILITADO:
+        return False
+    try:
+        _cliente_redis().setex(clave, segundos_hasta_medianoche(), texto)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo guardar el texto del hito en Redis: {e}")
+        return False
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from chatbot.database.repository import RepositorioConversaciones
 from chatbot.database.connection import obtener_cliente_redis
+from chatbot.services.metricas_llm import descartar_resumen_conversacion, resumen_conversacion
 
 class ChatMemoryManager:
     """
@@ -57,6 +58,9 @@ class ChatMemoryManager:
             # Agregar mensaje inicial
             self._agregar_mensaje_a_conversacion(conversacion, "bot", mensaje_inicial)
             
+            # Las métricas del LLM se acumulan desde el inicio de esta conversación
+            descartar_resumen_conversacion(user_id)
+            
             # Guardar en Redis con expiración
             clave = f"chatbot:conversacion:{user_id}"
             self.redis.setex(
@@ -216,6 +220,8 @@ class ChatMemoryManager:
             conversacion["motivo_finalizacion"] = motivo
             conversacion["metadata"]["duracion_total"] = duracion_total
             conversacion["metadata"]["num_mensajes"] = len(conversacion["mensajes"])
+            # Resumen de llamadas al LLM: llamadas, tokens, latencia, costo, resultados y eventos
+            conversacion["metadata"]["llm"] = resumen_conversacion(user_id, limpiar=True)
             
             # Guardar en PostgreSQL
             with self.repositorio as repo:
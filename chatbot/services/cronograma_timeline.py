@@ -0,0 +1,78 @@
+import hashlib
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Optional
+import numpy as np
+from chatbot.database.oracle_repository import MESES
+
+def parsear_fecha_hito(hito: dict) -> Optional[date]:
+    """
+    Fecha de un hito del cronograma (MES puede venir como nombre o como número).
+    Devuelve None si el hito no tiene fecha completa o válida.
+    """
+    if hito.get("fecha"):
+        return hito["fecha"]
+    if not (hito.get("dia") and hito.get("mes") and hito.get("anio")):
+        return None
+
+    mes = str(hito["mes"]).strip().upper()
+    numero_mes = int(mes) if mes.isdigit() else MESES.get(mes)
+    if not numero_mes:
+        return None
+    try:
+        return date(int(hito["anio"]), numero_mes, int(hito["dia"]))
+    except (TypeError, ValueError):
+        return None
+
+class LineaDeTiempoHitos:
+    """
+    Hitos de un proceso electoral ordenados cronológicamente, con la fecha ya parseada
+    (clave "fecha") y búsquedas por bisección sobre la lista de fechas.
+    Los hitos sin fecha válida se conservan al final, en el orden recibido.
+    """
+
+    def __init__(self, hitos: list):
+        fechados = []
+        self.sin_fecha = []
+        for hito in hitos:
+            fecha = parsear_fecha_hito(hito)
+            if fecha:
+                fechados.append(dict(hito, fecha=fecha))
+            else:
+                self.sin_fecha.append(dict(hito, fecha=None))
+
+        # sort es estable: los hitos del mismo día mantienen el orden de la base de datos
+        fechados.sort(key=lambda hito: hito["fecha"])
+        self.hitos = fechados
+        self.fechas = [hito["fecha"] for hito in fechados]
+
+        # Columnas alineadas con todos() para puntuar los hitos de forma vectorizada
+        todos = self.todos()
+        self.descripciones = np.array([(hito.get("hito_electoral") or "").lower() for hito in todos], dtype=str)
+        self.ordinales = np.array([hito["fecha"].toordinal() if hito["fecha"] else 0 for hito in todos], dtype=np.int64)
+
+        # Versión del contenido: cambia si se agrega, quita o edita cualquier hito
+        contenido = "\x1f".join(f"{hito.get('id')}|{hito['fecha']}|{hito.get('hito_electoral')}" for hito in todos)
+        self.huella = hashlib.sha1(contenido.encode("utf-8")).hexdigest()[:12]
+
+    def __len__(self) -> int:
+        return len(self.hitos) + len(self.sin_fecha)
+
+    def todos(self) -> list:
+        """Todos los hitos en orden cronológico (los que no tienen fecha al final)"""
+        return self.hitos + self.sin_fecha
+
+    def proximos(self, n: int = 5, desde: Optional[date] = None) -> list:
+        """Los n hitos siguientes a partir de una fecha (incluida), por defecto hoy"""
+        inicio = bisect_left(self.fechas, desde or date.today())
+        return self.hitos[inicio:inicio + n]
+
+    def pasados(self, n: Optional[int] = None, hasta: Optional[date] = None) -> list:
+        """Hitos anteriores a una fecha (excluida), del más reciente al más antiguo"""
+        fin = bisect_left(self.fechas, hasta or date.today())
+        inicio = 0 if n is None else max(0, fin - n)
+        return self.hitos[inicio:fin][::-1]
+
+    def en_rango(self, inicio: date, fin: date) -> list:
+        """Hitos entre dos fechas (ambas incluidas), en orden cronológico"""
+        return self.hitos[bisect_left(self.fechas, inicio):bisect_right(self.fechas, fin)]
@@ -0,0 +1,148 @@
+import os
+import hashlib
+import logging
+import threading
+import zlib
+from typing import List, Tuple
+import numpy as np
+from chatbot.config import settings
+from chatbot.services.busqueda_lexica import normalizar_texto, tokenizar
+
+logger = logging.getLogger(__name__)
+
+# Índice de embeddings precalculados: una matriz (documentos x dimensión) de vectores
+# normalizados guardada en disco. Cada consulta se codifica una vez y se compara contra
+# todos los documentos con un solo producto matriz-vector.
+
+class EmbedderHashing:
+    """
+    Embedder local sin modelo: proyecta raíces de palabras y trigramas de caracteres en un
+    vector de dimensión fija con hashing. Determinista y sin dependencias, sirve para correr
+    sin conexión y en pruebas; captura variaciones de forma ("pago"/"pagar"), no sinónimos.
+    """
+
+    def __init__(self, dimension: int = 512):
+        self.dimension = dimension
+        self.identificador = f"hashing-{dimension}"
+
+    def _rasgos(self, texto: str) -> List[Tuple[str, float]]:
+        rasgos = [(f"w:{token}", 1.0) for token in tokenizar(texto)]
+        for palabra in normalizar_texto(texto).split():
+            palabra = f" {palabra} "
+            rasgos.extend((f"c:{palabra[i:i + 3]}", 0.3) for i in range(len(palabra) - 2))
+        return rasgos
+
+    def codificar(self, textos: List[str]) -> np.ndarray:
+        matriz = np.zeros((len(textos), self.dimension), dtype=np.float32)
+        for fila, texto in enumerate(textos):
+            for rasgo, peso in self._rasgos(texto):
+                # crc32 es estable entre procesos (hash() de Python cambia en cada arranque)
+                codigo = zlib.crc32(rasgo.encode("utf-8"))
+                signo = 1.0 if codigo & 1 else -1.0
+                matriz[fila, (codigo >> 1) % self.dimension] += signo * peso
+        return _normalizar_filas(matriz)
+
+class EmbedderSentenceTransformers:
+    """Modelo local de sentence-transformers ejecutado en CPU"""
+
+    def __init__(self, modelo: str):
+        from sentence_transformers import SentenceTransformer
+        self.modelo = SentenceTransformer(modelo, device="cpu")
+        self.identificador = f"st-{modelo}"
+
+    def codificar(self, textos: List[str]) -> np.ndarray:
+        matriz = self.modelo.encode(textos, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+        return matriz.astype(np.float32)
+
+def _normalizar_filas(matriz: np.ndarray) -> np.ndarray:
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return matriz / normas
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+def obtener_embedder():
+    """
+    Embedder configurado en EMBEDDINGS_BACKEND (hashing o sentence_transformers).
+    Si sentence-transformers no está instalado o el modelo no carga, se usa hashing.
+    """
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                if settings.EMBEDDINGS_BACKEND == "sentence_transformers":
+                    try:
+                        _embedder = EmbedderSentenceTransformers(settings.EMBEDDINGS_MODELO)
+                        logger.info(f"✅ Modelo de embeddings cargado: {settings.EMBEDDINGS_MODELO}")
+                    except Exception as e:
+                        logger.warning(f"⚠️ No se pudo cargar el modelo de embeddings, se usa hashing: {e}")
+                if _embedder is None:
+                    _embedder = EmbedderHashing(settings.EMBEDDINGS_DIMENSION)
+    return _embedder
+
+class IndiceEmbeddings:
+    """
+    Embeddings de una colección de textos, persistidos en EMBEDDINGS_DIR/<nombre>.npz.
+    La matriz se reutiliza mientras no cambien los textos ni el embedder (huella SHA-1);
+    si cambian se recalcula y se reemplaza el archivo.
+    """
+
+    def __init__(self, nombre: str, textos: List[str], embedder=None):
+        self.nombre = nombre
+        self.embedder = embedder or obtener_embedder()
+        self.matriz = self._cargar_o_calcular(textos)
+
+    def __len__(self) -> int:
+        return self.matriz.shape[0]
+
+    def _huella(self, textos: List[str]) -> str:
+        contenido = "\x1f".join([self.embedder.identificador] + list(textos))
+        return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+    def _cargar_o_calcular(self, textos: List[str]) -> np.ndarray:
+        if not textos:
+            return np.zeros((0, 1), dtype=np.float32)
+
+        huella = self._huella(textos)
+        ruta = os.path.join(settings.EMBEDDINGS_DIR, f"{self.nombre}.npz")
+        try:
+            if os.path.exists(ruta):
+                with np.load(ruta) as datos:
+                    if str(datos["huella"]) == huella:
+                        return datos["matriz"]
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron leer los embeddings de {ruta}: {e}")
+
+        matriz = self.embedder.codificar(list(textos))
+        try:
+            os.makedirs(settings.EMBEDDINGS_DIR, exist_ok=True)
+            # Se escribe a un temporal y se publica con os.replace para no dejar archivos a medias
+            ruta_temporal = f"{ruta}.{os.getpid()}.tmp.npz"
+            np.savez(ruta_temporal, huella=np.array(huella), matriz=matriz)
+            os.replace(ruta_temporal, ruta)
+            logger.info(f"💾 Embeddings de {self.nombre} guardados: {matriz.shape[0]} textos")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron guardar los embeddings de {self.nombre}: {e}")
+        return matriz
+
+    def buscar(self, consulta: str, top_k: int = 10, minimo: float = None) -> List[Tuple[int, float]]:
+        """(índice del documento, similitud coseno) de los más parecidos, de mayor a menor"""
+        if not len(self) or not consulta.strip():
+            return []
+        minimo = settings.EMBEDDINGS_SIMILITUD_MINIMA if minimo is None else minimo
+
+        similitudes = self.matriz @ self.embedder.codificar([consulta])[0]
+        k = min(top_k, len(similitudes))
+        # argpartition selecciona los k mejores en O(n); solo esos se ordenan
+        mejores = np.argpartition(-similitudes, k - 1)[:k]
+        mejores = mejores[np.argsort(-similitudes[mejores])]
+        return [(int(indice), float(similitudes[indice])) for indice in mejores if similitudes[indice] >= minimo]
+
+def fusionar_rankings(rankings: List[List[Tuple[int, float]]], top_k: int = 10, k: int = 60) -> List[Tuple[int, float]]:
+    """Reciprocal Rank Fusion de varios rankings [(índice, puntaje)] ya ordenados"""
+    puntajes = {}
+    for ranking in rankings:
+        for posicion, (indice, _) in enumerate(ranking):
+            puntajes[indice] = puntajes.get(indice, 0.0) + 1.0 / (k + posicion + 1)
+    return sorted(puntajes.items(), key=lambda item: item[1], reverse=True)[:top_k]
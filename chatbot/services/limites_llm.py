@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from datetime import date
+from typing import Optional
+from chatbot.config import settings
+from chatbot.services.cache_hitos import segundos_hasta_medianoche
+
+logger = logging.getLogger(__name__)
+
+# Límites de llamadas al LLM compartidos entre workers a través de Redis: token buckets global y
+# por usuario (llamadas por segundo con ráfaga) y un presupuesto diario de tokens estimados.
+# Una llamada sin cupo espera en una cola acotada hasta un plazo; si no obtiene cupo se lanza
+# LimiteLLMExcedido y cada llamador responde con su respaldo determinístico.
+# Si Redis no está disponible las llamadas se admiten (los límites no deben tumbar el bot).
+# El cliente de Redis es síncrono: sus llamadas corren en un hilo para no bloquear el event loop.
+
+# Usuario de la solicitud en curso (lo fija cada ruta al recibir el mensaje)
+usuario_llm: ContextVar[Optional[str]] = ContextVar("usuario_llm", default=None)
+
+# Admitidas, que tuvieron que esperar, rechazadas por cola llena, vencidas en la cola y sin presupuesto diario
+estadisticas_limites = {"admitidas": 0, "esperaron": 0, "cola_llena": 0, "vencidas": 0, "sin_presupuesto": 0}
+_en_cola = 0
+
+MENSAJE_LIMITE_LLM = (
+    "⏳ En este momento estamos atendiendo muchas consultas y no puedo generar una respuesta.\n\n"
+    "Por favor, intenta de nuevo en unos minutos o escribe **'menu'** para usar las opciones del menú."
+)
+
+def respuesta_sin_llm(contexto: str) -> str:
+    """
+    Respuesta determinística de una consulta libre que no obtuvo cupo (o venció su plazo):
+    la información fija del tema (context_map) y el acceso al menú
+    """
+    if not contexto:
+        return MENSAJE_LIMITE_LLM
+    return (
+        f"ℹ️ {contexto}\n\n"
+        "⏳ En este momento no puedo generar una respuesta más detallada. "
+        "Escribe **'menu'** para usar las opciones del menú o intenta de nuevo en unos minutos."
+    )
+
+# Token buckets (tasa y capacidad por clave): consume un token de cada uno solo si todos tienen
+# cupo; si no, devuelve los segundos que faltan para que lo tengan. ARGV: ahora, tasa_1, capacidad_1, ...
+SCRIPT_TOKEN_BUCKET = """
+local ahora = tonumber(ARGV[1])
+local espera = 0
+local estados = {}
+for i, clave in ipairs(KEYS) do
+    local tasa = tonumber(ARGV[2 * i])
+    local capacidad = tonumber(ARGV[2 * i + 1])
+    local datos = redis.call('HMGET', clave, 'tokens', 'ts')
+    local tokens = tonumber(datos[1]) or capacidad
+    local ts = tonumber(datos[2]) or ahora
+    tokens = math.min(capacidad, tokens + math.max(0, ahora - ts) * tasa)
+    if tokens < 1 then
+        espera = math.max(espera, (1 - tokens) / tasa)
+    end
+    estados[i] = {tokens, math.ceil(capacidad / tasa) + 1}
+end
+for i, clave in ipairs(KEYS) do
+    local tokens = estados[i][1]
+    if espera == 0 then
+        tokens = tokens - 1
+    end
+    redis.call('HSET', clave, 'tokens', tostring(tokens), 'ts', tostring(ahora))
+    redis.call('EXPIRE', clave, estados[i][2])
+end
+return tostring(espera)
+"""
+
+class LimiteLLMExcedido(Exception):
+    """La llamada al LLM no obtuvo cupo dentro del plazo (o se agotó el presupuesto diario)"""
+
+def _cliente_redis():
+    # Import diferido: la conexión a Redis se inicializa en el arranque de la aplicación
+    from chatbot.database.connection import obtener_cliente_redis
+    return obtener_cliente_redis()
+
+def _clave_tokens_diarios() -> str:
+    return f"chatbot:limite:tokens:{date.today().isoformat()}"
+
+def _reservar_cupo(usuario: Optional[str]) -> float:
+    """Consume un token de los buckets global y del usuario; 0 si se admitió, si no segundos de espera"""
+    claves = ["chatbot:limite:global"]
+    argumentos = [time.time(), settings.LLM_LIMITE_QPS_GLOBAL, settings.LLM_LIMITE_RAFAGA_GLOBAL]
+    if usuario:
+        claves.append(f"chatbot:limite:usuario:{usuario}")
+        argumentos += [settings.LLM_LIMITE_QPS_USUARIO, settings.LLM_LIMITE_RAFAGA_USUARIO]
+    return float(_cliente_redis().eval(SCRIPT_TOKEN_BUCKET, len(claves), *claves, *argumentos))
+
+def tokens_consumidos_hoy() -> int:
+    try:
+        return int(_cliente_redis().get(_clave_tokens_diarios()) or 0)
+    except Exception:
+        return 0
+
+def _sumar_tokens(tokens: int):
+    try:
+        redis = _cliente_redis()
+        clave = _clave_tokens_diarios()
+        pipeline = redis.pipeline()
+        pipeline.incrby(clave, tokens)
+        pipeline.expire(clave, segundos_hasta_medianoche() + 3600)
+        pipeline.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo registrar el consumo de tokens en Redis: {e}")
+
+def registrar_tokens(tokens: int):
+    """Suma tokens (estimados) al presupuesto del día sin esperar a Redis"""
+    if not settings.LLM_LIMITES_HABILITADO or tokens <= 0:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _sumar_tokens(tokens)
+        return
+    loop.run_in_executor(None, _sumar_tokens, tokens)
+
+async def adquirir_cupo(tokens: int = 0):
+    """
+    Espera cupo para una llamada al LLM del usuario en curso.
+
+    Args:
+        tokens: Tokens estimados del prompt (se suman al presupuesto diario al admitir)
+
+    Raises:
+        LimiteLLMExcedido si se agotó el presupuesto diario, la cola está llena o se venció
+        LLM_LIMITE_ESPERA sin obtener cupo
+    """
+    global _en_cola
+    if not settings.LLM_LIMITES_HABILITADO:
+        return
+
+    if await asyncio.to_thread(tokens_consumidos_hoy) >= settings.LLM_LIMITE_TOKENS_DIARIOS:
+        estadisticas_limites["sin_presupuesto"] += 1
+        raise LimiteLLMExcedido("Presupuesto diario de tokens agotado")
+
+    usuario = usuario_llm.get()
+    try:
+        espera = await asyncio.to_thread(_reservar_cupo, usuario)
+    except Exception as e:
+        logger.warning(f"⚠️ Redis no disponible para los límites del LLM, se admite la llamada: {e}")
+        return
+
+    if espera > 0:
+        if _en_cola >= settings.LLM_LIMITE_COLA:
+            estadisticas_limites["cola_llena"] += 1
+            raise LimiteLLMExcedido("Cola de espera del LLM llena")
+
+        estadisticas_limites["esperaron"] += 1
+        fin = time.monotonic() + settings.LLM_LIMITE_ESPERA
+        _en_cola += 1
+        try:
+            while espera > 0:
+                restante = fin - time.monotonic()
+                if espera > restante:
+                    estadisticas_limites["vencidas"] += 1
+                    logger.warning(f"🚦 Llamada al LLM sin cupo en {settings.LLM_LIMITE_ESPERA}s (usuario {usuario})")
+                    raise LimiteLLMExcedido("Sin cupo para llamar al LLM dentro del plazo")
+                await asyncio.sleep(espera)
+                try:
+                    espera = await asyncio.to_thread(_reservar_cupo, usuario)
+                except Exception:
+                    break
+        finally:
+            _en_cola -= 1
+
+    estadisticas_limites["admitidas"] += 1
+    registrar_tokens(tokens)
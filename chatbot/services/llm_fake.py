@@ -0,0 +1,112 @@
+import asyncio
+import math
+import random
+import re
+from types import SimpleNamespace
+from chatbot.config import settings
+from chatbot.services.busqueda_lexica import tokenizar
+from chatbot.utils.metricas import estimar_tokens
+
+# Cliente LLM falso en proceso (LLM_BACKEND=fake) con la misma interfaz que usa el gateway
+# (client.aio.models.generate_content / generate_content_stream). Responde según la tarea que
+# reconoce en el prompt: arreglo JSON de números para los rankings (elegidos por coincidencia de
+# palabras con la consulta), un texto corto para los hitos y una respuesta genérica para el resto.
+# Las respuestas son determinísticas; la latencia y los errores se sortean según la configuración.
+# Sirve para pruebas de carga y de latencia sin consumir cuota ni depender de la red.
+
+PATRON_OPCION = re.compile(r"^\s*(\d+)\.\s+(.+)$", re.MULTILINE)
+PATRON_CONSULTA = re.compile(r"(?:busca|CONSULTA):\s*\"([^\"]*)\"")
+PATRON_TOP_K = re.compile(r"[Ss]elecciona los (\d+)")
+PATRON_CAMPO = r"^\s*{}:\s*(.+)$"
+
+class ErrorLLMFalso(RuntimeError):
+    """Error simulado del proveedor (503)"""
+
+def muestrear_latencia(especificacion: str, rng: random.Random) -> float:
+    """
+    Segundos de latencia según la especificación:
+        fija:MS | uniforme:MIN_MS:MAX_MS | lognormal:MEDIANA_MS:SIGMA
+    """
+    tipo, *parametros = especificacion.split(":")
+    valores = [float(parametro) for parametro in parametros]
+    if tipo == "fija":
+        milisegundos = valores[0]
+    elif tipo == "uniforme":
+        milisegundos = rng.uniform(valores[0], valores[1])
+    elif tipo == "lognormal":
+        milisegundos = rng.lognormvariate(math.log(valores[0]), valores[1])
+    else:
+        raise ValueError(f"Distribución de latencia desconocida: {especificacion}")
+    return milisegundos / 1000
+
+def _campo(prompt: str, nombre: str) -> str:
+    coincidencia = re.search(PATRON_CAMPO.format(nombre), prompt, re.MULTILINE)
+    return coincidencia.group(1).strip() if coincidencia else ""
+
+def responder(prompt: str) -> str:
+    """Respuesta determinística según la tarea reconocida en el prompt"""
+    opciones = PATRON_OPCION.findall(prompt)
+    consulta = PATRON_CONSULTA.search(prompt)
+    if opciones and consulta:
+        # Ranking: las opciones con más palabras en común con la consulta (empate: orden original)
+        palabras = set(tokenizar(consulta.group(1)))
+        top_k = int(PATRON_TOP_K.search(prompt).group(1)) if PATRON_TOP_K.search(prompt) else 3
+        puntajes = [(-len(palabras & set(tokenizar(texto))), int(numero)) for numero, texto in opciones]
+        return "[" + ", ".join(str(numero) for _, numero in sorted(puntajes)[:top_k]) + "]"
+
+    hito = _campo(prompt, "HITO")
+    if hito:
+        contexto = _campo(prompt, "CONTEXTO TEMPORAL").replace("Este hito ", "")
+        return f"📅 {hito}: este hito {contexto}. 🗳️ Mantente informado a través de los canales oficiales del JNE. ✅"
+
+    pregunta = prompt.rsplit("Pregunta del usuario:", 1)[-1].strip()
+    return f"🤖 Respuesta de prueba para: {pregunta[:120]}"
+
+def _respuesta(prompt: str, texto: str) -> SimpleNamespace:
+    uso = SimpleNamespace(prompt_token_count=estimar_tokens(prompt), candidates_token_count=estimar_tokens(texto))
+    return SimpleNamespace(text=texto, usage_metadata=uso)
+
+class _ModelosFalsos:
+    def __init__(self, semilla: int):
+        self.rng = random.Random(semilla)
+
+    def _latencia(self, modelo: str) -> float:
+        especificacion = settings.LLM_FAKE_LATENCIA_MODELOS.get(modelo, settings.LLM_FAKE_LATENCIA)
+        return muestrear_latencia(especificacion, self.rng)
+
+    def _falla(self) -> bool:
+        return self.rng.random() < settings.LLM_FAKE_TASA_ERROR
+
+    async def generate_content(self, model: str, contents: str, config=None):
+        latencia, falla = self._latencia(model), self._falla()
+        await asyncio.sleep(latencia)
+        if falla:
+            raise ErrorLLMFalso(f"503 UNAVAILABLE: error simulado de {model}")
+        return _respuesta(contents, responder(contents))
+
+    async def generate_content_stream(self, model: str, contents: str, config=None):
+        latencia, falla = self._latencia(model), self._falla()
+        texto = responder(contents)
+        palabras = texto.split(" ")
+        # Tres fragmentos: el primero tarda ~40% de la latencia y el resto se reparte
+        cortes = [0, len(palabras) // 3, 2 * len(palabras) // 3, len(palabras)]
+
+        async def fragmentos():
+            await asyncio.sleep(latencia * 0.4)
+            if falla:
+                raise ErrorLLMFalso(f"503 UNAVAILABLE: error simulado de {model}")
+            for indice in range(3):
+                if indice:
+                    await asyncio.sleep(latencia * 0.3)
+                parte = " ".join(palabras[cortes[indice]:cortes[indice + 1]])
+                yield SimpleNamespace(text=parte + (" " if indice < 2 else ""), usage_metadata=None)
+            # Como en la API real, el último fragmento trae el uso acumulado
+            yield SimpleNamespace(text="", usage_metadata=_respuesta(contents, texto).usage_metadata)
+
+        return fragmentos()
+
+class ClienteLLMFalso:
+    """Sustituto de genai.Client para LLM_BACKEND=fake"""
+
+    def __init__(self, semilla: int = 0):
+        self.aio = SimpleNamespace(models=_ModelosFalsos(semilla))
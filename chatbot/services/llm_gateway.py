@@ -0,0 +1,497 @@
+import asyncio
+import hashlib
+import json
+import re
+import logging
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+from google import genai
+from google.genai import types
+from chatbot.config import settings
+from chatbot.services.limites_llm import LimiteLLMExcedido, adquirir_cupo, registrar_tokens
+from chatbot.services.metricas_llm import registrar_evento, registrar_llamada
+from chatbot.utils.metricas import estimar_tokens
+
+logger = logging.getLogger(__name__)
+
+# Punto único de acceso al LLM: un solo cliente compartido (y con él sus conexiones HTTP),
+# llamadas con la API asíncrona para no bloquear el event loop, un semáforo global que acota
+# las llamadas simultáneas y un plazo máximo por llamada que incluye la espera del semáforo.
+# Las llamadas idénticas simultáneas (mismo modelo y prompt) se agrupan: una sola llega al
+# proveedor y todas reciben su resultado (en el proceso y, opcionalmente, entre workers vía Redis).
+# Cada tarea tiene su modelo principal, un modelo de respaldo y un plazo (LLM_RUTAS los reemplaza).
+# Antes de cada llamada se pide cupo a los límites compartidos (global, por usuario y diario).
+# Con LLM_HEDGING, si la llamada principal tarda más que el p90 de su tarea (medido en línea) se
+# lanza una segunda solicitud (cobertura) y se usa la que responda primero, dentro de un presupuesto.
+# esquema_json activa la salida estructurada del proveedor (los modelos Gemma no la admiten:
+# para ellos el formato JSON se pide en el prompt y se valida igual).
+
+# Los rankings solo devuelven un arreglo JSON de números: un modelo chico basta
+RUTAS_POR_DEFECTO = {
+    "ranking_servicios": {"modelo": "gemma-3-4b-it", "respaldo": "gemma-3-27b-it", "timeout": 6},
+    "ranking_hitos": {"modelo": "gemma-3-4b-it", "respaldo": "gemma-3-27b-it", "timeout": 8},
+    "formato_hito": {"modelo": "gemma-3-27b-it", "respaldo": "gemma-3-12b-it", "timeout": 15},
+    "consulta_libre": {"modelo": "gemma-3-27b-it", "respaldo": "gemma-3-12b-it", "timeout": 20},
+}
+
+_cliente = None
+_cliente_lock = threading.Lock()
+_semaforo: Optional[asyncio.Semaphore] = None
+# Llamadas en curso por huella (modelo, prompt) y cuántos llamadores esperan cada una
+_en_vuelo: Dict[str, asyncio.Task] = {}
+_esperando: Dict[asyncio.Task, int] = {}
+# Llamadas agrupadas: solicitudes recibidas, atendidas por otra en curso (proceso) o por otro worker (Redis)
+estadisticas_agrupacion = {"solicitudes": 0, "agrupadas": 0, "agrupadas_redis": 0}
+# Rankings con salida JSON: respuestas que no se pudieron interpretar, reintentos y fallos definitivos
+estadisticas_json = {"solicitudes": 0, "fallos_parseo": 0, "reintentos": 0, "fallos_finales": 0}
+
+# Coberturas (hedging): llamadas elegibles, coberturas lanzadas, ganadas y omitidas por presupuesto
+estadisticas_hedging = {"solicitudes": 0, "coberturas": 0, "ganadas": 0, "sin_presupuesto": 0}
+# Latencias recientes (segundos) de las respuestas exitosas, por tarea
+_latencias: Dict[str, deque] = {}
+# Instantes de las llamadas elegibles y de las coberturas en la ventana del presupuesto
+_elegibles_hedge: deque = deque()
+_coberturas_hedge: deque = deque()
+
+class RespuestaInvalidaLLM(ValueError):
+    """El LLM no devolvió una respuesta con el formato pedido"""
+
+def obtener_cliente_llm():
+    """Cliente compartido del LLM, creado en el primer uso (LLM_BACKEND=fake usa el cliente falso)"""
+    global _cliente
+    if _cliente is None:
+        with _cliente_lock:
+            if _cliente is None:
+                if settings.LLM_BACKEND == "fake":
+                    from chatbot.services.llm_fake import ClienteLLMFalso
+                    logger.warning("🧪 Usando el LLM falso (LLM_BACKEND=fake)")
+                    _cliente = ClienteLLMFalso(settings.LLM_FAKE_SEMILLA)
+                else:
+                    _cliente = genai.Client()
+    return _cliente
+
+def _obtener_semaforo() -> asyncio.Semaphore:
+    global _semaforo
+    if _semaforo is None:
+        _semaforo = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCIA)
+    return _semaforo
+
+def obtener_ruta(tarea: Optional[str]) -> dict:
+    """Modelo principal, respaldo (puede ser None) y plazo de una tarea"""
+    ruta = {"modelo": settings.LLM_MODELO, "respaldo": None, "timeout": settings.LLM_TIMEOUT, "esquema_json": False}
+    ruta.update(RUTAS_POR_DEFECTO.get(tarea, {}))
+    ruta.update(settings.LLM_RUTAS.get(tarea, {}))
+    return ruta
+
+def huella_llamada(prompt: str, modelo: str, esquema_json: bool = False) -> str:
+    return hashlib.sha1(f"{modelo}\x1f{esquema_json}\x1f{prompt}".encode("utf-8")).hexdigest()
+
+def _cliente_redis():
+    # Import diferido: la conexión a Redis se inicializa en el arranque de la aplicación
+    from chatbot.database.connection import obtener_cliente_redis
+    return obtener_cliente_redis()
+
+# Salida estructurada para rankings: arreglo JSON de enteros
+CONFIG_INDICES = types.GenerateContentConfig(response_mime_type="application/json", response_schema=list[int])
+
+def _tokens_uso(response, prompt: str, texto: str) -> tuple:
+    """Tokens de prompt y respuesta informados por el proveedor (estimados si no vienen)"""
+    uso = getattr(response, "usage_metadata", None)
+    tokens_prompt = getattr(uso, "prompt_token_count", None) or estimar_tokens(prompt)
+    tokens_respuesta = getattr(uso, "candidates_token_count", None) or estimar_tokens(texto)
+    return tokens_prompt, tokens_respuesta
+
+async def _llamar(prompt: str, modelo: str, esquema_json: bool = False, tarea: Optional[str] = None) -> str:
+    inicio = time.monotonic()
+    try:
+        async with _obtener_semaforo():
+            response = await obtener_cliente_llm().aio.models.generate_content(
+                model=modelo, contents=prompt, config=CONFIG_INDICES if esquema_json else None
+            )
+    except asyncio.CancelledError:
+        registrar_llamada(tarea, modelo, (time.monotonic() - inicio) * 1000, estimar_tokens(prompt), 0, "cancelada")
+        raise
+    except Exception:
+        registrar_llamada(tarea, modelo, (time.monotonic() - inicio) * 1000, estimar_tokens(prompt), 0, "error")
+        raise
+    registrar_llamada(tarea, modelo, (time.monotonic() - inicio) * 1000, *_tokens_uso(response, prompt, response.text or ""), "ok")
+    return response.text
+
+async def _llamar_entre_workers(prompt: str, modelo: str, huella: str, limite: float, esquema_json: bool = False, tarea: Optional[str] = None) -> str:
+    """
+    Agrupa la llamada entre workers: quien obtiene el lock (SET NX) llama al LLM y publica el
+    resultado por unos segundos; los demás esperan ese resultado. Si el lock expira sin
+    resultado (el worker falló), se llama directamente.
+    """
+    try:
+        redis = _cliente_redis()
+    except Exception:
+        return await _llamar(prompt, modelo, esquema_json, tarea)
+
+    clave_resultado = f"chatbot:llm:resultado:{huella}"
+    clave_lock = f"chatbot:llm:lock:{huella}"
+    try:
+        resultado = redis.get(clave_resultado)
+        if resultado is not None:
+            estadisticas_agrupacion["agrupadas_redis"] += 1
+            registrar_evento(tarea, "cache")
+            return resultado
+        obtenido = redis.set(clave_lock, "1", nx=True, ex=max(1, int(limite) + 1))
+    except Exception as e:
+        logger.warning(f"⚠️ Redis no disponible para agrupar llamadas al LLM: {e}")
+        return await _llamar(prompt, modelo, esquema_json, tarea)
+
+    if obtenido:
+        try:
+            texto = await _llamar(prompt, modelo, esquema_json, tarea)
+            try:
+                redis.setex(clave_resultado, settings.LLM_AGRUPAR_TTL_RESULTADO, texto)
+            except Exception:
+                pass
+            return texto
+        finally:
+            try:
+                redis.delete(clave_lock)
+            except Exception:
+                pass
+
+    # Otro worker está llamando: esperar su resultado mientras mantenga el lock
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        await asyncio.sleep(settings.LLM_AGRUPAR_INTERVALO)
+        try:
+            resultado = redis.get(clave_resultado)
+            if resultado is not None:
+                estadisticas_agrupacion["agrupadas_redis"] += 1
+                registrar_evento(tarea, "cache")
+                return resultado
+            if not redis.exists(clave_lock):
+                break
+        except Exception:
+            break
+    return await _llamar(prompt, modelo, esquema_json, tarea)
+
+def _marcar_excepcion_leida(tarea: asyncio.Task):
+    # Evita "Task exception was never retrieved" si todos los que esperaban vencieron su plazo
+    if not tarea.cancelled():
+        tarea.exception()
+
+def _iniciar_llamada(
+    prompt: str, modelo: str, huella: str, limite: float, esquema_json: bool = False, tarea: Optional[str] = None
+) -> asyncio.Task:
+    async def ejecutar():
+        try:
+            if settings.LLM_AGRUPAR_REDIS:
+                llamada = _llamar_entre_workers(prompt, modelo, huella, limite, esquema_json, tarea)
+            else:
+                llamada = _llamar(prompt, modelo, esquema_json, tarea)
+            return await asyncio.wait_for(llamada, limite)
+        finally:
+            _en_vuelo.pop(huella, None)
+
+    futuro = asyncio.ensure_future(ejecutar())
+    futuro.add_done_callback(_marcar_excepcion_leida)
+    _en_vuelo[huella] = futuro
+    return futuro
+
+async def _generar_con_modelo(
+    prompt: str, modelo: str, limite: float, esquema_json: bool = False, tarea: Optional[str] = None
+) -> str:
+    """Una llamada a un modelo, agrupada con las idénticas en curso y con plazo"""
+    try:
+        if not settings.LLM_AGRUPAR:
+            return await asyncio.wait_for(_llamar(prompt, modelo, esquema_json, tarea), limite)
+
+        estadisticas_agrupacion["solicitudes"] += 1
+        huella = huella_llamada(prompt, modelo, esquema_json)
+        futuro = _en_vuelo.get(huella)
+        if futuro is None:
+            futuro = _iniciar_llamada(prompt, modelo, huella, limite, esquema_json, tarea)
+        else:
+            estadisticas_agrupacion["agrupadas"] += 1
+            registrar_evento(tarea, "cache")
+        _esperando[futuro] = _esperando.get(futuro, 0) + 1
+        try:
+            # shield: si este llamador vence su plazo o se cancela, la llamada sigue para los demás
+            return await asyncio.wait_for(asyncio.shield(futuro), limite)
+        finally:
+            _soltar_llamada(futuro)
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ El LLM ({modelo}) no respondió en {limite}s")
+        registrar_evento(tarea, "timeout")
+        raise
+
+def _soltar_llamada(futuro: asyncio.Task):
+    """Un llamador dejó de esperar: si era el último, se cancela la llamada (libera semáforo y cupo)"""
+    restantes = _esperando.get(futuro, 1) - 1
+    if restantes > 0:
+        _esperando[futuro] = restantes
+        return
+    _esperando.pop(futuro, None)
+    if not futuro.done():
+        futuro.cancel()
+
+def registrar_latencia(tarea: Optional[str], segundos: float):
+    ventana = _latencias.get(tarea or "general")
+    if ventana is None:
+        ventana = _latencias[tarea or "general"] = deque(maxlen=settings.LLM_HEDGE_VENTANA)
+    ventana.append(segundos)
+
+def percentil_latencia(tarea: Optional[str], percentil: float) -> Optional[float]:
+    """Percentil de las latencias recientes de la tarea, o None si aún no hay suficientes muestras"""
+    ventana = _latencias.get(tarea or "general")
+    if not ventana or len(ventana) < settings.LLM_HEDGE_MIN_MUESTRAS:
+        return None
+    ordenadas = sorted(ventana)
+    return ordenadas[min(len(ordenadas) - 1, int(percentil * len(ordenadas)))]
+
+def _hay_presupuesto_hedge() -> bool:
+    # Las coberturas no pueden superar LLM_HEDGE_PRESUPUESTO de las llamadas elegibles de la ventana
+    desde = time.monotonic() - settings.LLM_HEDGE_VENTANA_PRESUPUESTO
+    for ventana in (_elegibles_hedge, _coberturas_hedge):
+        while ventana and ventana[0] < desde:
+            ventana.popleft()
+    return len(_coberturas_hedge) + 1 <= settings.LLM_HEDGE_PRESUPUESTO * len(_elegibles_hedge)
+
+async def _generar_con_hedge(prompt: str, tarea: Optional[str], ruta: dict, limite: float) -> str:
+    """
+    Llamada principal con cobertura: si no respondió al cumplirse el p90 de la tarea y queda
+    presupuesto, se lanza una segunda solicitud y se usa la primera respuesta exitosa.
+    """
+    principal = asyncio.ensure_future(_generar_con_modelo(prompt, ruta["modelo"], limite, ruta["esquema_json"], tarea))
+    espera = percentil_latencia(tarea, settings.LLM_HEDGE_PERCENTIL)
+    estadisticas_hedging["solicitudes"] += 1
+    _elegibles_hedge.append(time.monotonic())
+    if espera is None or espera >= limite:
+        return await principal
+
+    listas, _ = await asyncio.wait({principal}, timeout=espera)
+    if listas:
+        return principal.result()
+    if not _hay_presupuesto_hedge():
+        estadisticas_hedging["sin_presupuesto"] += 1
+        return await principal
+
+    modelo = ruta["respaldo"] if settings.LLM_HEDGE_MODELO == "respaldo" and ruta["respaldo"] else ruta["modelo"]
+    estadisticas_hedging["coberturas"] += 1
+    _coberturas_hedge.append(time.monotonic())
+    logger.info(f"🛡️ {tarea}: sin respuesta en {espera:.2f}s (p{int(settings.LLM_HEDGE_PERCENTIL * 100)}), cobertura con {modelo}")
+    # La cobertura va directo al proveedor: agruparla la uniría a la llamada principal
+    cobertura = asyncio.ensure_future(asyncio.wait_for(_llamar(prompt, modelo, ruta["esquema_json"], tarea), limite - espera))
+
+    pendientes = {principal, cobertura}
+    try:
+        while pendientes:
+            listas, pendientes = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+            for tarea_lista in listas:
+                if tarea_lista.exception() is None:
+                    if tarea_lista is cobertura:
+                        estadisticas_hedging["ganadas"] += 1
+                    return tarea_lista.result()
+        # Ambas fallaron: se propaga el error de la principal para que aplique el respaldo
+        return principal.result()
+    finally:
+        for pendiente in pendientes:
+            pendiente.cancel()
+
+async def generar_texto(
+    prompt: str, tarea: Optional[str] = None, modelo: Optional[str] = None, timeout: Optional[float] = None
+) -> str:
+    """
+    Genera una respuesta del LLM con el modelo de la tarea; si el principal vence su plazo
+    o falla, se reintenta una vez con el modelo de respaldo. Con LLM_HEDGING, una llamada
+    lenta recibe una cobertura al cumplirse el percentil de latencia de la tarea.
+
+    Args:
+        prompt: Texto del prompt
+        tarea: ranking_servicios, ranking_hitos, formato_hito, consulta_libre (None = LLM_MODELO)
+        modelo: Fuerza un modelo, sin respaldo
+        timeout: Segundos máximos por intento, incluida la espera por el semáforo
+
+    Raises:
+        LimiteLLMExcedido si la llamada no obtuvo cupo; asyncio.TimeoutError si se vence el
+        plazo; cualquier error del proveedor se propaga para que cada llamador aplique su respaldo
+    """
+    try:
+        await adquirir_cupo(estimar_tokens(prompt))
+    except LimiteLLMExcedido:
+        registrar_evento(tarea, "limite")
+        raise
+    texto = await _generar_con_ruta(prompt, tarea, modelo, timeout)
+    registrar_tokens(estimar_tokens(texto))
+    return texto
+
+async def _generar_con_ruta(prompt: str, tarea: Optional[str], modelo: Optional[str], timeout: Optional[float]) -> str:
+    ruta = obtener_ruta(tarea)
+    limite = timeout or ruta["timeout"]
+    if modelo:
+        return await _generar_con_modelo(prompt, modelo, limite, ruta["esquema_json"], tarea)
+
+    try:
+        inicio = time.monotonic()
+        if settings.LLM_HEDGING:
+            texto = await _generar_con_hedge(prompt, tarea, ruta, limite)
+        else:
+            texto = await _generar_con_modelo(prompt, ruta["modelo"], limite, ruta["esquema_json"], tarea)
+        registrar_latencia(tarea, time.monotonic() - inicio)
+        return texto
+    except Exception as e:
+        if not ruta["respaldo"] or ruta["respaldo"] == ruta["modelo"]:
+            raise
+        logger.warning(f"🔀 {tarea}: {ruta['modelo']} falló ({type(e).__name__}), se usa {ruta['respaldo']}")
+        registrar_evento(tarea, "fallback")
+        return await _generar_con_modelo(prompt, ruta["respaldo"], limite, ruta["esquema_json"], tarea)
+
+INSTRUCCION_JSON_ESTRICTA = (
+    "\n\nIMPORTANTE: tu respuesta anterior no tenía el formato pedido. Responde ÚNICAMENTE con un "
+    "arreglo JSON de números enteros, por ejemplo [3, 1, 7], sin texto, explicación ni bloques de código."
+)
+
+def parsear_indices(texto: str, maximo: int) -> List[int]:
+    """
+    Números (base 1) de un arreglo JSON de enteros, sin repetidos y entre 1 y maximo.
+    Los elementos fuera de rango, no enteros o repetidos se descartan y se conservan los válidos.
+
+    Raises:
+        RespuestaInvalidaLLM si el texto no contiene un arreglo o ningún elemento es válido
+    """
+    # response.text es None si la respuesta vino vacía o bloqueada
+    texto = texto or ""
+    # El arreglo puede venir envuelto en ```json ... ``` o precedido de texto
+    coincidencia = re.search(r"\[[^\[\]]*\]", texto)
+    if not coincidencia:
+        raise RespuestaInvalidaLLM(f"Sin arreglo JSON: {texto[:100]!r}")
+    try:
+        valores = json.loads(coincidencia.group(0))
+    except ValueError:
+        raise RespuestaInvalidaLLM(f"JSON inválido: {coincidencia.group(0)[:100]!r}")
+
+    indices, descartados = [], []
+    for valor in valores:
+        if isinstance(valor, str) and valor.strip().isdigit():
+            valor = int(valor)
+        if not isinstance(valor, int) or isinstance(valor, bool) or not 1 <= valor <= maximo:
+            descartados.append(valor)
+        elif valor not in indices:
+            indices.append(valor)
+    if descartados:
+        logger.warning(f"⚠️ Índices fuera de rango o no enteros descartados: {descartados!r}")
+    if not indices:
+        raise RespuestaInvalidaLLM(f"Sin índices válidos: {coincidencia.group(0)[:100]!r}")
+    return indices
+
+async def generar_indices(prompt: str, maximo: int, tarea: Optional[str] = None) -> List[int]:
+    """
+    Pide al LLM un ranking como arreglo JSON de números (base 1) y lo valida. Si la respuesta
+    no se puede interpretar se reintenta una vez con una instrucción más estricta.
+
+    Raises:
+        RespuestaInvalidaLLM si ninguna de las dos respuestas es válida; los errores del
+        proveedor se propagan igual que en generar_texto
+    """
+    estadisticas_json["solicitudes"] += 1
+    try:
+        return parsear_indices(await generar_texto(prompt, tarea=tarea), maximo)
+    except RespuestaInvalidaLLM as e:
+        estadisticas_json["fallos_parseo"] += 1
+        registrar_evento(tarea, "error_parseo")
+        logger.warning(f"⚠️ {tarea}: respuesta de ranking inválida, se reintenta ({e})")
+
+    estadisticas_json["reintentos"] += 1
+    try:
+        return parsear_indices(await generar_texto(prompt + INSTRUCCION_JSON_ESTRICTA, tarea=tarea), maximo)
+    except RespuestaInvalidaLLM:
+        estadisticas_json["fallos_parseo"] += 1
+        estadisticas_json["fallos_finales"] += 1
+        registrar_evento(tarea, "error_parseo")
+        raise
+
+# Marca de fin en la cola de fragmentos de una llamada en streaming
+_FIN_STREAM = object()
+
+async def _stream_con_modelo(prompt: str, modelo: str, limite: float, tarea: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Fragmentos de una llamada en streaming. La llamada al proveedor corre en su propia tarea,
+    que deja los fragmentos en una cola: solo esa tarea ocupa el semáforo y cuenta para el
+    plazo, no el tiempo que el consumidor tarda entre fragmentos (editar el mensaje en Telegram).
+    """
+    cola: asyncio.Queue = asyncio.Queue()
+
+    async def producir():
+        inicio = time.monotonic()
+        # El último fragmento trae el uso acumulado de tokens
+        ultimo, texto, resultado = None, [], "error"
+        try:
+            async with asyncio.timeout(limite):
+                async with _obtener_semaforo():
+                    respuesta = await obtener_cliente_llm().aio.models.generate_content_stream(model=modelo, contents=prompt)
+                    async for fragmento in respuesta:
+                        ultimo = fragmento
+                        if fragmento.text:
+                            texto.append(fragmento.text)
+                            cola.put_nowait(fragmento.text)
+            resultado = "ok"
+            cola.put_nowait(_FIN_STREAM)
+        except TimeoutError as e:
+            logger.warning(f"⏱️ El LLM ({modelo}) no terminó de responder en {limite}s")
+            registrar_evento(tarea, "timeout")
+            resultado = "cancelada"
+            cola.put_nowait(e)
+        except asyncio.CancelledError:
+            resultado = "cancelada"
+            raise
+        except Exception as e:
+            cola.put_nowait(e)
+        finally:
+            tokens_prompt, tokens_respuesta = _tokens_uso(ultimo, prompt, "".join(texto))
+            registrar_llamada(tarea, modelo, (time.monotonic() - inicio) * 1000, tokens_prompt, tokens_respuesta, resultado)
+
+    productor = asyncio.ensure_future(producir())
+    try:
+        while True:
+            elemento = await cola.get()
+            if elemento is _FIN_STREAM:
+                return
+            if isinstance(elemento, Exception):
+                raise elemento
+            yield elemento
+    finally:
+        # El consumidor dejó de leer (o falló): no seguir ocupando el proveedor
+        productor.cancel()
+
+async def generar_texto_stream(
+    prompt: str, tarea: Optional[str] = None, modelo: Optional[str] = None, timeout: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Genera una respuesta del LLM entregando los fragmentos a medida que llegan.
+    El plazo cubre la generación completa; las llamadas en streaming no se agrupan.
+    Se pasa al modelo de respaldo solo si el principal falla antes del primer fragmento.
+    """
+    try:
+        await adquirir_cupo(estimar_tokens(prompt))
+    except LimiteLLMExcedido:
+        registrar_evento(tarea, "limite")
+        raise
+    ruta = obtener_ruta(tarea)
+    limite = timeout or ruta["timeout"]
+    modelos = [modelo] if modelo else [ruta["modelo"]] + ([ruta["respaldo"]] if ruta["respaldo"] and ruta["respaldo"] != ruta["modelo"] else [])
+
+    generado = []
+    try:
+        for intento, modelo_actual in enumerate(modelos):
+            entregados = 0
+            try:
+                async for fragmento in _stream_con_modelo(prompt, modelo_actual, limite, tarea):
+                    entregados += 1
+                    generado.append(fragmento)
+                    yield fragmento
+                return
+            except Exception as e:
+                if entregados or intento == len(modelos) - 1:
+                    raise
+                logger.warning(f"🔀 {tarea}: {modelo_actual} falló ({type(e).__name__}), se usa {modelos[intento + 1]}")
+                registrar_evento(tarea, "fallback")
+    finally:
+        registrar_tokens(estimar_tokens("".join(generado)))
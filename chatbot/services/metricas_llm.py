@@ -0,0 +1,149 @@
+import logging
+import threading
+from typing import Optional
+from chatbot.config import settings
+from chatbot.services.limites_llm import usuario_llm
+from chatbot.utils.metricas import Histograma
+
+logger = logging.getLogger(__name__)
+
+# Métricas de las llamadas al LLM. Cada llamada al proveedor registra tarea, modelo, latencia,
+# tokens de prompt y respuesta (usage_metadata) y resultado; los eventos sin llamada al proveedor
+# (respuesta tomada de otra llamada o de una cache, respaldo, respuesta no interpretable, límite)
+# se cuentan por tarea. Los agregados viven en memoria del worker; el resumen por conversación
+# se acumula en Redis y se guarda en flujo.metadata al finalizar la conversación.
+
+BUCKETS_TOKENS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+_agregados = {}
+_eventos = {}
+_lock = threading.Lock()
+
+def _cliente_redis():
+    # Import diferido: la conexión a Redis se inicializa en el arranque de la aplicación
+    from chatbot.database.connection import obtener_cliente_redis
+    return obtener_cliente_redis()
+
+def _clave_conversacion(usuario: str) -> str:
+    return f"chatbot:llm:conversacion:{usuario}"
+
+def costo_estimado(modelo: str, tokens_prompt: int, tokens_respuesta: int) -> float:
+    """Costo en USD según LLM_PRECIOS (USD por millón de tokens de entrada y de salida)"""
+    entrada, salida = settings.LLM_PRECIOS.get(modelo, (0, 0))
+    return (tokens_prompt * entrada + tokens_respuesta * salida) / 1_000_000
+
+def _acumular_conversacion(campos: dict):
+    usuario = usuario_llm.get()
+    if not usuario:
+        return
+    try:
+        redis = _cliente_redis()
+        clave = _clave_conversacion(usuario)
+        pipeline = redis.pipeline()
+        for campo, valor in campos.items():
+            if isinstance(valor, float):
+                pipeline.hincrbyfloat(clave, campo, valor)
+            else:
+                pipeline.hincrby(clave, campo, valor)
+        pipeline.expire(clave, settings.LLM_METRICAS_TTL_CONVERSACION)
+        pipeline.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo acumular las métricas del LLM de la conversación: {e}")
+
+def registrar_llamada(
+    tarea: Optional[str], modelo: str, latencia_ms: float,
+    tokens_prompt: int, tokens_respuesta: int, resultado: str
+):
+    """
+    Registra una llamada al proveedor.
+
+    Args:
+        resultado: ok, error o cancelada (venció el plazo o ganó otra solicitud)
+    """
+    tarea = tarea or "general"
+    costo = costo_estimado(modelo, tokens_prompt, tokens_respuesta)
+    with _lock:
+        agregado = _agregados.get((tarea, modelo))
+        if agregado is None:
+            agregado = _agregados[(tarea, modelo)] = {
+                "latencia_ms": Histograma(),
+                "tokens_prompt": Histograma(BUCKETS_TOKENS),
+                "tokens_respuesta": Histograma(BUCKETS_TOKENS),
+                "resultados": {},
+                "costo_usd": 0.0,
+            }
+        agregado["resultados"][resultado] = agregado["resultados"].get(resultado, 0) + 1
+        agregado["costo_usd"] += costo
+    agregado["latencia_ms"].observar(latencia_ms)
+    agregado["tokens_prompt"].observar(tokens_prompt)
+    agregado["tokens_respuesta"].observar(tokens_respuesta)
+
+    _acumular_conversacion({
+        "llamadas": 1,
+        "tokens_prompt": tokens_prompt,
+        "tokens_respuesta": tokens_respuesta,
+        "latencia_ms": float(round(latencia_ms, 1)),
+        "costo_usd": float(costo),
+        f"resultado:{resultado}": 1,
+    })
+
+def registrar_evento(tarea: Optional[str], evento: str):
+    """
+    Cuenta un evento de la tarea: cache (respuesta sin llamar al proveedor), timeout, fallback,
+    error_parseo o limite
+    """
+    tarea = tarea or "general"
+    with _lock:
+        eventos = _eventos.setdefault(tarea, {})
+        eventos[evento] = eventos.get(evento, 0) + 1
+    _acumular_conversacion({f"evento:{evento}": 1})
+
+def obtener_metricas_llamadas() -> dict:
+    """Histogramas de latencia y tokens, resultados y costo por tarea y modelo, más eventos por tarea"""
+    with _lock:
+        agregados = list(_agregados.items())
+        eventos = {tarea: dict(valores) for tarea, valores in _eventos.items()}
+
+    llamadas = {}
+    for (tarea, modelo), agregado in agregados:
+        llamadas.setdefault(tarea, {})[modelo] = {
+            "latencia_ms": agregado["latencia_ms"].resumen(),
+            "tokens_prompt": agregado["tokens_prompt"].resumen(),
+            "tokens_respuesta": agregado["tokens_respuesta"].resumen(),
+            "resultados": dict(agregado["resultados"]),
+            "costo_usd": round(agregado["costo_usd"], 6),
+        }
+    return {"llamadas": llamadas, "eventos": eventos}
+
+def resumen_conversacion(usuario: str, limpiar: bool = False) -> dict:
+    """Totales de LLM acumulados en la conversación del usuario (para flujo.metadata)"""
+    try:
+        redis = _cliente_redis()
+        clave = _clave_conversacion(usuario)
+        valores = redis.hgetall(clave)
+        if limpiar:
+            redis.delete(clave)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo leer las métricas del LLM de la conversación: {e}")
+        return {}
+
+    resumen = {"resultados": {}, "eventos": {}}
+    for campo, valor in valores.items():
+        numero = float(valor) if campo in ("latencia_ms", "costo_usd") else int(valor)
+        if campo.startswith("resultado:"):
+            resumen["resultados"][campo.split(":", 1)[1]] = numero
+        elif campo.startswith("evento:"):
+            resumen["eventos"][campo.split(":", 1)[1]] = numero
+        else:
+            resumen[campo] = numero
+    if "latencia_ms" in resumen:
+        resumen["latencia_ms"] = round(resumen["latencia_ms"], 1)
+    if "costo_usd" in resumen:
+        resumen["costo_usd"] = round(resumen["costo_usd"], 6)
+    return resumen
+
+def descartar_resumen_conversacion(usuario: str):
+    try:
+        _cliente_redis().delete(_clave_conversacion(usuario))
+    except Exception:
+        pass
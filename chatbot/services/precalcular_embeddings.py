@@ -0,0 +1,39 @@
+import os
+import sys
+import argparse
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from chatbot.config import settings
+from chatbot.services.servicios_digitales_manager import ServiciosDigitalesManager
+from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager, PROCESOS_CON_CRONOGRAMA
+
+def precalcular(procesos: list) -> bool:
+    """Genera en EMBEDDINGS_DIR las matrices de servicios e hitos antes de levantar el servicio"""
+    exito = True
+    servicios = ServiciosDigitalesManager()
+    if servicios.indice_embeddings is not None:
+        print(f"✅ Servicios: {len(servicios.indice_embeddings)} embeddings")
+    else:
+        print("❌ No se generaron los embeddings de servicios")
+        exito = False
+
+    procesos_manager = ProcesosElectoralesManager()
+    for proceso in procesos:
+        linea = procesos_manager.obtener_linea_de_tiempo(proceso)
+        indice = procesos_manager.obtener_indice_hitos(proceso, linea) if len(linea) else None
+        if indice is not None:
+            print(f"✅ Hitos de {proceso}: {len(indice)} embeddings")
+        else:
+            print(f"❌ No se generaron los embeddings de hitos de {proceso}")
+            exito = False
+    return exito
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalcula los embeddings de servicios digitales e hitos electorales")
+    parser.add_argument("--procesos", nargs="*", default=PROCESOS_CON_CRONOGRAMA)
+    args = parser.parse_args()
+
+    print(f"🚀 Precalculando embeddings ({settings.EMBEDDINGS_BACKEND}) en {settings.EMBEDDINGS_DIR}...")
+    sys.exit(0 if precalcular(args.procesos) else 1)
@@ -0,0 +1,61 @@
+import os
+import sys
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+
+from chatbot.database.connection import inicializar_conexiones
+from chatbot.services.cache_hitos import clave_texto_hito, obtener_texto_hito
+from chatbot.services.procesos_electorales_manager import (
+    ProcesosElectoralesManager, PROCESOS_CON_CRONOGRAMA, VERSION_PROMPT_HITO
+)
+
+async def pregenerar(manager: ProcesosElectoralesManager, procesos: list) -> dict:
+    """Genera y cachea el texto del día de cada hito que aún no lo tenga"""
+    generados = {}
+    for proceso in procesos:
+        generados[proceso] = fallidos = 0
+        for hito in manager.obtener_linea_de_tiempo(proceso).todos():
+            clave = clave_texto_hito(hito, VERSION_PROMPT_HITO)
+            if obtener_texto_hito(clave) is not None:
+                continue
+            await manager.formatear_hito_electoral(hito)
+            # Si el LLM falló se devolvió el texto de respaldo y no quedó nada en cache
+            if obtener_texto_hito(clave) is not None:
+                generados[proceso] += 1
+            else:
+                fallidos += 1
+        print(f"✅ {proceso}: {generados[proceso]} textos de hitos generados")
+        if fallidos:
+            print(f"⚠️ {proceso}: {fallidos} hitos sin texto (el LLM no respondió), se reintentan en la próxima ejecución")
+    return generados
+
+def segundos_hasta(hora: str) -> float:
+    """Segundos hasta la próxima ocurrencia de HH:MM"""
+    ahora = datetime.now()
+    objetivo = datetime.combine(ahora.date(), datetime.strptime(hora, "%H:%M").time())
+    if objetivo <= ahora:
+        objetivo += timedelta(days=1)
+    return (objetivo - ahora).total_seconds()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pregenera los textos de los hitos electorales del día en Redis")
+    parser.add_argument("--procesos", nargs="*", default=PROCESOS_CON_CRONOGRAMA)
+    parser.add_argument("--hora", default=None, help="Hora diaria de ejecución HH:MM (sin valor = una sola vez)")
+    args = parser.parse_args()
+
+    inicializar_conexiones()
+    manager = ProcesosElectoralesManager()
+
+    async def ejecutar():
+        print(f"🚀 Pregenerando textos de hitos para {', '.join(args.procesos)}...")
+        await pregenerar(manager, args.procesos)
+
+        while args.hora:
+            await asyncio.sleep(segundos_hasta(args.hora))
+            await pregenerar(manager, args.procesos)
+
+    asyncio.run(ejecutar())
@@ -1,23 +1,68 @@
-from chatbot.database.oracle_repository import OracleRepository
+from chatbot.database.oracle_repository import OracleRepository, RegistroPolitico, MESES, eliminar_tildes
+from chatbot.database.circuit_breaker import DictObsoleto, ListaObsoleta, es_obsoleto
+from chatbot.services.cronograma_timeline import LineaDeTiempoHitos, parsear_fecha_hito
+from chatbot.services.busqueda_lexica import raiz
+from chatbot.services.indice_embeddings import IndiceEmbeddings
+from chatbot.services.cache_consultas import CacheConsultas
+from chatbot.services.llm_gateway import generar_indices, generar_texto, generar_texto_stream
+from chatbot.services.metricas_llm import registrar_evento
+from chatbot.database.oracle_async import ejecutar_en_oracle
+from chatbot.services.cache_hitos import clave_texto_hito, obtener_texto_hito, guardar_texto_hito
+from chatbot.utils.metricas import estimar_tokens
+from chatbot.config import settings
 import logging
 import os
-from datetime import datetime
-from google import genai
+import re
+import time
+import numpy as np
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Procesos electorales con cronograma de hitos disponible
+PROCESOS_CON_CRONOGRAMA = ["EG.2026", "EMC.2025", "ERM.2022", "EG.2021"]
+
+# Versión del prompt de formatear_hito_electoral: cambiarla invalida los textos cacheados
+VERSION_PROMPT_HITO = "1"
+
+# Consultas temporales del cronograma que se responden desde la línea de tiempo, sin LLM
+# (se evalúan sobre el texto en minúsculas y sin tildes)
+PATRON_HOY = re.compile(r"\bhoy\b")
+PATRON_ESTA_SEMANA = re.compile(r"\best[ae] semana\b")
+PATRON_ESTE_MES = re.compile(r"\beste mes\b")
+PATRON_PROXIMOS = re.compile(r"\b(proxim[oa]s?|siguientes?|que (viene|sigue)n?)\b")
+# "falta", "pronto" y "ahora" solo son temporales junto a un hito o una fecha:
+# "¿qué hitos vienen pronto?" sí, "¿qué falta para inscribir un partido?" no
+PATRON_PROXIMOS_CONTEXTO = re.compile(r"\b(falta|pronto|ahora)\b")
+PATRON_CONTEXTO_CRONOGRAMA = re.compile(r"\b(hitos?|fechas?|cronograma|plazos?|eleccion(es)?)\b")
+PATRON_PASADOS = re.compile(r"\b(anteriore?s?|pasad[oa]s?|recientes?|ya (paso|pasaron|ocurrio))\b")
+PATRON_FECHA_ELECCION = re.compile(
+    r"\b(fecha|dia|cuando|cuanto falta)\b.*\b(eleccion|elecciones|votacion|votar|sufragio|segunda vuelta)\b"
+)
+# Palabras que no indican el tema de una consulta temporal
+PALABRAS_RELLENO_CRONOGRAMA = {
+    "que", "cual", "cuales", "son", "los", "las", "del", "hay", "hito", "hitos", "fecha", "fechas",
+    "cuando", "cuanto", "proceso", "electoral", "electorales", "cronograma", "para", "por", "una", "uno", "unos",
+    "tengo", "tiene", "van", "esta", "este", "estos", "estas", "semana", "mes", "dime", "quiero", "saber",
+    "evento", "eventos", "actividad", "actividades", "pasa", "sucede", "ocurre", "con", "sus", "mas",
+    "fue", "fueron", "sera", "seran", "era", "hubo", "viene", "vienen", "sigue", "siguen", "queda", "quedan", "faltan"
+}
+# Palabras de la elección misma: con solo estas, "fecha de la elección" pide la jornada de votación
+PALABRAS_ELECCION = {"eleccion", "elecciones", "votacion", "votar", "sufragio", "segunda", "vuelta", "dia"}
+# Hitos que corresponden a la jornada de votación
+PATRON_HITO_ELECCION = re.compile(r"\b(jornada electoral|sufragio|votacion|dia de la eleccion|segunda vuelta)\b")
+
 class ProcesosElectoralesManager:
     """Gestor de procesos electorales del JNE"""
     
     def __init__(self):
         self.oracle_repo = OracleRepository()
-        # Inicializar cliente LLM
-        self.client = genai.Client()
-        self.MESES = {
-            "ENERO": 1, "FEBRERO": 2, "MARZO": 3, "ABRIL": 4,
-            "MAYO": 5, "JUNIO": 6, "JULIO": 7, "AGOSTO": 8,
-            "SEPTIEMBRE": 9, "SETIEMBRE": 9, "OCTUBRE": 10, "NOVIEMBRE": 11, "DICIEMBRE": 12
-        }
+        self.MESES = MESES
+        # Línea de tiempo de hitos por proceso electoral: (momento de carga, LineaDeTiempoHitos)
+        self._lineas_de_tiempo = {}
+        # Embeddings de los hitos por proceso electoral: (LineaDeTiempoHitos, IndiceEmbeddings)
+        self._indices_hitos = {}
+        self.cache_consultas = CacheConsultas("hitos")
     
     def obtener_tipos_organizaciones_politicas(self) -> str:
         """
@@ -58,12 +103,7 @@ class ProcesosElectoralesManager:
             logger.info("📅 Generando menú de cronograma electoral...")
             
             # Procesos específicos que siempre se muestran
-            procesos_especificos = [
-                "EG.2026",
-                "EMC.2025", 
-                "ERM.2022",
-                "EG.2021"
-            ]
+            procesos_especificos = PROCESOS_CON_CRONOGRAMA
             
             # Obtener todos los procesos de la base de datos
             todos_procesos = self.oracle_repo.obtener_procesos_electorales()
@@ -105,156 +145,270 @@ class ProcesosElectoralesManager:
             logger.error(f"❌ Error al obtener procesos electorales: {e}")
             return []
     
-    def buscar_hitos_electorales_semanticamente(self, proceso_electoral: str, consulta_usuario: str, top_k: int = 5) -> list:
+    def obtener_linea_de_tiempo(self, proceso_electoral: str) -> LineaDeTiempoHitos:
+        """
+        Línea de tiempo de los hitos de un proceso, construida una vez por proceso y
+        reutilizada durante CRONOGRAMA_TTL_SEGUNDOS
+        """
+        cargada = self._lineas_de_tiempo.get(proceso_electoral)
+        if cargada and time.monotonic() - cargada[0] < settings.CRONOGRAMA_TTL_SEGUNDOS:
+            return cargada[1]
+
+        hitos = self.oracle_repo.obtener_todos_hitos_por_proceso(proceso_electoral)
+        linea = LineaDeTiempoHitos(hitos)
+        # No se guarda una línea vacía (Oracle no respondió) para reintentar en la siguiente consulta
+        if hitos:
+            self._lineas_de_tiempo[proceso_electoral] = (time.monotonic(), linea)
+        logger.info(f"📅 Línea de tiempo de {proceso_electoral}: {len(linea)} hitos")
+        return linea
+    
+    def obtener_indice_hitos(self, proceso_electoral: str, linea: LineaDeTiempoHitos):
+        """
+        Índice de embeddings de los hitos de la línea de tiempo (en el orden de linea.todos()).
+        Se recalcula solo si la línea se recargó; la matriz en disco se reutiliza si los textos no cambiaron.
+        """
+        if not settings.EMBEDDINGS_HABILITADO:
+            return None
+        cargado = self._indices_hitos.get(proceso_electoral)
+        if cargado and cargado[0] is linea:
+            return cargado[1]
+        try:
+            textos = [hito.get("hito_electoral", "") or "" for hito in linea.todos()]
+            indice = IndiceEmbeddings(f"hitos_{proceso_electoral}", textos)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo construir el índice de embeddings de hitos: {e}")
+            return None
+        self._indices_hitos[proceso_electoral] = (linea, indice)
+        return indice
+    
+    def buscar_hitos_temporales(self, linea: LineaDeTiempoHitos, consulta_usuario: str, top_k: int = 5):
+        """
+        Camino rápido para consultas temporales ("próximo", "siguiente", "hoy", "esta semana",
+        "fecha de la elección"...): se responden desde la línea de tiempo sin llamar al LLM.
+        Si la consulta trae además un tema ("próxima fecha de inscripción de candidatos"),
+        se filtran los hitos por esas palabras; si ninguno coincide se deja la consulta al LLM.
+        
+        Returns:
+            Lista de hitos, o None si la consulta no es temporal (se usa la búsqueda con LLM)
+        """
+        consulta = eliminar_tildes(consulta_usuario.lower())
+        hoy = datetime.now().date()
+        
+        # Palabras del tema de la consulta (sin las temporales, las de relleno ni las de la elección):
+        # "¿cuándo cierran las inscripciones para las elecciones?" pregunta por las inscripciones
+        texto_tema = PATRON_HOY.sub(" ", PATRON_ESTA_SEMANA.sub(" ", PATRON_ESTE_MES.sub(" ", consulta)))
+        texto_tema = PATRON_PASADOS.sub(" ", PATRON_PROXIMOS.sub(" ", PATRON_PROXIMOS_CONTEXTO.sub(" ", texto_tema)))
+        palabras_tema = [
+            palabra for palabra in re.findall(r"[a-zñ]+", texto_tema)
+            if len(palabra) > 2 and palabra not in PALABRAS_RELLENO_CRONOGRAMA and palabra not in PALABRAS_ELECCION
+        ]
+        
+        if PATRON_FECHA_ELECCION.search(consulta) and not palabras_tema:
+            hitos_eleccion = [
+                hito for hito in linea.hitos
+                if PATRON_HITO_ELECCION.search(eliminar_tildes(hito.get("hito_electoral", "").lower()))
+            ]
+            if not hitos_eleccion:
+                return None
+            proximos = [hito for hito in hitos_eleccion if hito["fecha"] >= hoy]
+            return (proximos or hitos_eleccion[::-1])[:top_k]
+        
+        if PATRON_HOY.search(consulta):
+            hitos = linea.en_rango(hoy, hoy)
+        elif PATRON_ESTA_SEMANA.search(consulta):
+            inicio_semana = hoy - timedelta(days=hoy.weekday())
+            hitos = linea.en_rango(inicio_semana, inicio_semana + timedelta(days=6))
+        elif PATRON_ESTE_MES.search(consulta):
+            fin_mes = (hoy.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+            hitos = linea.en_rango(hoy.replace(day=1), fin_mes)
+        elif PATRON_PASADOS.search(consulta):
+            hitos = linea.pasados()
+        elif PATRON_PROXIMOS.search(consulta) or (
+            PATRON_PROXIMOS_CONTEXTO.search(consulta) and PATRON_CONTEXTO_CRONOGRAMA.search(consulta)
+        ):
+            hitos = linea.proximos(len(linea.hitos))
+        elif PATRON_FECHA_ELECCION.search(consulta):
+            # Fecha de un hito del proceso ("fecha límite de renuncia para la elección"):
+            # primero los próximos y luego los más recientes, filtrados por el tema
+            hitos = linea.proximos(len(linea.hitos)) + linea.pasados()
+        else:
+            return None
+        
+        if palabras_tema:
+            raices = {raiz(palabra) for palabra in palabras_tema}
+            hitos = [
+                hito for hito in hitos
+                if any(r in eliminar_tildes(hito.get("hito_electoral", "").lower()) for r in raices)
+            ]
+            return hitos[:top_k] or None
+        
+        # Sin hitos en el periodo pedido: los próximos; si el proceso ya terminó, los más recientes
+        return (hitos or linea.proximos(top_k) or linea.pasados(top_k))[:top_k] or None
+    
+    async def buscar_hitos_electorales_semanticamente(self, proceso_electoral: str, consulta_usuario: str, top_k: int = 5) -> list:
         """
         Busca hitos electorales usando búsqueda semántica con LLM.
-        Obtiene TODOS los hitos del proceso electoral y usa el LLM para seleccionar los más relevantes,
-        pasando el texto completo de los hitos al contexto del LLM.
+        Obtiene TODOS los hitos del proceso electoral, los prefiltra por palabras clave y prioridad
+        temporal, y usa el LLM para seleccionar los más relevantes entre los mejores candidatos.
         """
         try:
             # Verificar si es un proceso específico válido
-            procesos_especificos = ["EG.2026", "EMC.2025", "ERM.2022", "EG.2021"]
+            procesos_especificos = PROCESOS_CON_CRONOGRAMA
             if proceso_electoral not in procesos_especificos:
                 return []
             
             # Obtener TODOS los hitos del proceso electoral (SIN filtro de texto, solo por proceso)
-            todos_hitos = self.oracle_repo.obtener_todos_hitos_por_proceso(proceso_electoral)
+            linea = await ejecutar_en_oracle(
+                self.obtener_linea_de_tiempo, proceso_electoral, por_defecto=LineaDeTiempoHitos([])
+            )
+            todos_hitos = linea.todos()
             
             if not todos_hitos:
                 return []
             
+            # La fecha forma parte de la versión: la prioridad temporal cambia de un día a otro
+            version = f"{proceso_electoral}:{linea.huella}:{datetime.now().date().isoformat()}:{top_k}"
+            indices = await self.cache_consultas.obtener(consulta_usuario, version)
+            if indices is not None:
+                registrar_evento("ranking_hitos", "cache")
+                return [todos_hitos[indice] for indice in indices if 0 <= indice < len(todos_hitos)]
+            
+            hitos, confiable = await self._buscar_hitos(proceso_electoral, linea, consulta_usuario, top_k)
+            # El respaldo por palabras clave (LLM caído o sin cupo) no se cachea
+            if confiable:
+                posiciones = {id(hito): indice for indice, hito in enumerate(todos_hitos)}
+                await self.cache_consultas.guardar(consulta_usuario, version, [posiciones[id(hito)] for hito in hitos])
+            return hitos
+            
+        except Exception as e:
+            return []
+    
+    async def _buscar_hitos(self, proceso_electoral: str, linea: LineaDeTiempoHitos, consulta_usuario: str, top_k: int) -> tuple:
+        """
+        Camino temporal, embeddings o ranking con LLM sobre los candidatos prefiltrados.
+        
+        Returns:
+            (hitos, confiable): confiable salvo cuando se usó el respaldo por palabras clave
+        """
+        todos_hitos = linea.todos()
+        try:
+            # Consultas temporales: respuesta directa desde la línea de tiempo, sin LLM
+            hitos_temporales = self.buscar_hitos_temporales(linea, consulta_usuario, top_k)
+            if hitos_temporales:
+                logger.info(f"⚡ Consulta temporal resuelta desde la línea de tiempo: {len(hitos_temporales)} hitos")
+                return hitos_temporales, True
+            
             # Si hay pocos hitos, devolver todos directamente
             if len(todos_hitos) <= top_k:
-                return todos_hitos
-            
-            # Crear el texto de los hitos con su descripción completa
-            hitos_texto = ""
-            for i, hito in enumerate(todos_hitos):
-                descripcion = hito.get('hito_electoral', '')
-                hitos_texto += f"{i+1}. {descripcion}\n"
-            
-            prompt = (
-                f"Eres un asistente del JNE. Selecciona los {top_k} hitos más relevantes.\n\n"
-                f"FECHA ACTUAL: {datetime.now().strftime('%d/%m/%Y')}\n"
-                f"CONSULTA: \"{consulta_usuario}\"\n\n"
-                f"INSTRUCCIONES:\n"
-                f"1. Analiza los hitos disponibles considerando la fecha actual\n"
-                f"2. Prioriza hitos que estén por ocurrir o sean recientes\n"
-                f"3. Selecciona los {top_k} más relevantes para la consulta\n"
-                f"4. Responde SOLO con números separados por comas\n\n"
-                f"HITOS ({len(todos_hitos)} disponibles):\n"
-                f"{hitos_texto}\n\n"
-                f"Respuesta (solo números):"
-            )
+                return todos_hitos, True
+            
+            # Paráfrasis con alta similitud: respuesta directa desde los embeddings, sin LLM
+            indice_hitos = self.obtener_indice_hitos(proceso_electoral, linea)
+            if indice_hitos:
+                similares = indice_hitos.buscar(consulta_usuario, top_k)
+                if similares and similares[0][1] >= settings.EMBEDDINGS_SIMILITUD_DIRECTA:
+                    logger.info(f"⚡ Consulta de hitos resuelta por embeddings (similitud {similares[0][1]:.2f})")
+                    return [todos_hitos[indice] for indice, _ in similares], True
+            
+            # Prefiltro léxico y temporal: solo los mejores candidatos llegan al prompt,
+            # en orden cronológico para que el LLM pueda razonar sobre las fechas
+            candidatos = todos_hitos
+            if len(todos_hitos) > settings.HITOS_CANDIDATOS_LLM:
+                puntuacion = self.puntuar_hitos(linea, consulta_usuario)
+                mejores = np.argsort(-puntuacion, kind="stable")[:settings.HITOS_CANDIDATOS_LLM]
+                candidatos = [todos_hitos[indice] for indice in sorted(mejores)]
+            
+            prompt = self._prompt_ranking_hitos(candidatos, consulta_usuario, top_k)
+            if candidatos is not todos_hitos:
+                tokens_completo = estimar_tokens(self._prompt_ranking_hitos(todos_hitos, consulta_usuario, top_k))
+                logger.info(
+                    f"✂️ Prefiltro de hitos: {len(todos_hitos)} -> {len(candidatos)} candidatos, "
+                    f"~{tokens_completo} -> ~{estimar_tokens(prompt)} tokens de prompt"
+                )
             
             try:
                 # Usar el LLM para encontrar hitos relevantes
-                response = self.client.models.generate_content(
-                    model="gemma-3-27b-it",
-                    contents=prompt
-                )
-                
-                # Parsear la respuesta del LLM
-                numeros_texto = response.text.strip()
-                numeros = []
+                # (arreglo validado, con un reintento si la respuesta no se pudo interpretar)
+                numeros = await generar_indices(prompt, len(candidatos), tarea="ranking_hitos")
                 
-                # Extraer números de la respuesta
-                for parte in numeros_texto.split(','):
-                    parte = parte.strip()
-                    if parte.isdigit():
-                        numero = int(parte) - 1  # Convertir a índice base 0
-                        if 0 <= numero < len(todos_hitos):
-                            numeros.append(numero)
+                # Obtener los hitos seleccionados (números en base 1)
+                hitos_seleccionados = []
+                for numero in numeros[:top_k]:
+                    hitos_seleccionados.append(candidatos[numero - 1])
                 
-                # Si el LLM devolvió números válidos, usarlos
-                if numeros:
-                    # Obtener los hitos seleccionados
-                    hitos_seleccionados = []
-                    for numero in numeros[:top_k]:
-                        hitos_seleccionados.append(todos_hitos[numero])
-                    
-                    return hitos_seleccionados
-                else:
-                    raise Exception("LLM no devolvió números válidos")
+                return hitos_seleccionados, True
                     
             except Exception as llm_error:
                 # Fallback: búsqueda por texto en los hitos disponibles
-                return self._busqueda_fallback_hitos(todos_hitos, consulta_usuario, top_k)
+                return self._busqueda_fallback_hitos(linea, consulta_usuario, top_k), False
             
         except Exception as e:
-            return []
+            return [], False
+    
+    def _prompt_ranking_hitos(self, hitos: list, consulta_usuario: str, top_k: int) -> str:
+        """Prompt para que el LLM elija los hitos más relevantes entre los candidatos"""
+        # Crear el texto de los hitos con su descripción completa
+        hitos_texto = ""
+        for i, hito in enumerate(hitos):
+            descripcion = hito.get('hito_electoral', '')
+            hitos_texto += f"{i+1}. {descripcion}\n"
+        
+        return (
+            f"Eres un asistente del JNE. Selecciona los {top_k} hitos más relevantes.\n\n"
+            f"FECHA ACTUAL: {datetime.now().strftime('%d/%m/%Y')}\n"
+            f"CONSULTA: \"{consulta_usuario}\"\n\n"
+            f"INSTRUCCIONES:\n"
+            f"1. Analiza los hitos disponibles considerando la fecha actual\n"
+            f"2. Prioriza hitos que estén por ocurrir o sean recientes\n"
+            f"3. Selecciona los {top_k} más relevantes para la consulta\n"
+            f"4. Responde SOLO con un arreglo JSON de números, del más al menos relevante. Ejemplo: [4, 2, 9]\n\n"
+            f"HITOS ({len(hitos)} disponibles):\n"
+            f"{hitos_texto}\n\n"
+            f"Respuesta (arreglo JSON):"
+        )
     
-    def _busqueda_fallback_hitos(self, todos_hitos: list, consulta_usuario: str, top_k: int) -> list:
+    def puntuar_hitos(self, linea: LineaDeTiempoHitos, consulta_usuario: str) -> np.ndarray:
+        """
+        Puntuación de relevancia de cada hito de linea.todos() para la consulta: coincidencia de
+        palabras clave, de la consulta completa y de pares de palabras, más prioridad temporal
+        (futuros > último año > históricos). Cada criterio se evalúa sobre todos los hitos a la vez.
+        """
+        descripciones = linea.descripciones
+        puntuacion = np.zeros(len(descripciones))
+        
+        # Normalizar consulta del usuario
+        consulta_normalizada = consulta_usuario.lower().strip()
+        palabras_clave = [palabra for palabra in consulta_normalizada.split() if len(palabra) > 2]
+        
+        if palabras_clave:
+            # Puntuación por palabras clave, con bonus por palabras más largas (más específicas)
+            for palabra in palabras_clave:
+                puntuacion += (np.char.find(descripciones, palabra) >= 0) * (1.5 if len(palabra) > 4 else 1.0)
+            # Coincidencia exacta de la consulta completa
+            puntuacion += (np.char.find(descripciones, consulta_normalizada) >= 0) * 5.0
+            # Frases de dos palabras consecutivas
+            for anterior, siguiente in zip(palabras_clave, palabras_clave[1:]):
+                puntuacion += (np.char.find(descripciones, f"{anterior} {siguiente}") >= 0) * 2.0
+        
+        # Bonus por fecha y prioridad temporal: futuros (3), último año (1.5), históricos (0.5)
+        hoy = datetime.now().date().toordinal()
+        ordinales = linea.ordinales
+        temporal = np.where(ordinales > hoy, 3.0, np.where(hoy - ordinales <= 365, 1.5, 0.5))
+        puntuacion += np.where(ordinales > 0, 0.3 + temporal, 0.0)
+        return puntuacion
+    
+    def _busqueda_fallback_hitos(self, linea: LineaDeTiempoHitos, consulta_usuario: str, top_k: int) -> list:
         """
         Método de fallback para buscar hitos cuando el LLM falla
         """
+        todos_hitos = linea.todos()
         try:
-            
-            # Obtener fecha actual
-            fecha_actual = datetime.now()
-            
-            # Normalizar consulta del usuario
-            consulta_normalizada = consulta_usuario.lower().strip()
-            palabras_clave = [palabra.strip() for palabra in consulta_normalizada.split() if len(palabra.strip()) > 2]
-            
             # Si no hay palabras clave válidas, devolver primeros hitos
-            if not palabras_clave:
+            if not [palabra for palabra in consulta_usuario.lower().split() if len(palabra) > 2]:
                 return todos_hitos[:top_k]
             
-            # Calcular puntuación de relevancia para cada hito
-            hitos_con_puntuacion = []
-            
-            for hito in todos_hitos:
-                descripcion = hito.get('hito_electoral', '').lower()
-                puntuacion = 0
-                
-                # Puntuación por palabras clave individuales
-                for palabra in palabras_clave:
-                    if palabra in descripcion:
-                        puntuacion += 1
-                        # Bonus por palabras más largas (más específicas)
-                        if len(palabra) > 4:
-                            puntuacion += 0.5
-                
-                # Puntuación extra por coincidencias exactas de la consulta completa
-                if consulta_normalizada in descripcion:
-                    puntuacion += 5
-                
-                # Puntuación por frases completas
-                for i in range(len(palabras_clave) - 1):
-                    frase = f"{palabras_clave[i]} {palabras_clave[i+1]}"
-                    if frase in descripcion:
-                        puntuacion += 2
-                
-                # Bonus por hitos con fechas específicas
-                if hito.get('dia') and hito.get('mes') and hito.get('anio'):
-                    puntuacion += 0.3
-                    
-                    # Bonus temporal: priorizar hitos futuros o recientes
-                    try:
-                        fecha_hito = datetime(hito['anio'], int(hito['mes']) if hito['mes'].isdigit() else 1, hito['dia'])
-                        if fecha_hito > fecha_actual:
-                            # Hito futuro - alta prioridad
-                            puntuacion += 3
-                        elif fecha_hito > fecha_actual.replace(year=fecha_actual.year - 1):
-                            # Hito reciente (último año) - prioridad media
-                            puntuacion += 1.5
-                        else:
-                            # Hito histórico - prioridad baja
-                            puntuacion += 0.5
-                    except:
-                        # Si no se puede parsear la fecha, mantener puntuación base
-                        pass
-                
-                hitos_con_puntuacion.append((hito, puntuacion))
-            
-            # Ordenar por puntuación (mayor a menor)
-            hitos_con_puntuacion.sort(key=lambda x: x[1], reverse=True)
-            
-            # Tomar los top_k hitos con mayor puntuación
-            hitos_seleccionados = [hito for hito, _ in hitos_con_puntuacion[:top_k]]
-            
-            return hitos_seleccionados
+            puntuacion = self.puntuar_hitos(linea, consulta_usuario)
+            return [todos_hitos[indice] for indice in np.argsort(-puntuacion, kind="stable")[:top_k]]
             
         except Exception as e:
             # Último recurso: devolver los primeros hitos
@@ -280,6 +434,7 @@ class ProcesosElectoralesManager:
 
         menu = f"📋 **Hitos Encontrados** ({len(hitos)})\n\n"
         menu += "Selecciona uno:\n\n"
+        fecha_actual = datetime.now().date()
         
         for i, hito in enumerate(hitos, 1):
             # Truncar descripción más agresivamente para móviles
@@ -294,75 +449,50 @@ class ProcesosElectoralesManager:
             if hito.get('dia') and hito.get('mes') and hito.get('anio'):
                 fecha_info = f" ({hito['dia']}/{hito['mes']})"
                 
-                # Determinar contexto temporal
-                try:
-                    mes = None
-                    if str(hito['mes']).isdigit():
-                        mes = int(hito['mes'])
-                    else:
-                        mes = self.MESES.get(str(hito['mes']).upper(), 1)  # Default enero si no reconoce
-                    
-                    fecha_hito = datetime(
-                        int(hito['anio']),
-                        mes,
-                        int(hito['dia'])
-                    ).date()
-                    fecha_actual = datetime.now().date()
-                    
-                    if fecha_hito < fecha_actual:
-                        contexto_temporal = " ✅"
-                    elif fecha_hito > fecha_actual:
-                        contexto_temporal = " 🔜"
-                    else:
-                        contexto_temporal = " 🎯"
-                except:
+                # Determinar contexto temporal (la línea de tiempo ya trae la fecha parseada)
+                fecha_hito = parsear_fecha_hito(hito)
+                
+                if fecha_hito is None:
                     contexto_temporal = " 📅"
+                elif fecha_hito < fecha_actual:
+                    contexto_temporal = " ✅"
+                elif fecha_hito > fecha_actual:
+                    contexto_temporal = " 🔜"
+                else:
+                    contexto_temporal = " 🎯"
             
             menu += f"{i}. {descripcion}{fecha_info}{contexto_temporal}\n"
         
         menu += f"\n💡 Escribe el número o 'menu':"
         return menu
     
-    def formatear_hito_electoral(self, hito: dict) -> str:
-        """
-        Formatea un hito electoral usando LLM para generar una respuesta amigable y concisa
-        """
-        try:
-            # Obtener fecha actual
-            fecha_actual = datetime.now().date()
-            fecha_actual_str = datetime.now().strftime("%d/%m/%Y")
-            
-            # Construir fecha del hito
-            if hito.get('dia') and hito.get('mes') and hito.get('anio'):
-                fecha_hito = f"{hito['dia']}/{hito['mes']}/{hito['anio']}"
-                
-                # Determinar si el hito ya pasó o está por venir
-                try:
-                    if str(hito['mes']).isdigit():
-                        mes = int(hito['mes'])
-                    else:
-                        mes = self.MESES.get(str(hito['mes']).upper(), 1)  # Default enero si no reconoce
-                    
-                    fecha_hito_obj = datetime(
-                        int(hito['anio']),
-                        mes,
-                        int(hito['dia'])
-                    ).date()
-                    
-                    if fecha_hito_obj < fecha_actual:
-                        contexto_temporal = "ya ocurrió"
-                    elif fecha_hito_obj > fecha_actual:
-                        contexto_temporal = "está por ocurrir"
-                    else:
-                        contexto_temporal = "ocurre hoy"
-                except:
-                    contexto_temporal = "está programado"
+    def _preparar_hito(self, hito: dict) -> dict:
+        """Fecha, contexto temporal, prompt y clave de cache del texto de un hito"""
+        # Obtener fecha actual
+        fecha_actual = datetime.now().date()
+        fecha_actual_str = datetime.now().strftime("%d/%m/%Y")
+        
+        # Construir fecha del hito
+        if hito.get('dia') and hito.get('mes') and hito.get('anio'):
+            fecha_hito = f"{hito['dia']}/{hito['mes']}/{hito['anio']}"
+            
+            # Determinar si el hito ya pasó o está por venir
+            fecha_hito_obj = parsear_fecha_hito(hito)
+            
+            if fecha_hito_obj is None:
+                contexto_temporal = "está programado"
+            elif fecha_hito_obj < fecha_actual:
+                contexto_temporal = "ya ocurrió"
+            elif fecha_hito_obj > fecha_actual:
+                contexto_temporal = "está por ocurrir"
             else:
-                fecha_hito = "Fecha no especificada"
-                contexto_temporal = "sin fecha específica"
-            
-            # Crear prompt para el LLM con contexto temporal
-            prompt = f"""
+                contexto_temporal = "ocurre hoy"
+        else:
+            fecha_hito = "Fecha no especificada"
+            contexto_temporal = "sin fecha específica"
+        
+        # Crear prompt para el LLM con contexto temporal
+        prompt = f"""
             Eres un asistente del JNE. Genera una respuesta CONCISA y contextualizada para este hito electoral.
             
             FECHA ACTUAL: {fecha_actual_str}
@@ -381,34 +511,85 @@ class ProcesosElectoralesManager:
             
             Respuesta contextualizada:
             """
+        
+        return {
+            "fecha_hito": fecha_hito,
+            "contexto_temporal": contexto_temporal,
+            "prompt": prompt,
+            # Texto ya generado hoy por cualquier worker (o por el job nocturno)
+            "clave_cache": clave_texto_hito(hito, VERSION_PROMPT_HITO, fecha_actual)
+        }
+    
+    def _pie_hito(self, hito: dict, fecha_hito: str) -> str:
+        """Información esencial del hito de forma compacta"""
+        return f"\n\n📅 {fecha_hito} | 🏛️ {hito['proceso_electoral']}\n\n¿Otra consulta? (si/no):"
+    
+    def _respaldo_hito(self, hito: dict, datos: dict) -> str:
+        """Respuesta estándar CONCISA con contexto temporal cuando el LLM falla"""
+        respuesta = f"📅 **{hito['hito_electoral']}**\n\n"
+        respuesta += f"🗓️ {datos['fecha_hito']} ({datos['contexto_temporal']}) | 🏛️ {hito['proceso_electoral']}\n\n"
+        respuesta += "¿Otra consulta? (si/no):"
+        return respuesta
+    
+    async def formatear_hito_electoral(self, hito: dict) -> str:
+        """
+        Formatea un hito electoral usando LLM para generar una respuesta amigable y concisa
+        """
+        try:
+            datos = self._preparar_hito(hito)
+            respuesta_llm = obtener_texto_hito(datos["clave_cache"])
             
             try:
-                # Usar el LLM para generar respuesta amigable
-                response = self.client.models.generate_content(
-                    model="gemma-3-27b-it",
-                    contents=prompt
-                )
-                
-                respuesta_llm = response.text.strip()
-                
-                # Agregar información esencial de forma compacta
-                respuesta_completa = f"{respuesta_llm}\n\n"
-                respuesta_completa += f"📅 {fecha_hito} | 🏛️ {hito['proceso_electoral']}\n\n"
-                respuesta_completa += "¿Otra consulta? (si/no):"
+                if respuesta_llm is None:
+                    # Usar el LLM para generar respuesta amigable
+                    respuesta_llm = (await generar_texto(datos["prompt"], tarea="formato_hito")).strip()
+                    guardar_texto_hito(datos["clave_cache"], respuesta_llm)
+                else:
+                    registrar_evento("formato_hito", "cache")
                 
-                return respuesta_completa
+                return respuesta_llm + self._pie_hito(hito, datos["fecha_hito"])
                 
             except Exception as llm_error:
-                # Fallback: respuesta estándar CONCISA con contexto temporal
-                respuesta = f"📅 **{hito['hito_electoral']}**\n\n"
-                respuesta += f"🗓️ {fecha_hito} ({contexto_temporal}) | 🏛️ {hito['proceso_electoral']}\n\n"
-                respuesta += "¿Otra consulta? (si/no):"
-                
-                return respuesta
+                return self._respaldo_hito(hito, datos)
             
         except Exception as e:
             return "Error al procesar el hito electoral."
     
+    async def formatear_hito_electoral_stream(self, hito: dict):
+        """
+        Versión en streaming de formatear_hito_electoral: entrega el texto del LLM por fragmentos
+        y termina con el pie del hito. Si el texto ya está en cache se entrega de una vez.
+        """
+        try:
+            datos = self._preparar_hito(hito)
+        except Exception as e:
+            yield "Error al procesar el hito electoral."
+            return
+        
+        respuesta_llm = obtener_texto_hito(datos["clave_cache"])
+        if respuesta_llm is not None:
+            registrar_evento("formato_hito", "cache")
+            yield respuesta_llm + self._pie_hito(hito, datos["fecha_hito"])
+            return
+        
+        fragmentos = []
+        try:
+            async for fragmento in generar_texto_stream(datos["prompt"], tarea="formato_hito"):
+                # El primer fragmento suele traer saltos de línea iniciales
+                if not fragmentos:
+                    fragmento = fragmento.lstrip()
+                fragmentos.append(fragmento)
+                yield fragmento
+        except Exception as llm_error:
+            if not fragmentos:
+                yield self._respaldo_hito(hito, datos)
+                return
+        else:
+            # Solo se cachean respuestas completas
+            guardar_texto_hito(datos["clave_cache"], "".join(fragmentos).strip())
+        
+        yield self._pie_hito(hito, datos["fecha_hito"])
+    
     def buscar_politicos(self, nombres: str, apellidos: str = "") -> list:
         """
         Busca políticos por nombres y apellidos
@@ -453,6 +634,8 @@ class ProcesosElectoralesManager:
             respuesta += f"🏆 **Cargo Electo:** {politico['cargo_electo']}\n\n"
             respuesta += "📌 Esta información es consultada desde el registro oficial del Jurado Nacional de Elecciones.\n\n"
             respuesta += "🔗 **Más Información:** https://infogob.jne.gob.pe/Politico\n\n"
+            if es_obsoleto(politico):
+                respuesta += "⚠️ Información de la última consulta exitosa; puede no estar actualizada.\n\n"
             respuesta += "¿Tienes otra consulta? (responde 'si' o 'no'):"
             
             return respuesta
@@ -786,6 +969,44 @@ class ProcesosElectoralesManager:
             logger.error(f"❌ Error al obtener elecciones por candidato: {e}")
             return []
     
+    def obtener_registros_candidato(self, nombres: str, apellido_paterno: str, apellido_materno: str) -> list:
+        """
+        Obtiene todas las filas de un candidato en una consulta, en forma compacta
+        (una tupla por elección) para guardarlas en el estado de la conversación.
+        Si vienen del respaldo del circuit breaker se devuelven como ListaObsoleta.
+        """
+        try:
+            logger.info(f"🗳️ Obteniendo registros para candidato: {nombres} {apellido_paterno} {apellido_materno}")
+            registros = self.oracle_repo.obtener_registros_candidato(nombres, apellido_paterno, apellido_materno)
+            compactos = [registro.a_tupla() for registro in registros]
+            return ListaObsoleta(compactos) if es_obsoleto(registros) else compactos
+        except Exception as e:
+            logger.error(f"❌ Error al obtener registros del candidato: {e}")
+            return []
+    
+    def elecciones_desde_registros(self, registros: list) -> list:
+        """
+        Elecciones distintas y ordenadas de los registros compactos de un candidato
+        (mismo resultado que obtener_elecciones_por_candidato, sin consultar Oracle)
+        """
+        elecciones = {RegistroPolitico(*registro).eleccion for registro in registros}
+        return sorted(eleccion for eleccion in elecciones if eleccion)
+    
+    def detalle_desde_registros(self, registros: list, eleccion: str, obsoleto: bool = False) -> dict:
+        """
+        Detalle del candidato en una elección a partir de sus registros compactos
+        (mismo resultado que obtener_detalle_candidato_eleccion, sin consultar Oracle).
+
+        Args:
+            obsoleto: Los registros vinieron del respaldo del circuit breaker; el detalle se
+                marca igual para que formatear_politico muestre el aviso
+        """
+        for registro in registros:
+            detalle = RegistroPolitico(*registro)
+            if detalle.eleccion == eleccion:
+                return DictObsoleto(detalle.a_dict()) if obsoleto else detalle.a_dict()
+        return {}
+    
     def generar_menu_elecciones_candidato(self, elecciones: list, nombre_candidato: str) -> str:
         """
         Genera el menú de elecciones donde aparece un candidato
@@ -1,7 +1,12 @@
 import csv
 from pathlib import Path
-from typing import Dict, List
-from google import genai
+from typing import Dict, List, Tuple
+from chatbot.config import settings
+from chatbot.services.busqueda_lexica import IndiceBM25
+from chatbot.services.indice_embeddings import IndiceEmbeddings, fusionar_rankings
+from chatbot.services.cache_consultas import CacheConsultas, huella_datos
+from chatbot.services.llm_gateway import generar_indices
+from chatbot.services.metricas_llm import registrar_evento
 
 class ServiciosDigitalesManager:
     """Gestor de servicios digitales del JNE"""
@@ -9,13 +14,39 @@ class ServiciosDigitalesManager:
     def __init__(self):
         self.servicios_digitales = {}
         self.servicios_busqueda = []
-        self.client = genai.Client()
+        self.indice_servicios = IndiceBM25([])
+        self.indice_embeddings = None
+        self.version_servicios = ""
+        self.cache_consultas = CacheConsultas("servicios")
         self._cargar_servicios()
     
     def _cargar_servicios(self):
         """Carga todos los servicios al inicializar"""
         self.servicios_digitales = self._cargar_servicios_digitales()
         self.servicios_busqueda = self._cargar_servicios_busqueda()
+        self.indice_servicios = self._construir_indice(self.servicios_busqueda)
+        self.indice_embeddings = self._construir_indice_embeddings(self.servicios_busqueda)
+        self.version_servicios = huella_datos(*(
+            f"{servicio['nombre']}|{servicio['descripcion']}|{servicio['enlace']}" for servicio in self.servicios_busqueda
+        ))
+    
+    def _construir_indice(self, servicios: List[dict]) -> IndiceBM25:
+        """Índice BM25 sobre nombre y descripción (el nombre se repite para darle más peso)"""
+        return IndiceBM25([
+            f"{servicio['nombre']} {servicio['nombre']} {servicio['descripcion']}" for servicio in servicios
+        ])
+    
+    def _construir_indice_embeddings(self, servicios: List[dict]):
+        """Embeddings precalculados de los servicios (se reutilizan desde disco si el CSV no cambió)"""
+        if not settings.EMBEDDINGS_HABILITADO:
+            return None
+        try:
+            return IndiceEmbeddings(
+                "servicios", [f"{servicio['nombre']}. {servicio['descripcion']}" for servicio in servicios]
+            )
+        except Exception as e:
+            print(f"⚠️ No se pudo construir el índice de embeddings de servicios: {e}")
+            return None
     
     def _cargar_servicios_digitales(self) -> Dict[str, dict]:
         """Carga los servicios digitales principales desde el archivo CSV"""
@@ -63,16 +94,67 @@ class ServiciosDigitalesManager:
         
         return servicios
     
-    def buscar_servicios_semanticamente(self, consulta_usuario: str, top_k: int = 5) -> List[dict]:
+    async def buscar_servicios_semanticamente(self, consulta_usuario: str, top_k: int = 5) -> List[dict]:
         """
-        Busca servicios relevantes usando el LLM para análisis semántico
+        Busca servicios relevantes; las consultas repetidas (o casi iguales) se responden
+        desde la cache compartida sin volver a rankear
         """
         if not self.servicios_busqueda:
             return []
         
+        version = f"{self.version_servicios}:{top_k}"
+        indices = await self.cache_consultas.obtener(consulta_usuario, version)
+        if indices is not None:
+            registrar_evento("ranking_servicios", "cache")
+            return [self.servicios_busqueda[indice] for indice in indices if 0 <= indice < len(self.servicios_busqueda)]
+        
+        servicios, confiable = await self._buscar_servicios(consulta_usuario, top_k)
+        # Los respaldos (LLM caído o sin cupo) no se cachean: la próxima consulta vuelve a rankear
+        if confiable:
+            posiciones = {id(servicio): indice for indice, servicio in enumerate(self.servicios_busqueda)}
+            await self.cache_consultas.guardar(consulta_usuario, version, [posiciones[id(servicio)] for servicio in servicios])
+        return servicios
+    
+    async def _buscar_servicios(self, consulta_usuario: str, top_k: int) -> Tuple[List[dict], bool]:
+        """
+        Busca servicios relevantes combinando el índice BM25 local y el índice de embeddings.
+        El LLM solo se usa para reordenar los mejores candidatos cuando los puntajes léxicos son ambiguos.
+        
+        Returns:
+            (servicios, confiable): confiable si los rankeó el LLM o la coincidencia léxica no es ambigua
+        """
+        numero_candidatos = settings.SERVICIOS_CANDIDATOS_RERANK
+        lexicos = self.indice_servicios.buscar(consulta_usuario, numero_candidatos)
+        semanticos = self.indice_embeddings.buscar(consulta_usuario, numero_candidatos) if self.indice_embeddings else []
+        # Las paráfrasis que BM25 no encuentra llegan por los embeddings y viceversa
+        candidatos = fusionar_rankings([lexicos, semanticos], numero_candidatos)
+        
+        if not candidatos:
+            # Sin coincidencias léxicas ni semánticas: el LLM revisa el catálogo completo
+            if settings.SERVICIOS_RERANK_LLM:
+                return await self._rerankear_con_llm(consulta_usuario, list(range(len(self.servicios_busqueda))), top_k)
+            return [], False
+        
+        ambiguo = not lexicos or self._puntajes_ambiguos(lexicos)
+        if settings.SERVICIOS_RERANK_LLM and ambiguo:
+            return await self._rerankear_con_llm(consulta_usuario, [indice for indice, _ in candidatos], top_k)
+        
+        return [self.servicios_busqueda[indice] for indice, _ in candidatos[:top_k]], not ambiguo
+    
+    def _puntajes_ambiguos(self, candidatos: List[tuple]) -> bool:
+        """El mejor puntaje es bajo o el segundo está muy cerca del primero"""
+        mejor = candidatos[0][1]
+        if mejor < settings.SERVICIOS_BM25_MINIMO:
+            return True
+        return len(candidatos) > 1 and candidatos[1][1] / mejor >= settings.SERVICIOS_UMBRAL_AMBIGUEDAD
+    
+    async def _rerankear_con_llm(self, consulta_usuario: str, indices: List[int], top_k: int) -> Tuple[List[dict], bool]:
+        """Pide al LLM los servicios más relevantes entre los candidatos indicados (False si se usó el respaldo)"""
+        candidatos = [self.servicios_busqueda[indice] for indice in indices]
+        
         # Crear prompt para el LLM
         servicios_texto = ""
-        for i, servicio in enumerate(self.servicios_busqueda):
+        for i, servicio in enumerate(candidatos):
             servicios_texto += f"{i+1}. {servicio['nombre']}: {servicio['descripcion']}\n"
         
         prompt = f"""
@@ -81,43 +163,30 @@ class ServiciosDigitalesManager:
         El usuario busca: "{consulta_usuario}"
         
         Analiza los siguientes servicios y selecciona los {top_k} más relevantes para la consulta del usuario.
-        Responde SOLO con los números de los servicios más relevantes, separados por comas.
+        Responde SOLO con un arreglo JSON con los números de los servicios más relevantes,
+        del más al menos relevante. Ejemplo: [3, 1]
         
         Servicios disponibles:
         {servicios_texto}
         
-        Números de servicios más relevantes:"""
+        Arreglo JSON de números:"""
         
         try:
             # Usar el LLM para encontrar servicios relevantes
-            response = self.client.models.generate_content(
-                model="gemma-3-27b-it",
-                contents=prompt
-            )
-            
-            # Parsear la respuesta del LLM
-            numeros_texto = response.text.strip()
-            numeros = []
-            
-            # Extraer números de la respuesta
-            for parte in numeros_texto.split(','):
-                parte = parte.strip()
-                if parte.isdigit():
-                    numero = int(parte) - 1  # Convertir a índice base 0
-                    if 0 <= numero < len(self.servicios_busqueda):
-                        numeros.append(numero)
+            # (arreglo validado, con un reintento si la respuesta no se pudo interpretar)
+            numeros = await generar_indices(prompt, len(candidatos), tarea="ranking_servicios")
             
-            # Obtener los servicios seleccionados
+            # Obtener los servicios seleccionados (números en base 1)
             servicios_seleccionados = []
             for numero in numeros[:top_k]:
-                servicios_seleccionados.append(self.servicios_busqueda[numero])
+                servicios_seleccionados.append(candidatos[numero - 1])
             
-            return servicios_seleccionados
+            return servicios_seleccionados, True
             
         except Exception as e:
             print(f"Error en búsqueda semántica: {e}")
-            # Fallback: devolver primeros servicios
-            return self.servicios_busqueda[:top_k]
+            # Fallback: orden léxico de los candidatos
+            return candidatos[:top_k], False
     
     def generar_menu_servicios_digitales(self) -> str:
         """Genera el texto del menú de servicios digitales principales"""
@@ -179,6 +248,11 @@ class ServiciosDigitalesManager:
         """Recarga todos los servicios desde los archivos CSV"""
         self.servicios_digitales = self._cargar_servicios_digitales()
         self.servicios_busqueda = self._cargar_servicios_busqueda()
+        self.indice_servicios = self._construir_indice(self.servicios_busqueda)
+        self.indice_embeddings = self._construir_indice_embeddings(self.servicios_busqueda)
+        self.version_servicios = huella_datos(*(
+            f"{servicio['nombre']}|{servicio['descripcion']}|{servicio['enlace']}" for servicio in self.servicios_busqueda
+        ))
         print("Servicios recargados exitosamente")
     
     def obtener_estadisticas(self) -> dict:
@@ -1,6 +1,6 @@
 import os
+import asyncio
 from typing import Dict, Optional
-from google import genai
 from dotenv import load_dotenv
 
 from chatbot.services.intent_validator import validate_intent
@@ -11,12 +11,11 @@ from chatbot.services.chat_memory_manager import ChatMemoryManager
 from chatbot.services.servicios_digitales_manager import ServiciosDigitalesManager
 from chatbot.services.informacion_institucional_manager import InformacionInstitucionalManager
 from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager
+from chatbot.services.llm_gateway import generar_texto
+from chatbot.services.limites_llm import LimiteLLMExcedido, respuesta_sin_llm
 
 load_dotenv()
 
-# Configuración
-client = genai.Client()
-
 # Estado de usuarios en memoria
 user_states: Dict[str, dict] = {}
 
@@ -126,15 +125,14 @@ context_map = {
     "sedes": "El JNE tiene presencia en Lima (sede central), Cusco, Nazca y cuenta con un Museo Electoral, además de oficinas desconcentradas en todo el país."
 }
 
-def send_to_llm(user_input: str, extra_context: str) -> str:
+async def send_to_llm(user_input: str, extra_context: str) -> str:
     """Envía la pregunta al LLM con contexto adicional"""
     prompt = f"{extra_context}\n\nPregunta del usuario: {user_input}"
     
     try:
-        response = client.models.generate_content(
-            model="gemma-3-27b-it",
-            contents=prompt
-        )
-        return response.text
+        return await generar_texto(prompt, tarea="consulta_libre")
+    except (LimiteLLMExcedido, asyncio.TimeoutError):
+        # Sin cupo o sin respuesta a tiempo: la información fija del tema, sin LLM
+        return respuesta_sin_llm(extra_context)
     except Exception as e:
         return f"Error al procesar la consulta: {str(e)}"
\ No newline at end of file
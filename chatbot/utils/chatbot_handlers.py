@@ -1,4 +1,8 @@
 from typing import Optional
+from chatbot.config import settings
+from chatbot.database.oracle_async import ejecutar_en_oracle
+from chatbot.database.circuit_breaker import es_obsoleto
+from chatbot.services.procesos_electorales_manager import PROCESOS_CON_CRONOGRAMA
 from .chatbot_core import (
     get_chat_memory, get_servicios_manager, get_info_institucional_manager,
     get_procesos_electorales_manager, menus, context_map, send_to_llm
@@ -232,7 +236,7 @@ class StateHandler:
         """Maneja preguntas del usuario"""
         try:
             context = context_map.get(state["final_choice"], "")
-            llm_reply = send_to_llm(text, context)
+            llm_reply = await send_to_llm(text, context)
             respuesta_completa = llm_reply + "\n\n¿Tienes otra consulta? (responde 'si' o 'no'):"
             state["stage"] = "awaiting_another_question"
             return respuesta_completa
@@ -245,7 +249,7 @@ class StateHandler:
         """Maneja consultas de trámites"""
         try:
             servicios_manager = get_servicios_manager()
-            servicios_encontrados = servicios_manager.buscar_servicios_semanticamente(text, top_k=5)
+            servicios_encontrados = await servicios_manager.buscar_servicios_semanticamente(text, top_k=5)
             
             if servicios_encontrados:
                 state["servicios_encontrados"] = servicios_encontrados
@@ -322,7 +326,7 @@ class StateHandler:
         """Maneja la selección de procesos electorales"""
         if text.isdigit():
             opcion = int(text)
-            procesos_especificos = ["EG.2026", "EMC.2025", "ERM.2022", "EG.2021"]
+            procesos_especificos = PROCESOS_CON_CRONOGRAMA
             
             if opcion == len(procesos_especificos) + 1:
                 procesos_manager = get_procesos_electorales_manager()
@@ -356,7 +360,7 @@ class StateHandler:
                 state["stage"] = "main"
                 return "Error: No se encontró el proceso electoral seleccionado. Por favor, vuelve al menú principal."
             
-            hitos = procesos_manager.buscar_hitos_electorales_semanticamente(proceso_electoral, text)
+            hitos = await procesos_manager.buscar_hitos_electorales_semanticamente(proceso_electoral, text)
             
             if hitos:
                 state["hitos_encontrados"] = hitos
@@ -385,7 +389,7 @@ class StateHandler:
             if 1 <= opcion <= len(hitos):
                 hito_seleccionado = hitos[opcion - 1]
                 procesos_manager = get_procesos_electorales_manager()
-                respuesta = procesos_manager.formatear_hito_electoral(hito_seleccionado)
+                respuesta = await procesos_manager.formatear_hito_electoral(hito_seleccionado)
                 state["stage"] = "awaiting_another_question"
                 state["final_choice"] = "hito_electoral"
                 return respuesta
@@ -409,8 +413,8 @@ class StateHandler:
         
         procesos_manager = get_procesos_electorales_manager()
         
-        # Usar búsqueda inteligente que maneja múltiples formatos
-        candidatos = procesos_manager.buscar_candidatos_inteligente(texto_entrada)
+        # Usar búsqueda inteligente que maneja múltiples formatos (en el executor de Oracle)
+        candidatos = await ejecutar_en_oracle(procesos_manager.buscar_candidatos_inteligente, texto_entrada)
         
         if not candidatos:
             # No se encontraron candidatos, volver al menú principal
@@ -451,7 +455,10 @@ class StateHandler:
         segundo_apellido = texto_entrada
         
         # Buscar candidatos con ambos apellidos
-        candidatos = procesos_manager.buscar_candidatos_por_apellidos_separados(nombres, primer_apellido, segundo_apellido)
+        candidatos = await ejecutar_en_oracle(
+            procesos_manager.buscar_candidatos_por_apellidos_separados,
+            nombres, primer_apellido, segundo_apellido
+        )
         
         if not candidatos:
             # No se encontraron candidatos, volver al menú principal
@@ -478,15 +485,31 @@ class StateHandler:
             if 1 <= opcion <= len(candidatos):
                 candidato_seleccionado = candidatos[opcion - 1]
                 procesos_manager = get_procesos_electorales_manager()
-                elecciones = procesos_manager.obtener_elecciones_por_candidato(
-                    candidato_seleccionado["nombres"],
-                    candidato_seleccionado["apellido_paterno"],
-                    candidato_seleccionado["apellido_materno"]
-                )
+                registros = None
+                if settings.ORACLE_PREFETCH_CANDIDATO:
+                    # Una sola consulta trae todas las filas del candidato; el menú y el detalle se sirven del estado
+                    registros = await ejecutar_en_oracle(
+                        procesos_manager.obtener_registros_candidato,
+                        candidato_seleccionado["nombres"],
+                        candidato_seleccionado["apellido_paterno"],
+                        candidato_seleccionado["apellido_materno"],
+                        por_defecto=[]
+                    )
+                    elecciones = procesos_manager.elecciones_desde_registros(registros)
+                else:
+                    elecciones = await ejecutar_en_oracle(
+                        procesos_manager.obtener_elecciones_por_candidato,
+                        candidato_seleccionado["nombres"],
+                        candidato_seleccionado["apellido_paterno"],
+                        candidato_seleccionado["apellido_materno"]
+                    )
                 
                 if elecciones:
                     state["candidato_seleccionado"] = candidato_seleccionado
                     state["elecciones_candidato"] = elecciones
+                    state["registros_candidato"] = registros
+                    # El estado se serializa: la marca de respaldo se guarda aparte
+                    state["registros_obsoletos"] = es_obsoleto(registros)
                     state["stage"] = "awaiting_eleccion_candidato_selection"
                     return procesos_manager.generar_menu_elecciones_candidato(elecciones, candidato_seleccionado["nombre_completo"])
                 else:
@@ -519,12 +542,19 @@ class StateHandler:
             if 1 <= opcion <= len(elecciones):
                 eleccion_seleccionada = elecciones[opcion - 1]
                 procesos_manager = get_procesos_electorales_manager()
-                detalle = procesos_manager.obtener_detalle_candidato_eleccion(
-                    candidato["nombres"],
-                    candidato["apellido_paterno"],
-                    candidato["apellido_materno"],
-                    eleccion_seleccionada
-                )
+                registros = state.get("registros_candidato")
+                if registros is not None:
+                    detalle = procesos_manager.detalle_desde_registros(
+                        registros, eleccion_seleccionada, obsoleto=state.get("registros_obsoletos", False)
+                    )
+                else:
+                    detalle = await ejecutar_en_oracle(
+                        procesos_manager.obtener_detalle_candidato_eleccion,
+                        candidato["nombres"],
+                        candidato["apellido_paterno"],
+                        candidato["apellido_materno"],
+                        eleccion_seleccionada
+                    )
                 
                 if detalle:
                     respuesta = procesos_manager.formatear_politico(detalle)
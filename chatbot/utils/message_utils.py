@@ -1,6 +1,8 @@
 import os
+import time
 import httpx
-from typing import Dict
+from typing import AsyncIterator, Dict
+from chatbot.config import settings
 
 # Configuration
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -71,6 +73,56 @@ async def enviar_mensaje_telegram(datos: dict):
             }
         )
 
+# Límite de caracteres de un mensaje de Telegram
+MAX_CARACTERES_TELEGRAM = 4096
+
+async def transmitir_mensaje_telegram(chat_id, fragmentos: AsyncIterator[str], sufijo: str = "") -> str:
+    """
+    Envía a Telegram una respuesta que se genera por partes: el primer fragmento se envía con
+    sendMessage y los siguientes se aplican con editMessageText, como máximo una edición cada
+    TELEGRAM_STREAM_INTERVALO segundos. Al terminar se edita con el texto completo más el sufijo.
+
+    Returns:
+        Texto final enviado (el que se registra en la conversación)
+    """
+    texto = ""
+    message_id = None
+    ultimo_enviado = ""
+    ultima_edicion = 0.0
+
+    async with httpx.AsyncClient() as client:
+        async def publicar(contenido: str):
+            nonlocal message_id, ultimo_enviado, ultima_edicion
+            contenido = contenido[:MAX_CARACTERES_TELEGRAM]
+            if not contenido.strip() or contenido == ultimo_enviado:
+                return
+            try:
+                if message_id is None:
+                    respuesta = await client.post(
+                        f"{TELEGRAM_API_URL}/sendMessage", json={"chat_id": chat_id, "text": contenido}
+                    )
+                    message_id = respuesta.json().get("result", {}).get("message_id")
+                else:
+                    await client.post(
+                        f"{TELEGRAM_API_URL}/editMessageText",
+                        json={"chat_id": chat_id, "message_id": message_id, "text": contenido}
+                    )
+                ultimo_enviado = contenido
+            except Exception as e:
+                print(f"⚠️ Error al actualizar el mensaje de Telegram: {e}")
+            ultima_edicion = time.monotonic()
+
+        try:
+            async for fragmento in fragmentos:
+                texto += fragmento
+                if message_id is None or time.monotonic() - ultima_edicion >= settings.TELEGRAM_STREAM_INTERVALO:
+                    await publicar(texto)
+        finally:
+            texto_final = texto + sufijo
+            await publicar(texto_final)
+
+    return texto_final
+
 async def enviar_mensaje_whatsapp(datos: dict):
     """Envía un mensaje a WhatsApp"""
     if not WHATSAPP_ACCESS_TOKEN or not WHATSAPP_PHONE_NUMBER_ID:
@@ -0,0 +1,57 @@
+import threading
+from bisect import bisect_left
+
+# Límites superiores (ms) de los buckets por defecto; el último bucket es +inf
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+def estimar_tokens(texto: str) -> int:
+    """Tokens aproximados de un texto (~4 caracteres por token en español)"""
+    return (len(texto or "") + 3) // 4
+
+class Histograma:
+    """
+    Histograma acumulado en memoria con buckets fijos (seguro entre hilos).
+    Los percentiles se estiman con el límite superior del bucket que los contiene.
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.conteos = [0] * (len(self.buckets) + 1)
+        self.conteo = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float):
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            self.conteos[indice] += 1
+            self.conteo += 1
+            self.suma += valor
+            if valor > self.maximo:
+                self.maximo = valor
+
+    def percentil(self, p: float) -> float:
+        """Percentil aproximado (0-100)"""
+        if self.conteo == 0:
+            return 0.0
+        objetivo = self.conteo * p / 100
+        acumulado = 0
+        for indice, cantidad in enumerate(self.conteos):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return min(float(self.buckets[indice]), self.maximo) if indice < len(self.buckets) else self.maximo
+        return self.maximo
+
+    def resumen(self) -> dict:
+        with self._lock:
+            etiquetas = [f"<={limite}" for limite in self.buckets] + [f">{self.buckets[-1]}"]
+            return {
+                "conteo": self.conteo,
+                "promedio": round(self.suma / self.conteo, 2) if self.conteo else 0.0,
+                "max": round(self.maximo, 2),
+                "p50": round(self.percentil(50), 2),
+                "p90": round(self.percentil(90), 2),
+                "p99": round(self.percentil(99), 2),
+                "buckets": dict(zip(etiquetas, self.conteos))
+            }
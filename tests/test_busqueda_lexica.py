@@ -0,0 +1,62 @@
+import asyncio
+from chatbot.config import settings
+from chatbot.services.busqueda_lexica import IndiceBM25, expandir_sinonimos, raiz, tokenizar
+from chatbot.services.indice_embeddings import fusionar_rankings
+from chatbot.services.servicios_digitales_manager import ServiciosDigitalesManager
+
+DOCUMENTOS = [
+    "Consulta de afiliación a organizaciones políticas",
+    "Pago de sanción por omisión al sufragio",
+    "Inscripción de candidatos y hoja de vida",
+    "Casilla electrónica para notificaciones de expedientes",
+]
+
+def test_tokenizar_quita_tildes_stopwords_y_sufijos():
+    assert tokenizar("Quiero consultar mi AFILIACIÓN") == tokenizar("afiliacion")
+    assert raiz("notificaciones") == raiz("notificacion")
+
+def test_consulta_con_y_sin_tildes_da_el_mismo_ranking():
+    indice = IndiceBM25(DOCUMENTOS)
+    con_tildes = indice.buscar("afiliación política")
+    sin_tildes = indice.buscar("afiliacion politica")
+    assert con_tildes == sin_tildes
+    assert con_tildes[0][0] == 0
+
+def test_sinonimo_encuentra_el_documento():
+    indice = IndiceBM25(DOCUMENTOS)
+    # "multa" no aparece en el catálogo: llega por su sinónimo "sanción"
+    resultados = indice.buscar("pagar multa")
+    assert resultados[0][0] == 1
+
+def test_sinonimos_pesan_la_mitad():
+    pesos = dict(expandir_sinonimos(tokenizar("multa")))
+    assert pesos[raiz("multa")] == 1.0
+    assert pesos[raiz("sancion")] == 0.5
+
+def test_consulta_sin_terminos_conocidos():
+    assert IndiceBM25(DOCUMENTOS).buscar("zzz qqq") == []
+    assert IndiceBM25([]).buscar("afiliación") == []
+
+def test_fusion_rrf_premia_a_los_que_aparecen_en_ambos_rankings():
+    lexicos = [(0, 9.0), (1, 5.0), (2, 1.0)]
+    semanticos = [(3, 0.9), (1, 0.8)]
+    assert [indice for indice, _ in fusionar_rankings([lexicos, semanticos])] == [1, 0, 3, 2]
+
+class IndiceEmbeddingsFijo:
+    def __init__(self, resultados):
+        self.resultados = resultados
+
+    def buscar(self, consulta, top_k):
+        return self.resultados[:top_k]
+
+def test_manager_devuelve_el_orden_de_la_fusion(monkeypatch):
+    monkeypatch.setattr(settings, "SERVICIOS_RERANK_LLM", False)
+    manager = ServiciosDigitalesManager.__new__(ServiciosDigitalesManager)
+    manager.servicios_busqueda = [{"nombre": documento, "descripcion": "", "enlace": ""} for documento in DOCUMENTOS]
+    manager.indice_servicios = IndiceBM25([servicio["nombre"] for servicio in manager.servicios_busqueda])
+    # Los embeddings encuentran la casilla (paráfrasis sin términos en común) y confirman la sanción
+    manager.indice_embeddings = IndiceEmbeddingsFijo([(3, 0.7), (1, 0.6)])
+
+    servicios, _ = asyncio.run(manager._buscar_servicios("pagar multa", top_k=3))
+
+    assert [servicio["nombre"] for servicio in servicios] == [DOCUMENTOS[1], DOCUMENTOS[3]]
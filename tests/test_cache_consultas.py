@@ -0,0 +1,54 @@
+import asyncio
+import itertools
+import pytest
+from chatbot.config import settings
+from chatbot.services import cache_consultas
+from chatbot.services.cache_consultas import CacheConsultas, jaccard, palabras_prefijo
+
+fakeredis = pytest.importorskip("fakeredis")
+
+@pytest.fixture
+def redis(monkeypatch):
+    cliente = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(cache_consultas, "_cliente_redis", lambda: cliente)
+    monkeypatch.setattr(settings, "CACHE_CONSULTAS_HABILITADO", True)
+    monkeypatch.setattr(settings, "CACHE_CONSULTAS_SIMILITUD", 0.8)
+    return cliente
+
+def test_prefijos_de_claves_similares_se_cruzan():
+    palabras = ["afili", "consult", "electoral", "multa", "pag", "partid"]
+    for largo_a, largo_b in itertools.product(range(1, 7), repeat=2):
+        for a in itertools.combinations(palabras, largo_a):
+            for b in itertools.combinations(palabras, largo_b):
+                if jaccard(set(a), set(b)) >= 0.8:
+                    assert set(palabras_prefijo(list(a), 0.8)) & set(palabras_prefijo(list(b), 0.8))
+
+def test_acierto_exacto_y_casi_duplicado(redis):
+    cache = CacheConsultas("servicios")
+    asyncio.run(cache.guardar("pagar multa electoral por omisión al voto", "v1", [3, 1]))
+
+    assert asyncio.run(cache.obtener("voto omisión multa electoral pagar", "v1")) == [3, 1]
+    # Una palabra de más: Jaccard 5/6
+    assert asyncio.run(cache.obtener("pagar multa electoral por omisión al voto hoy", "v1")) == [3, 1]
+    assert asyncio.run(cache.obtener("consulta de afiliación", "v1")) is None
+    assert asyncio.run(cache.obtener("pagar multa electoral por omisión al voto", "v2")) is None
+
+def test_casi_duplicado_solo_lee_los_grupos_del_prefijo(redis):
+    cache = CacheConsultas("servicios")
+    for numero in range(30):
+        asyncio.run(cache.guardar(f"zona{numero} tramite expediente", "v1", [numero]))
+    asyncio.run(cache.guardar("afiliacion partido renuncia militante", "v1", [99]))
+
+    leidas = []
+    crear_pipeline = redis.pipeline
+
+    def pipeline_espia(*args, **kwargs):
+        pipeline = crear_pipeline(*args, **kwargs)
+        srandmember = pipeline.srandmember
+        pipeline.srandmember = lambda clave, cantidad: leidas.append(clave) or srandmember(clave, cantidad)
+        return pipeline
+
+    redis.pipeline = pipeline_espia
+
+    assert asyncio.run(cache.obtener("afiliacion partido renuncia militante politica", "v1")) == [99]
+    assert leidas and all(":grupo:" in clave and "zona" not in clave for clave in leidas)
@@ -0,0 +1,50 @@
+from chatbot.database.circuit_breaker import con_respaldo, es_obsoleto, marcar_fallo
+from chatbot.database.oracle_repository import RegistroPolitico
+from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager
+
+class RepositorioFalso:
+    """Método con el mismo patrón que OracleRepository: captura la excepción y devuelve []"""
+
+    def __init__(self):
+        self.error = None
+
+    @con_respaldo
+    def buscar(self, nombre: str) -> list:
+        try:
+            if self.error:
+                raise self.error
+            return [nombre.upper()]
+        except Exception:
+            marcar_fallo()
+            return []
+
+def test_respaldo_no_se_sobrescribe_con_un_error_capturado():
+    repositorio = RepositorioFalso()
+    assert repositorio.buscar("quispe") == ["QUISPE"]
+
+    repositorio.error = FileNotFoundError("snapshot.db")
+    respaldo = repositorio.buscar("quispe")
+    assert respaldo == ["QUISPE"]
+    assert es_obsoleto(respaldo)
+
+    # El resultado vacío del error no reemplazó al último bueno
+    assert repositorio.buscar("quispe") == ["QUISPE"]
+
+def test_error_sin_respaldo_devuelve_el_resultado_vacio():
+    repositorio = RepositorioFalso()
+    repositorio.error = RuntimeError("checkout")
+    assert repositorio.buscar("sin respaldo") == []
+
+def test_detalle_desde_registros_obsoletos_muestra_el_aviso():
+    manager = ProcesosElectoralesManager()
+    registro = RegistroPolitico(
+        "MARÍA", "QUISPE", "PEÑA", "LIMA", "LIMA", "LIMA", "PARTIDO X",
+        "ELECCIONES GENERALES 2021", "PX", "GENERAL", "CONGRESISTA", None
+    )
+    registros = [registro.a_tupla()]
+
+    actual = manager.detalle_desde_registros(registros, "ELECCIONES GENERALES 2021")
+    obsoleto = manager.detalle_desde_registros(registros, "ELECCIONES GENERALES 2021", obsoleto=True)
+
+    assert "puede no estar actualizada" not in manager.formatear_politico(actual)
+    assert "puede no estar actualizada" in manager.formatear_politico(obsoleto)
@@ -0,0 +1,50 @@
+from datetime import date
+from chatbot.services.cronograma_timeline import LineaDeTiempoHitos, parsear_fecha_hito
+
+HITOS = [
+    {"id": 3, "hito_electoral": "Elección general", "dia": 12, "mes": "ABRIL", "anio": 2026},
+    {"id": 1, "hito_electoral": "Convocatoria", "dia": 10, "mes": "ENERO", "anio": 2026},
+    {"id": 2, "hito_electoral": "Cierre de inscripción", "dia": 10, "mes": "1", "anio": 2026},
+    {"id": 4, "hito_electoral": "Proclamación", "dia": 5, "mes": "JUNIO", "anio": 2026},
+    {"id": 5, "hito_electoral": "Sin fecha", "dia": None, "mes": "MAYO", "anio": 2026},
+]
+
+def ids(hitos):
+    return [hito["id"] for hito in hitos]
+
+def test_orden_cronologico_y_sin_fecha_al_final():
+    linea = LineaDeTiempoHitos(HITOS)
+    # Los del mismo día conservan el orden recibido
+    assert ids(linea.todos()) == [1, 2, 3, 4, 5]
+    assert len(linea) == 5
+
+def test_parsear_fecha_invalida():
+    assert parsear_fecha_hito({"dia": 31, "mes": "FEBRERO", "anio": 2026}) is None
+    assert parsear_fecha_hito({"dia": 1, "mes": "BRUMARIO", "anio": 2026}) is None
+
+def test_proximos_incluye_el_mismo_dia():
+    linea = LineaDeTiempoHitos(HITOS)
+    assert ids(linea.proximos(2, desde=date(2026, 1, 10))) == [1, 2]
+    assert ids(linea.proximos(5, desde=date(2026, 1, 11))) == [3, 4]
+
+def test_proximos_antes_del_primero_y_despues_del_ultimo():
+    linea = LineaDeTiempoHitos(HITOS)
+    assert ids(linea.proximos(1, desde=date(2025, 12, 31))) == [1]
+    assert linea.proximos(5, desde=date(2026, 6, 6)) == []
+
+def test_pasados_excluye_el_mismo_dia():
+    linea = LineaDeTiempoHitos(HITOS)
+    assert linea.pasados(hasta=date(2026, 1, 10)) == []
+    assert ids(linea.pasados(hasta=date(2026, 4, 12))) == [2, 1]
+    assert ids(linea.pasados(1, hasta=date(2026, 12, 31))) == [4]
+
+def test_en_rango_incluye_los_extremos():
+    linea = LineaDeTiempoHitos(HITOS)
+    assert ids(linea.en_rango(date(2026, 1, 10), date(2026, 4, 12))) == [1, 2, 3]
+    assert ids(linea.en_rango(date(2026, 6, 5), date(2026, 6, 5))) == [4]
+
+def test_en_rango_vacio():
+    linea = LineaDeTiempoHitos(HITOS)
+    assert linea.en_rango(date(2026, 2, 1), date(2026, 3, 31)) == []
+    assert linea.en_rango(date(2026, 5, 1), date(2026, 4, 1)) == []
+    assert LineaDeTiempoHitos([]).proximos(3, desde=date(2026, 1, 1)) == []
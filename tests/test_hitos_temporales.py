@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+import pytest
+from chatbot.services.cronograma_timeline import LineaDeTiempoHitos
+from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager
+
+def _hito(identificador: int, descripcion: str, dias: int) -> dict:
+    return {"id": identificador, "hito_electoral": descripcion, "fecha": date.today() + timedelta(days=dias)}
+
+LINEA = LineaDeTiempoHitos([
+    _hito(1, "Convocatoria a elecciones", -60),
+    _hito(2, "Cierre de inscripción de candidatos", -10),
+    _hito(3, "Publicación de la lista de candidatos admitidos", 5),
+    _hito(4, "Jornada electoral", 40),
+    _hito(5, "Proclamación de resultados", 70),
+])
+
+@pytest.fixture(scope="module")
+def manager():
+    return ProcesosElectoralesManager()
+
+def ids(hitos):
+    return [hito["id"] for hito in hitos]
+
+@pytest.mark.parametrize("consulta, esperados", [
+    ("¿Cuál es el próximo hito?", [3, 4, 5]),
+    ("¿Qué hitos vienen pronto?", [3, 4, 5]),
+    ("¿Qué fechas del cronograma faltan ahora?", [3, 4, 5]),
+    ("¿Cuándo es la elección?", [4]),
+    ("¿Cuánto falta para la elección?", [4]),
+    ("¿Qué hitos ya pasaron?", [2, 1]),
+    ("Próxima fecha de publicación de candidatos", [3]),
+    ("¿Cuándo fue el cierre de inscripción para las elecciones?", [2]),
+])
+def test_consultas_temporales(manager, consulta, esperados):
+    assert ids(manager.buscar_hitos_temporales(LINEA, consulta)) == esperados
+
+@pytest.mark.parametrize("consulta", [
+    "¿Qué falta para inscribir un partido?",
+    "¿Qué documentos necesito ahora para afiliarme?",
+    "Pronto quiero ser personero",
+    "Requisitos para ser miembro de mesa",
+])
+def test_consultas_no_temporales_van_a_la_busqueda_semantica(manager, consulta):
+    assert manager.buscar_hitos_temporales(LINEA, consulta) is None
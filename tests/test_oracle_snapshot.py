@@ -0,0 +1,109 @@
+import os
+from chatbot.config import settings
+from chatbot.database import oracle_connection, oracle_snapshot
+from sqlalchemy import func, insert, select
+from chatbot.database.oracle_models import OrganizacionPolitica, CronogramaElectoral, Politico
+from chatbot.database.oracle_snapshot import (
+    crear_motor_sqlite_eleccia, crear_tablas_snapshot, sincronizar_snapshot
+)
+
+def _origen_con_llaves_repetidas(directorio):
+    """Origen con la forma de los datos reales: COD_TIPO_OP e IDPERSONA se repiten"""
+    origen = crear_motor_sqlite_eleccia(os.path.join(directorio, "origen.db"))
+    crear_tablas_snapshot(origen)
+    with origen.begin() as conexion:
+        conexion.execute(insert(OrganizacionPolitica.__table__), [
+            {"COD_TIPO_OP": "PP", "DES_TIPO": "PARTIDO POLÍTICO", "FLG_ESTADO_OP": 1, "ESTADO_OP": "INSCRITO"},
+            {"COD_TIPO_OP": "PP", "DES_TIPO": "PARTIDO POLÍTICO", "FLG_ESTADO_OP": 2, "ESTADO_OP": "CANCELADO"},
+        ])
+        conexion.execute(insert(Politico.__table__), [
+            {"IDPERSONA": 7, "TXNOMBRE": "MARÍA", "TXAPEPAT": "QUISPE", "TXAPEMAT": "PEÑA", "TXELECCION": "ELECCIONES GENERALES 2016"},
+            {"IDPERSONA": 7, "TXNOMBRE": "MARÍA", "TXAPEPAT": "QUISPE", "TXAPEMAT": "PEÑA", "TXELECCION": "ELECCIONES GENERALES 2021"},
+        ])
+        conexion.execute(insert(CronogramaElectoral.__table__), [
+            {"ID": 1, "PROCESO_ELECTORAL": "EG.2026", "ANIO": 2026, "MES": "ABRIL", "DIA": 12, "HITO_ELECTORAL": "Elección"},
+        ])
+    return origen
+
+def test_sincronizar_snapshot_con_llaves_repetidas(tmp_path):
+    origen = _origen_con_llaves_repetidas(str(tmp_path))
+    ruta = str(tmp_path / "snapshot.db")
+
+    filas = sincronizar_snapshot(ruta, motor_origen=origen, lote=1)
+
+    assert filas[OrganizacionPolitica.__tablename__] == 2
+    assert filas[Politico.__tablename__] == 2
+    assert not os.path.exists(f"{ruta}.{os.getpid()}.tmp")
+
+    replica = crear_motor_sqlite_eleccia(ruta)
+    with replica.connect() as conexion:
+        elecciones = conexion.execute(
+            select(func.count()).select_from(Politico.__table__).where(Politico.IDPERSONA == 7)
+        ).scalar()
+        nombre = conexion.execute(
+            select(Politico.__table__.c.TXNOMBRE).where(Politico.TXELECCION == "ELECCIONES GENERALES 2021")
+        ).scalar()
+    assert elecciones == 2
+    assert nombre == "MARÍA"
+    replica.dispose()
+    origen.dispose()
+
+class MotorFalso:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.liberado = False
+
+    def dispose(self):
+        self.liberado = True
+
+def reiniciar_snapshot(monkeypatch, ruta, revision=30):
+    monkeypatch.setattr(settings, "ORACLE_BACKEND", "snapshot")
+    monkeypatch.setattr(settings, "ORACLE_SNAPSHOT_PATH", str(ruta))
+    monkeypatch.setattr(settings, "ORACLE_SNAPSHOT_REVISION", revision)
+    monkeypatch.setattr(settings, "ORACLE_SLOW_QUERY_HABILITADO", False)
+    monkeypatch.setattr(oracle_snapshot, "crear_motor_sqlite_eleccia", MotorFalso)
+    monkeypatch.setattr(oracle_snapshot, "_motor_snapshot", None)
+    monkeypatch.setattr(oracle_snapshot, "_mtime_snapshot", None)
+    monkeypatch.setattr(oracle_snapshot, "_revisado_en", None)
+
+def test_sin_archivo_de_replica_se_lee_de_oracle(monkeypatch, tmp_path):
+    reiniciar_snapshot(monkeypatch, tmp_path / "no_existe.db")
+    motor_oracle = object()
+    monkeypatch.setattr(oracle_connection, "obtener_motor", lambda: motor_oracle)
+
+    assert oracle_snapshot.obtener_motor_snapshot() is None
+    assert oracle_connection.obtener_motor_lectura() is motor_oracle
+
+def test_el_archivo_se_revisa_solo_cada_intervalo(monkeypatch, tmp_path):
+    ruta = tmp_path / "snapshot.db"
+    ruta.write_text("v1")
+    reiniciar_snapshot(monkeypatch, ruta)
+    revisiones = []
+    stat_original = oracle_snapshot.os.stat
+    monkeypatch.setattr(oracle_snapshot.os, "stat", lambda r: revisiones.append(r) or stat_original(r))
+
+    motor = oracle_snapshot.obtener_motor_snapshot()
+    for _ in range(10):
+        assert oracle_snapshot.obtener_motor_snapshot() is motor
+    assert len(revisiones) == 1
+
+    # Al vencer el intervalo, si el archivo desapareció se libera el motor
+    ruta.unlink()
+    monkeypatch.setattr(oracle_snapshot, "_revisado_en", None)
+    assert oracle_snapshot.obtener_motor_snapshot() is None
+    assert motor.liberado
+
+def test_archivo_reemplazado_crea_un_motor_nuevo(monkeypatch, tmp_path):
+    ruta = tmp_path / "snapshot.db"
+    ruta.write_text("v1")
+    reiniciar_snapshot(monkeypatch, ruta, revision=0)
+
+    anterior = oracle_snapshot.obtener_motor_snapshot()
+    nuevo = tmp_path / "nuevo.db"
+    nuevo.write_text("v2")
+    oracle_snapshot.os.utime(nuevo, ns=(1, 1))
+    oracle_snapshot.os.replace(nuevo, ruta)
+
+    actual = oracle_snapshot.obtener_motor_snapshot()
+    assert actual is not anterior
+    assert anterior.liberado
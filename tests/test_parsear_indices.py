@@ -0,0 +1,28 @@
+import pytest
+from chatbot.services.llm_gateway import RespuestaInvalidaLLM, parsear_indices
+
+def test_arreglo_bien_formado():
+    assert parsear_indices("[3, 1, 2]", 5) == [3, 1, 2]
+
+def test_arreglo_en_bloque_de_codigo():
+    assert parsear_indices("```json\n[2, 4]\n```", 5) == [2, 4]
+
+def test_arreglo_con_texto_alrededor():
+    assert parsear_indices("Los más relevantes son [5, 1] según la consulta.", 5) == [5, 1]
+
+def test_numeros_como_texto():
+    assert parsear_indices('["2", " 3 "]', 5) == [2, 3]
+
+def test_fuera_de_rango_se_descartan():
+    assert parsear_indices("[0, 2, 9, 1, -1]", 5) == [2, 1]
+
+def test_no_enteros_se_descartan():
+    assert parsear_indices('[1.5, true, "a", 4]', 5) == [4]
+
+def test_repetidos_se_descartan():
+    assert parsear_indices("[2, 2, 3, 2]", 5) == [2, 3]
+
+@pytest.mark.parametrize("texto", [None, "", "no sé", "[]", "[7, 8]", "[1, 2"])
+def test_sin_indices_validos(texto):
+    with pytest.raises(RespuestaInvalidaLLM):
+        parsear_indices(texto, 5)
@@ -0,0 +1,12 @@
+from chatbot.database.oracle_repository import RegistroPolitico
+from chatbot.services.procesos_electorales_manager import ProcesosElectoralesManager
+
+def test_detalle_desde_registros_es_un_dict():
+    manager = ProcesosElectoralesManager()
+    registro = RegistroPolitico("JUAN", "PÉREZ", "ROJAS", *[None] * 4, "ERM 2022", *[None] * 4)
+
+    detalle = manager.detalle_desde_registros([registro.a_tupla()], "ERM 2022")
+
+    assert type(detalle) is dict
+    assert detalle["apellido_paterno"] == "PÉREZ"
+    assert manager.detalle_desde_registros([registro.a_tupla()], "EG 2021") == {}